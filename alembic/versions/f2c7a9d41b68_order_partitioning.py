@@ -0,0 +1,177 @@
+"""order partitioning
+
+Revision ID: f2c7a9d41b68
+Revises: d81b5f3a6c92
+Create Date: 2026-10-18 19:48:06.251937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7a9d41b68'
+down_revision: Union[str, None] = 'd81b5f3a6c92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One partition per UTC month, from the first order through this many months
+# ahead; the order-partitions job creates the following ones
+MONTHS_AHEAD = 3
+
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    month timestamp := date_trunc(
+        'month', coalesce((SELECT min(create_time) FROM order_info_heap), now())
+        AT TIME ZONE 'UTC'
+    );
+    last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC')
+        + interval '%(ahead)s months';
+BEGIN
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %%I PARTITION OF order_info FOR VALUES FROM (%%L) TO (%%L)',
+            'order_info_p' || to_char(month, 'YYYYMM'),
+            month || '+00', (month + interval '1 month') || '+00'
+        );
+        EXECUTE format(
+            'CREATE TABLE %%I PARTITION OF order_item FOR VALUES FROM (%%L) TO (%%L)',
+            'order_item_p' || to_char(month, 'YYYYMM'),
+            month || '+00', (month + interval '1 month') || '+00'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$
+""" % {'ahead': MONTHS_AHEAD}
+
+
+def upgrade() -> None:
+    # The tables are rebuilt as partitioned tables and the history copied
+    # over, keeping ids and their sequences
+    op.drop_constraint('stock_reservation_order_id_fkey', 'stock_reservation', type_='foreignkey')
+    op.drop_constraint('order_item_order_id_fkey', 'order_item', type_='foreignkey')
+    op.drop_index(op.f('ix_order_item_order_id'), table_name='order_item')
+    op.drop_index(op.f('ix_order_item_id'), table_name='order_item')
+    op.drop_index('ix_order_info_user_id_create_time_id', table_name='order_info')
+    op.drop_index(op.f('ix_order_info_id'), table_name='order_info')
+    op.rename_table('order_item', 'order_item_heap')
+    op.rename_table('order_info', 'order_info_heap')
+    op.execute('ALTER INDEX order_item_pkey RENAME TO order_item_heap_pkey')
+    op.execute('ALTER INDEX order_info_pkey RENAME TO order_info_heap_pkey')
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('order_info',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('order_info_id_seq'::regclass)"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('delivery_addr_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('create_time', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('order_type', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id', 'create_time'),
+    postgresql_partition_by='RANGE (create_time)'
+    )
+    op.create_index(op.f('ix_order_info_id'), 'order_info', ['id'], unique=False)
+    op.create_index('ix_order_info_user_id_create_time_id', 'order_info', ['user_id', sa.text('create_time DESC'), sa.text('id DESC')], unique=False)
+    op.create_table('order_item',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('order_item_id_seq'::regclass)"), nullable=False),
+    sa.Column('order_id', sa.BigInteger(), nullable=False),
+    sa.Column('order_create_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('goods_id', sa.Integer(), nullable=False),
+    sa.Column('goods_name', sa.String(length=100), nullable=False),
+    sa.Column('goods_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('item_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['goods_id'], ['goods.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['order_id', 'order_create_time'], ['order_info.id', 'order_info.create_time'], name='order_item_order_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'order_create_time'),
+    postgresql_partition_by='RANGE (order_create_time)'
+    )
+    op.create_index(op.f('ix_order_item_id'), 'order_item', ['id'], unique=False)
+    op.create_index(op.f('ix_order_item_order_id'), 'order_item', ['order_id'], unique=False)
+    # ### end Alembic commands ###
+
+    op.execute(CREATE_PARTITIONS)
+    op.execute(
+        'INSERT INTO order_info (id, user_id, delivery_addr_id, total_amount, status, create_time, order_type) '
+        'SELECT id, user_id, delivery_addr_id, total_amount, status, create_time, order_type '
+        'FROM order_info_heap'
+    )
+    op.execute(
+        'INSERT INTO order_item (id, order_id, order_create_time, goods_id, goods_name, goods_price, count, item_amount) '
+        'SELECT i.id, i.order_id, o.create_time, i.goods_id, i.goods_name, i.goods_price, i.count, i.item_amount '
+        'FROM order_item_heap i JOIN order_info_heap o ON o.id = i.order_id'
+    )
+    op.execute('ALTER SEQUENCE order_info_id_seq OWNED BY order_info.id')
+    op.execute('ALTER SEQUENCE order_item_id_seq OWNED BY order_item.id')
+    op.drop_table('order_item_heap')
+    op.drop_table('order_info_heap')
+
+    # Reservations reference (order_id, create_time); both rows were written
+    # in one transaction, so the times already match except for stray rows
+    op.execute(
+        'UPDATE stock_reservation r SET create_time = o.create_time '
+        'FROM order_info o WHERE o.id = r.order_id AND r.create_time <> o.create_time'
+    )
+    op.create_foreign_key('stock_reservation_order_fkey', 'stock_reservation', 'order_info', ['order_id', 'create_time'], ['id', 'create_time'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    op.drop_constraint('stock_reservation_order_fkey', 'stock_reservation', type_='foreignkey')
+    op.drop_index(op.f('ix_order_item_order_id'), table_name='order_item')
+    op.drop_index(op.f('ix_order_item_id'), table_name='order_item')
+    op.drop_index('ix_order_info_user_id_create_time_id', table_name='order_info')
+    op.drop_index(op.f('ix_order_info_id'), table_name='order_info')
+    op.rename_table('order_item', 'order_item_parted')
+    op.rename_table('order_info', 'order_info_parted')
+    op.execute('ALTER INDEX order_item_pkey RENAME TO order_item_parted_pkey')
+    op.execute('ALTER INDEX order_info_pkey RENAME TO order_info_parted_pkey')
+
+    op.create_table('order_info',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('order_info_id_seq'::regclass)"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('delivery_addr_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('create_time', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('order_type', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('order_item',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('order_item_id_seq'::regclass)"), nullable=False),
+    sa.Column('order_id', sa.BigInteger(), nullable=False),
+    sa.Column('goods_id', sa.Integer(), nullable=False),
+    sa.Column('goods_name', sa.String(length=100), nullable=False),
+    sa.Column('goods_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('item_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['goods_id'], ['goods.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['order_id'], ['order_info.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        'INSERT INTO order_info (id, user_id, delivery_addr_id, total_amount, status, create_time, order_type) '
+        'SELECT id, user_id, delivery_addr_id, total_amount, status, create_time, order_type '
+        'FROM order_info_parted'
+    )
+    op.execute(
+        'INSERT INTO order_item (id, order_id, goods_id, goods_name, goods_price, count, item_amount) '
+        'SELECT id, order_id, goods_id, goods_name, goods_price, count, item_amount '
+        'FROM order_item_parted'
+    )
+    op.execute('ALTER SEQUENCE order_info_id_seq OWNED BY order_info.id')
+    op.execute('ALTER SEQUENCE order_item_id_seq OWNED BY order_item.id')
+    # Dropping the partitioned tables drops their partitions
+    op.drop_table('order_item_parted')
+    op.drop_table('order_info_parted')
+
+    op.create_index(op.f('ix_order_info_id'), 'order_info', ['id'], unique=False)
+    op.create_index('ix_order_info_user_id_create_time_id', 'order_info', ['user_id', sa.text('create_time DESC'), sa.text('id DESC')], unique=False)
+    op.create_index(op.f('ix_order_item_id'), 'order_item', ['id'], unique=False)
+    op.create_index(op.f('ix_order_item_order_id'), 'order_item', ['order_id'], unique=False)
+    op.create_foreign_key('stock_reservation_order_id_fkey', 'stock_reservation', 'order_info', ['order_id'], ['id'], ondelete='CASCADE')
@@ -13,6 +13,100 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION: int = 30  # minutes
 
+    # Users allowed to call admin endpoints, e.g. ADMIN_EMAILS='["admin@example.com"]'
+    ADMIN_EMAILS: list[str] = []
+
+    # Stock reservations
+    RESERVATION_TTL: int = 15  # minutes a pending order holds its stock
+    RESERVATION_SWEEP_INTERVAL: int = 30  # seconds, 0 disables the sweeper
+    RESERVATION_SWEEP_BATCH_SIZE: int = 500
+
+    # In-process goods cache
+    GOODS_CACHE_SIZE: int = 10000  # entries, 0 disables the cache
+    GOODS_CACHE_TTL: int = 30  # seconds
+
+    # Flash-sale stock shards
+    GOODS_SHARD_SYNC_INTERVAL: int = 5  # seconds between mirror refreshes, 0 disables
+
+    # Goods listing
+    GOODS_PAGE_SIZE: int = 20
+    GOODS_PAGE_SIZE_MAX: int = 100
+    GOODS_CHANGES_PAGE_SIZE: int = 1000  # default and maximum rows per delta-sync page
+
+    # Order history listing
+    ORDERS_PAGE_SIZE: int = 20
+    ORDERS_PAGE_SIZE_MAX: int = 100
+    ORDERS_RECENT_DAYS: int = 45  # lookups by order ID search this window first
+    ORDERS_JSON_READS: bool = True  # GET /orders bodies built in SQL, no ORM objects
+
+    # Per-user cache of GET /orders pages
+    ORDERS_CACHE_SIZE: int = 10000  # pages per worker, 0 disables the cache
+    ORDERS_CACHE_TTL: int = 30  # seconds; bounds staleness in the other workers
+    ORDERS_CACHE_BACKEND: str = ""  # "module:factory" of a shared OrderListCache
+
+    # Monthly partitions of order_info / order_item (scripts/order_partitions.py)
+    ORDER_PARTITIONS_AHEAD: int = 3  # future months kept created
+    ORDER_PARTITIONS_RETAIN: int = 0  # months kept attached, 0 keeps all history
+    ORDER_PARTITIONS_INTERVAL: int = 21600  # seconds, 0 disables the maintenance job
+
+    # Idempotency-Key support for POST /orders
+    IDEMPOTENCY_KEY_TTL: int = 24  # hours a key and its response are kept
+    IDEMPOTENCY_CACHE_SIZE: int = 10000  # replayable responses cached per worker
+    IDEMPOTENCY_CACHE_TTL: int = 600  # seconds
+    IDEMPOTENCY_PURGE_INTERVAL: int = 3600  # seconds, 0 disables the purge job
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = 5000
+
+    # Bulk order creation (POST /orders/batch)
+    ORDERS_BATCH_MAX_SIZE: int = 1000  # orders per request
+    ORDERS_BATCH_CHUNK_SIZE: int = 200  # orders per transaction
+
+    # Group commit of POST /orders: concurrent orders share one transaction
+    ORDERS_GROUP_COMMIT: bool = False
+    ORDERS_GROUP_COMMIT_WINDOW: float = 0.002  # seconds the first order waits
+    ORDERS_GROUP_COMMIT_MAX_SIZE: int = 50  # orders that end the window early
+
+    # In-memory catalog snapshot serving GET /goods?fields=id,name,price,stock
+    GOODS_CATALOG_REFRESH_INTERVAL: int = 5  # seconds, 0 disables the snapshot
+    GOODS_CATALOG_MAX_STALENESS: int = 30  # seconds before falling back to SQL
+
+    # Live goods updates (LISTEN/NOTIFY -> Server-Sent Events)
+    GOODS_EVENTS_RECONNECT_DELAY: int = 5  # seconds, 0 disables the listener
+    GOODS_EVENTS_QUEUE_SIZE: int = 100  # events buffered per client before dropping it
+    GOODS_EVENTS_HEARTBEAT: int = 15  # seconds between keep-alive comments
+    GOODS_EVENTS_MAX_IDS: int = 100  # goods one client may follow
+
+    # Goods search
+    SEARCH_MIN_FTS_LENGTH: int = 3  # shorter queries use prefix matching
+
+    # "Frequently bought together" (scripts/build_recommendations.py)
+    RECOMMENDATIONS_TOP_K: int = 20  # neighbours stored and served per goods
+    RECOMMENDATIONS_BATCH_SIZE: int = 10000  # order items read per round trip
+    RECOMMENDATIONS_MAX_ORDER_ITEMS: int = 50  # larger orders are not counted
+
+    # Sales analytics rollups
+    ANALYTICS_REFRESH_INTERVAL: int = 60  # seconds, 0 disables the rollup job
+    ANALYTICS_BATCH_SIZE: int = 5000  # orders folded in per transaction
+    ANALYTICS_SETTLE_LAG: int = 5  # minutes past RESERVATION_TTL before counting
+    ANALYTICS_TIMEZONE: str = "UTC"  # days are cut in this time zone
+    ANALYTICS_MAX_WINDOW_DAYS: int = 366
+    ANALYTICS_TOP_LIMIT: int = 100
+
+    # Transactional outbox for order side effects
+    OUTBOX_WORKERS: int = 2  # per API process; 0 when run via python -m api.src.outbox
+    OUTBOX_POLL_INTERVAL: int = 1  # seconds between polls of an idle worker
+    OUTBOX_BATCH_SIZE: int = 50  # events claimed per round trip
+    OUTBOX_LEASE: int = 300  # seconds a claimed event is hidden from other workers
+    OUTBOX_HANDLER_TIMEOUT: int = 60  # seconds, keep well below OUTBOX_LEASE
+    OUTBOX_MAX_ATTEMPTS: int = 8  # deliveries before an event is marked dead
+    OUTBOX_RETRY_DELAY: int = 5  # seconds before the first retry, doubled each time
+    OUTBOX_RETRY_MAX_DELAY: int = 3600
+    OUTBOX_HANDLER_MODULES: list[str] = []  # imported by workers to register handlers
+
+    # Bulk goods import
+    GOODS_IMPORT_CHUNK_SIZE: int = 5000  # rows per COPY + upsert transaction
+    GOODS_IMPORT_MAX_ERRORS: int = 1000  # row errors listed in the report
+    GOODS_EXPORT_BATCH_SIZE: int = 2000  # rows fetched per server-side cursor batch
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
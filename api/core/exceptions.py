@@ -27,3 +27,29 @@ class ForbiddenException(HTTPException):
 
     def __init__(self, detail: str = "Access forbidden"):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+class BadRequestException(HTTPException):
+    """Base exception for invalid request errors."""
+
+    def __init__(self, detail: str = "Bad request"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class InsufficientStockException(BadRequestException):
+    """Raised when a stock decrement would take a goods below zero."""
+
+    def __init__(self, goods_id: int):
+        self.goods_id = goods_id
+        super().__init__(detail=f"Insufficient stock for goods with id {goods_id}")
+
+
+class IdempotencyKeyReusedException(HTTPException):
+    """Raised when an Idempotency-Key comes back with a different request."""
+
+    def __init__(
+        self, detail: str = "Idempotency-Key was already used for a different request"
+    ):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail
+        )
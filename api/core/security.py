@@ -6,6 +6,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from api.core.config import settings
+from api.core.exceptions import ForbiddenException
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -61,3 +62,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         if user is None:
             raise credentials_exception
         return user
+
+
+async def get_current_admin(user=Depends(get_current_user)):
+    """Dependency to get the current user, who must be listed in ADMIN_EMAILS."""
+    if user.email not in settings.ADMIN_EMAILS:
+        raise ForbiddenException("Admin access required")
+    return user
@@ -1,9 +1,22 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from api.core.config import settings
 from api.core.logging import get_logger, setup_logging
+from api.src.analytics.rollup import create_sales_rollup
+from api.src.analytics.routes import router as analytics_router
+from api.src.goods.catalog import create_catalog_refresher
+from api.src.goods.events import create_goods_listener
 from api.src.goods.routes import router as goods_router
+from api.src.goods.shards import create_shard_stock_sync
+from api.src.idempotency.sweeper import create_idempotency_sweeper
+from api.src.orders.partitions import create_partition_maintainer
 from api.src.orders.routes import router as orders_router
+from api.src.outbox.routes import router as outbox_router
+from api.src.outbox.worker import create_outbox_workers
+from api.src.recommendations.routes import router as recommendations_router
+from api.src.reservations.sweeper import create_reservation_sweeper
 from api.src.users.routes import router as auth_router
 
 from api.utils.migrations import run_migrations
@@ -14,14 +27,39 @@ run_migrations()
 
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the per-worker background tasks."""
+    tasks = [
+        create_partition_maintainer(),
+        create_reservation_sweeper(),
+        create_goods_listener(),
+        create_catalog_refresher(),
+        create_shard_stock_sync(),
+        create_sales_rollup(),
+        create_idempotency_sweeper(),
+        *create_outbox_workers(),
+    ]
+    for task in tasks:
+        task.start()
+    yield
+    for task in tasks:
+        await task.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 app.include_router(auth_router)
 app.include_router(goods_router)
 app.include_router(orders_router)
+app.include_router(recommendations_router)
+app.include_router(analytics_router)
+app.include_router(outbox_router)
 
 
 @app.get("/health")
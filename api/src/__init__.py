@@ -1,10 +1,25 @@
 from .users.models import User 
-from .orders.models import OrderInfo, OrderItem
-from .goods.models import Goods
+from .orders.models import OrderInfo, OrderItem, UserOrderStats
+from .goods.models import Goods, GoodsStockShard, GoodsTombstone
+from .reservations.models import StockReservation
+from .recommendations.models import GoodsRelated
+from .analytics.models import RollupWatermark, SalesGoodsDaily, SalesUserDaily
+from .outbox.models import OutboxEvent
+from .idempotency.models import IdempotencyKey
 
 __all__ = [
     "User",
     "OrderInfo",
     "OrderItem",
+    "UserOrderStats",
     "Goods",
+    "GoodsStockShard",
+    "GoodsTombstone",
+    "StockReservation",
+    "GoodsRelated",
+    "SalesGoodsDaily",
+    "SalesUserDaily",
+    "RollupWatermark",
+    "OutboxEvent",
+    "IdempotencyKey",
 ]
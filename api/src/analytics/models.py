@@ -0,0 +1,48 @@
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from api.core.database import Base
+
+
+class SalesGoodsDaily(Base):
+    """Paid sales of one goods on one day, maintained by the rollup job."""
+
+    __tablename__ = "sales_goods_daily"
+
+    day: Mapped[Date] = mapped_column(Date, primary_key=True)
+    goods_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("goods.id", ondelete="CASCADE"), primary_key=True
+    )
+    units: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    revenue: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False)
+    orders: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class SalesUserDaily(Base):
+    """Paid orders of one user on one day, maintained by the rollup job."""
+
+    __tablename__ = "sales_user_daily"
+
+    day: Mapped[Date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    orders: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False)
+
+
+class RollupWatermark(Base):
+    """How far a rollup has consumed ``order_info``.
+
+    Its row is also the rollup's lock: one worker at a time holds it
+    ``FOR UPDATE`` while folding a batch in.
+    """
+
+    __tablename__ = "rollup_watermark"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    last_order_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,195 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, Row, cast, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.analytics.models import RollupWatermark, SalesGoodsDaily, SalesUserDaily
+from api.src.analytics.schemas import SalesMetric
+from api.src.goods.models import Goods
+from api.src.orders.models import OrderInfo, OrderItem, OrderStatus
+
+SALES_ROLLUP = "sales"
+
+
+def order_day(timezone: str):
+    """Calendar day of an order in the reporting time zone."""
+    return cast(func.timezone(timezone, OrderInfo.create_time), Date)
+
+
+class AnalyticsRepository:
+    """Repository for the sales rollups."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def ensure_watermark(self, name: str) -> None:
+        """Create a rollup's watermark row at 0 unless it exists. Does not commit."""
+        query = (
+            pg_insert(RollupWatermark)
+            .values(name=name, last_order_id=0)
+            .on_conflict_do_nothing(index_elements=[RollupWatermark.name])
+        )
+        await self.session.execute(query)
+
+    async def lock_watermark(self, name: str) -> int | None:
+        """Lock a rollup's watermark row and get its last consumed order id.
+
+        Returns:
+            int | None: The watermark, None if another worker holds the lock
+        """
+        query = (
+            select(RollupWatermark.last_order_id)
+            .where(RollupWatermark.name == name)
+            .with_for_update(skip_locked=True)
+        )
+        return await self.session.scalar(query)
+
+    async def next_batch_end(
+        self, after: int, settled_before: datetime, limit: int
+    ) -> int | None:
+        """Last order id of the next batch to roll up.
+
+        Orders are only rolled up once settled, and ids are consumed strictly
+        in order: the batch stops before the first order created after
+        ``settled_before``, even if later ids are already settled.
+
+        Args:
+            after: Watermark, the last order id already rolled up
+            settled_before: Orders created before this can no longer change
+            limit: Maximum number of orders in the batch
+
+        Returns:
+            int | None: Inclusive upper order id, None if nothing is settled
+        """
+        first_unsettled = (
+            select(func.min(OrderInfo.id))
+            .where(OrderInfo.id > after, OrderInfo.create_time >= settled_before)
+            .scalar_subquery()
+        )
+        batch = (
+            select(OrderInfo.id)
+            .where(
+                OrderInfo.id > after,
+                or_(first_unsettled.is_(None), OrderInfo.id < first_unsettled),
+            )
+            .order_by(OrderInfo.id)
+            .limit(limit)
+            .subquery()
+        )
+        return await self.session.scalar(select(func.max(batch.c.id)))
+
+    async def fold_orders(self, after: int, until: int, timezone: str) -> None:
+        """Add the paid orders with ids in ``(after, until]`` to the rollups.
+
+        Does not commit; the caller advances the watermark in the same
+        transaction so every order is counted exactly once.
+        """
+        day = order_day(timezone)
+        paid = (
+            OrderInfo.id > after,
+            OrderInfo.id <= until,
+            OrderInfo.status == OrderStatus.PAID,
+        )
+
+        goods_rows = (
+            select(
+                day,
+                OrderItem.goods_id,
+                func.sum(OrderItem.count),
+                func.sum(OrderItem.item_amount),
+                func.count(OrderInfo.id.distinct()),
+            )
+            .join(OrderInfo.items)
+            .where(*paid)
+            .group_by(day, OrderItem.goods_id)
+        )
+        insert_goods = pg_insert(SalesGoodsDaily).from_select(
+            ["day", "goods_id", "units", "revenue", "orders"], goods_rows
+        )
+        await self.session.execute(
+            insert_goods.on_conflict_do_update(
+                index_elements=[SalesGoodsDaily.day, SalesGoodsDaily.goods_id],
+                set_={
+                    "units": SalesGoodsDaily.units + insert_goods.excluded.units,
+                    "revenue": SalesGoodsDaily.revenue + insert_goods.excluded.revenue,
+                    "orders": SalesGoodsDaily.orders + insert_goods.excluded.orders,
+                },
+            )
+        )
+
+        user_rows = (
+            select(
+                day,
+                OrderInfo.user_id,
+                func.count(OrderInfo.id),
+                func.sum(OrderInfo.total_amount),
+            )
+            .where(*paid)
+            .group_by(day, OrderInfo.user_id)
+        )
+        insert_users = pg_insert(SalesUserDaily).from_select(
+            ["day", "user_id", "orders", "revenue"], user_rows
+        )
+        await self.session.execute(
+            insert_users.on_conflict_do_update(
+                index_elements=[SalesUserDaily.day, SalesUserDaily.user_id],
+                set_={
+                    "orders": SalesUserDaily.orders + insert_users.excluded.orders,
+                    "revenue": SalesUserDaily.revenue + insert_users.excluded.revenue,
+                },
+            )
+        )
+
+    async def set_watermark(self, name: str, last_order_id: int) -> None:
+        """Advance a rollup's watermark. Does not commit."""
+        query = (
+            update(RollupWatermark)
+            .where(RollupWatermark.name == name)
+            .values(last_order_id=last_order_id, updated_at=func.now())
+        )
+        await self.session.execute(query)
+
+    async def top_sellers(
+        self, start: date, end: date, by: SalesMetric, limit: int
+    ) -> list[Row]:
+        """Best selling goods of a window, from the goods x day rollup."""
+        units = func.sum(SalesGoodsDaily.units).label("units")
+        revenue = func.sum(SalesGoodsDaily.revenue).label("revenue")
+        metric = units if by is SalesMetric.UNITS else revenue
+        ranked = (
+            select(
+                SalesGoodsDaily.goods_id,
+                units,
+                revenue,
+                func.sum(SalesGoodsDaily.orders).label("orders"),
+            )
+            .where(SalesGoodsDaily.day.between(start, end))
+            .group_by(SalesGoodsDaily.goods_id)
+            .order_by(metric.desc(), SalesGoodsDaily.goods_id)
+            .limit(limit)
+            .subquery()
+        )
+        # Names are joined after ranking, for the few goods that made the cut
+        query = (
+            select(ranked, Goods.name)
+            .outerjoin(Goods, Goods.id == ranked.c.goods_id)
+            .order_by(ranked.c[metric.name].desc(), ranked.c.goods_id)
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def daily_revenue(self, start: date, end: date) -> list[Row]:
+        """Orders and revenue per day of a window, from the user x day rollup."""
+        query = (
+            select(
+                SalesUserDaily.day,
+                func.sum(SalesUserDaily.orders).label("orders"),
+                func.sum(SalesUserDaily.revenue).label("revenue"),
+            )
+            .where(SalesUserDaily.day.between(start, end))
+            .group_by(SalesUserDaily.day)
+            .order_by(SalesUserDaily.day)
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
@@ -0,0 +1,28 @@
+from api.core.config import settings
+from api.core.database import async_session
+from api.src.analytics.service import AnalyticsService
+from api.utils.tasks import PeriodicTask
+
+
+async def refresh_sales_rollups() -> None:
+    """Roll up settled orders batch by batch until caught up.
+
+    Each batch is its own short transaction, so the job never holds locks
+    on, or a snapshot of, the order tables for long.
+    """
+    while True:
+        async with async_session() as session:
+            until = await AnalyticsService(session).roll_up(
+                settings.ANALYTICS_BATCH_SIZE
+            )
+        if not until:
+            return
+
+
+def create_sales_rollup() -> PeriodicTask:
+    """Background task keeping the sales rollups current."""
+    return PeriodicTask(
+        "sales-rollup",
+        refresh_sales_rollups,
+        settings.ANALYTICS_REFRESH_INTERVAL,
+    )
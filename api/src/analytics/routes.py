@@ -0,0 +1,38 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.database import get_session
+from api.core.security import get_current_admin
+from api.src.analytics.schemas import (
+    RevenueReport,
+    SalesWindow,
+    TopSeller,
+    TopSellersParams,
+)
+from api.src.analytics.service import AnalyticsService
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+    dependencies=[Depends(get_current_admin)],
+)
+
+
+@router.get("/top-sellers", response_model=list[TopSeller])
+async def top_sellers(
+    params: Annotated[TopSellersParams, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> list[TopSeller]:
+    """Best selling goods between two days, from the daily rollups."""
+    return await AnalyticsService(session).top_sellers(params)
+
+
+@router.get("/revenue", response_model=RevenueReport)
+async def revenue(
+    window: Annotated[SalesWindow, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> RevenueReport:
+    """Paid orders and revenue per day between two days, from the daily rollups."""
+    return await AnalyticsService(session).revenue(window)
@@ -0,0 +1,55 @@
+from datetime import date
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from api.core.config import settings
+
+
+class SalesWindow(BaseModel):
+    start: date = Field(..., description="First day, inclusive")
+    end: date = Field(..., description="Last day, inclusive")
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        if (self.end - self.start).days >= settings.ANALYTICS_MAX_WINDOW_DAYS:
+            raise ValueError(
+                f"window must be shorter than {settings.ANALYTICS_MAX_WINDOW_DAYS} days"
+            )
+        return self
+
+
+class SalesMetric(str, Enum):
+    REVENUE = "revenue"
+    UNITS = "units"
+
+
+class TopSellersParams(SalesWindow):
+    by: SalesMetric = Field(SalesMetric.REVENUE, description="Ranking metric")
+    limit: int = Field(20, ge=1, le=settings.ANALYTICS_TOP_LIMIT)
+
+
+class TopSeller(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    goods_id: int
+    name: str | None = None
+    units: int
+    revenue: float
+    orders: int
+
+
+class DailyRevenue(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    orders: int
+    revenue: float
+
+
+class RevenueReport(BaseModel):
+    orders: int
+    revenue: float
+    days: list[DailyRevenue]
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import settings
+from api.core.logging import get_logger
+from api.src.analytics.repository import SALES_ROLLUP, AnalyticsRepository
+from api.src.analytics.schemas import (
+    DailyRevenue,
+    RevenueReport,
+    SalesWindow,
+    TopSeller,
+    TopSellersParams,
+)
+
+logger = get_logger(__name__)
+
+
+def settle_lag() -> timedelta:
+    """Age after which an order's status can no longer change.
+
+    A pending order can only be paid while its reservation holds, so once
+    ``RESERVATION_TTL`` has passed it is either paid or never will be. The
+    extra ``ANALYTICS_SETTLE_LAG`` covers transactions still in flight.
+    """
+    return timedelta(minutes=settings.RESERVATION_TTL + settings.ANALYTICS_SETTLE_LAG)
+
+
+class AnalyticsService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = AnalyticsRepository(session)
+
+    async def roll_up(self, batch_size: int) -> int:
+        """Fold the next batch of settled orders into the sales rollups.
+
+        The rollups, the watermark move and the lock on the watermark share
+        one transaction, so concurrent workers never count an order twice.
+
+        Returns:
+            int: Last rolled up order id, 0 if there was nothing to do
+        """
+        await self.repository.ensure_watermark(SALES_ROLLUP)
+        after = await self.repository.lock_watermark(SALES_ROLLUP)
+        if after is None:
+            # Another worker is rolling up
+            await self.session.rollback()
+            return 0
+
+        settled_before = datetime.now(timezone.utc) - settle_lag()
+        until = await self.repository.next_batch_end(after, settled_before, batch_size)
+        if until is None:
+            await self.session.commit()
+            return 0
+
+        await self.repository.fold_orders(after, until, settings.ANALYTICS_TIMEZONE)
+        await self.repository.set_watermark(SALES_ROLLUP, until)
+        await self.session.commit()
+        logger.info(f"Rolled up orders {after + 1}..{until} into sales analytics")
+        return until
+
+    async def top_sellers(self, params: TopSellersParams) -> list[TopSeller]:
+        rows = await self.repository.top_sellers(
+            params.start, params.end, params.by, params.limit
+        )
+        return [TopSeller.model_validate(row) for row in rows]
+
+    async def revenue(self, window: SalesWindow) -> RevenueReport:
+        rows = await self.repository.daily_revenue(window.start, window.end)
+        days = [DailyRevenue.model_validate(row) for row in rows]
+        return RevenueReport(
+            orders=sum(day.orders for day in days),
+            revenue=sum(row.revenue for row in rows),
+            days=days,
+        )
@@ -0,0 +1,309 @@
+import math
+import time
+from collections import deque
+from collections.abc import Sequence
+from decimal import Decimal
+
+import numpy as np
+
+from api.core.config import settings
+from api.core.database import async_session
+from api.core.logging import get_logger
+from api.src.goods.repository import GoodsRepository
+from api.src.goods.schemas import GoodsFilter, GoodsListParams, GoodsSort
+from api.utils.pagination import encode_cursor
+from api.utils.tasks import PeriodicTask
+
+logger = get_logger(__name__)
+
+# Response fields the snapshot can serve
+CATALOG_FIELDS = frozenset({"id", "name", "price", "stock"})
+
+CATALOG_COLUMNS = ["id", "name", "price", "stock", "stock_shards"]
+
+# Prices are kept in cents so comparisons stay exact, like NUMERIC(10, 2)
+PRICE_SCALE = 100
+
+# Interned names no goods uses any more are dropped once there are this
+# many, or half as many as goods if that is more
+NAME_SLACK = 1024
+
+# Freshness checkpoints kept while the change feed is held back
+MAX_CHECKPOINTS = 64
+
+
+def to_cents(price) -> int:
+    return int(Decimal(price) * PRICE_SCALE)
+
+
+class CatalogSnapshot:
+    """Columnar in-memory copy of the goods needed for browsing.
+
+    ``id``, price (in cents), stock and the sharded flag live in parallel
+    NumPy arrays kept in id order; names are interned once in a list and
+    referenced by code. Filters, sort and top-k selection are vectorized,
+    and pages use the same keyset cursors as ``GoodsRepository.list_page``,
+    so clients can move between the two paths freely.
+
+    The snapshot is loaded once, then kept current from the goods change
+    feed (see ``refresh_catalog``). It counts as fresh as of the last
+    checkpoint the feed has caught up with, so a feed held back by a long
+    transaction makes it go stale instead of looking current.
+    """
+
+    def __init__(self):
+        self.ids, self.prices, self.stocks, self.sharded, self.name_codes = (
+            self._empty_columns()
+        )
+        self.names: list[str] = []
+        self._codes: dict[str, int] = {}
+        # Change feed position the arrays reflect; None until loaded
+        self.position: tuple[int, int] | None = None
+        self.refreshed_at: float | None = None
+        # (frontier, monotonic time) pairs not yet reached by the feed
+        self._checkpoints: deque[tuple[int, float]] = deque(maxlen=MAX_CHECKPOINTS)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def is_fresh(self, max_age: float) -> bool:
+        return (
+            self.refreshed_at is not None
+            and time.monotonic() - self.refreshed_at <= max_age
+        )
+
+    def load(self, batches: Sequence[Sequence], position: tuple[int, int]) -> None:
+        """Replace the contents with rows of ``CATALOG_COLUMNS`` in id order."""
+        self.names = []
+        self._codes = {}
+        chunks = [self._columns(rows) for rows in batches] or [self._empty_columns()]
+        self.ids, self.prices, self.stocks, self.sharded, self.name_codes = (
+            np.concatenate(parts) for parts in zip(*chunks)
+        )
+        self.position = position
+        self.refreshed_at = time.monotonic()
+        self._checkpoints.clear()
+
+    def checkpoint(self, frontier: int, at: float) -> None:
+        """Record that every write committed by ``at`` is below ``frontier``.
+
+        The snapshot is fresh as of ``at`` once its feed position gets there.
+        """
+        self._checkpoints.append((frontier, at))
+        self._advance()
+
+    def apply(
+        self, changed: Sequence, deleted: Sequence[int], position: tuple[int, int]
+    ) -> None:
+        """Apply one page of the goods change feed."""
+        if deleted:
+            keep = ~np.isin(self.ids, np.asarray(deleted, np.int64))
+            self._take(keep)
+
+        if changed:
+            ids, prices, stocks, sharded, codes = self._columns(changed)
+            slots = np.searchsorted(self.ids, ids)
+            found = slots < len(self.ids)
+            found[found] = self.ids[slots[found]] == ids[found]
+            at = slots[found]
+            self.prices[at] = prices[found]
+            self.stocks[at] = stocks[found]
+            self.sharded[at] = sharded[found]
+            self.name_codes[at] = codes[found]
+
+            new = ~found
+            if new.any():
+                self.ids = np.concatenate((self.ids, ids[new]))
+                self.prices = np.concatenate((self.prices, prices[new]))
+                self.stocks = np.concatenate((self.stocks, stocks[new]))
+                self.sharded = np.concatenate((self.sharded, sharded[new]))
+                self.name_codes = np.concatenate((self.name_codes, codes[new]))
+                self._take(np.argsort(self.ids, kind="stable"))
+
+        # Renames and deletes leave names behind; at least this many are unused
+        if len(self.names) - len(self.ids) > max(NAME_SLACK, len(self.ids) // 2):
+            self._compact_names()
+
+        self.position = position
+        self._advance()
+
+    def query(self, params: GoodsListParams, fields: frozenset[str]) -> dict:
+        """Serve one ``GET /goods`` page.
+
+        Args:
+            params: Filters, sort, cursor and page size
+            fields: Response fields, a subset of ``CATALOG_FIELDS``
+
+        Returns:
+            dict: ``items`` and ``next_cursor``, as ``GoodsPage`` would
+
+        Raises:
+            BadRequestException: If the cursor is invalid or belongs to another sort
+        """
+        after = None
+        if params.cursor:
+            after = GoodsRepository._decode_position(params.cursor, params.sort)
+        mask = self._filter(params)
+        descending = params.sort.value.startswith("-")
+        by_price = params.sort in (GoodsSort.PRICE, GoodsSort.PRICE_DESC)
+        sign = -1 if descending else 1
+
+        if after is not None:
+            # Compare in ascending key space: negating flips descending sorts
+            last_id = sign * int(after[-1])
+            ids = sign * self.ids
+            if by_price:
+                last_price = sign * to_cents(after[0])
+                prices = sign * self.prices
+                mask &= (prices > last_price) | (
+                    (prices == last_price) & (ids > last_id)
+                )
+            else:
+                mask &= ids > last_id
+
+        rows = np.flatnonzero(mask)
+        k = params.limit + 1
+        if by_price:
+            rows = self._top_k(
+                rows, sign * self.prices[rows], sign * self.ids[rows], k
+            )
+        else:
+            # Rows are already in id order
+            rows = rows[::-1][:k] if descending else rows[:k]
+
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[: params.limit]
+            last = rows[-1]
+            key = [int(self.ids[last])]
+            if by_price:
+                price = Decimal(int(self.prices[last])) / PRICE_SCALE
+                key.insert(0, f"{price:.2f}")
+            next_cursor = encode_cursor({"s": params.sort.value, "k": key})
+        return {
+            "items": [self._item(row, fields) for row in rows],
+            "next_cursor": next_cursor,
+        }
+
+    def _filter(self, filters: GoodsFilter) -> np.ndarray:
+        mask = np.ones(len(self.ids), np.bool_)
+        # Round first so e.g. 0.29 * 100 == 28.999... still means 29 cents
+        if filters.min_price is not None:
+            mask &= self.prices >= math.ceil(round(filters.min_price * PRICE_SCALE, 6))
+        if filters.max_price is not None:
+            mask &= self.prices <= math.floor(
+                round(filters.max_price * PRICE_SCALE, 6)
+            )
+        if filters.in_stock:
+            mask &= (self.stocks > 0) | self.sharded
+        return mask
+
+    @staticmethod
+    def _top_k(
+        rows: np.ndarray, primary: np.ndarray, secondary: np.ndarray, k: int
+    ) -> np.ndarray:
+        """Smallest ``k`` rows by ``(primary, secondary)`` without a full sort."""
+        if len(rows) > k:
+            # Everything up to the k-th primary key, ties included
+            kth = np.partition(primary, k - 1)[k - 1]
+            keep = primary <= kth
+            rows, primary, secondary = rows[keep], primary[keep], secondary[keep]
+        return rows[np.lexsort((secondary, primary))[:k]]
+
+    def _item(self, row: int, fields: frozenset[str]) -> dict:
+        item = {
+            "id": int(self.ids[row]),
+            "name": self.names[self.name_codes[row]],
+            "price": int(self.prices[row]) / PRICE_SCALE,
+            "stock": int(self.stocks[row]),
+        }
+        return {name: value for name, value in item.items() if name in fields}
+
+    def _columns(self, rows: Sequence) -> tuple[np.ndarray, ...]:
+        """Arrays of one batch of rows (or goods objects) with catalog columns."""
+        count = len(rows)
+        return (
+            np.fromiter((row.id for row in rows), np.int64, count),
+            np.fromiter((to_cents(row.price) for row in rows), np.int64, count),
+            np.fromiter((row.stock for row in rows), np.int32, count),
+            np.fromiter((row.stock_shards > 0 for row in rows), np.bool_, count),
+            np.fromiter((self._intern(row.name) for row in rows), np.int32, count),
+        )
+
+    @staticmethod
+    def _empty_columns() -> tuple[np.ndarray, ...]:
+        return (
+            np.empty(0, np.int64),
+            np.empty(0, np.int64),
+            np.empty(0, np.int32),
+            np.empty(0, np.bool_),
+            np.empty(0, np.int32),
+        )
+
+    def _advance(self) -> None:
+        if self.position is None:
+            return
+        while self._checkpoints and self._checkpoints[0][0] <= self.position[0]:
+            _, self.refreshed_at = self._checkpoints.popleft()
+
+    def _compact_names(self) -> None:
+        """Rebuild the intern table with only the names still in use."""
+        used, codes = np.unique(self.name_codes, return_inverse=True)
+        self.names = [self.names[code] for code in used]
+        self._codes = {name: code for code, name in enumerate(self.names)}
+        self.name_codes = codes.astype(np.int32)
+
+    def _intern(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def _take(self, selector: np.ndarray) -> None:
+        self.ids = self.ids[selector]
+        self.prices = self.prices[selector]
+        self.stocks = self.stocks[selector]
+        self.sharded = self.sharded[selector]
+        self.name_codes = self.name_codes[selector]
+
+
+goods_catalog = CatalogSnapshot()
+
+
+async def refresh_catalog() -> None:
+    """Load the catalog snapshot, or bring it up to date from the change feed.
+
+    The feed position is taken before the initial load, so writes that race
+    with it are replayed afterwards.
+    """
+    async with async_session() as session:
+        repository = GoodsRepository(session)
+        if goods_catalog.position is None:
+            position = (await repository.change_horizon(), -1)
+            batches = [
+                rows
+                async for rows in repository.stream_rows(
+                    GoodsFilter(), settings.GOODS_EXPORT_BATCH_SIZE, CATALOG_COLUMNS
+                )
+            ]
+            goods_catalog.load(batches, position)
+            logger.info(f"Loaded {len(goods_catalog)} goods into the catalog snapshot")
+            return
+
+        at = time.monotonic()
+        goods_catalog.checkpoint(await repository.change_frontier(), at)
+        has_more = True
+        while has_more:
+            changed, deleted, position, has_more = await repository.list_changes(
+                goods_catalog.position, settings.GOODS_CHANGES_PAGE_SIZE
+            )
+            goods_catalog.apply(changed, deleted, position)
+
+
+def create_catalog_refresher() -> PeriodicTask:
+    return PeriodicTask(
+        "goods-catalog-refresh",
+        refresh_catalog,
+        settings.GOODS_CATALOG_REFRESH_INTERVAL,
+    )
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import settings
+from api.core.logging import get_logger
+from api.utils.tasks import PeriodicTask
+
+logger = get_logger(__name__)
+
+GOODS_CHANNEL = "goods_changes"
+
+# NOTIFY payloads are capped at 8000 bytes; one event is well under 80
+NOTIFY_BATCH_SIZE = 80
+
+
+async def notify_goods_changed(session: AsyncSession, rows: Iterable) -> None:
+    """Queue a change notification for the given goods rows.
+
+    ``rows`` need ``id``, ``price``, ``stock`` and ``version``. PostgreSQL
+    delivers the notification when the session commits and drops it on
+    rollback, so listeners never see changes that did not happen.
+    """
+    events = [
+        {
+            "id": row.id,
+            "price": float(row.price),
+            "stock": row.stock,
+            "version": row.version,
+        }
+        for row in rows
+    ]
+    for start in range(0, len(events), NOTIFY_BATCH_SIZE):
+        payload = json.dumps(events[start : start + NOTIFY_BATCH_SIZE])
+        await session.execute(select(func.pg_notify(GOODS_CHANNEL, payload)))
+
+
+class GoodsSubscription:
+    """Bounded queue of change events for one client."""
+
+    def __init__(self, goods_ids: frozenset[int], queue_size: int):
+        self.goods_ids = goods_ids
+        self.queue: asyncio.Queue[dict | None] = asyncio.Queue(queue_size)
+        self.dropped = False
+
+
+class GoodsEventHub:
+    """Fan goods change notifications out to in-process subscribers.
+
+    Each worker keeps one LISTEN connection, whatever the number of
+    clients. A subscriber whose queue is full is dropped rather than
+    allowed to buffer without bound or slow the others down; it gets a
+    final ``None`` and should reconnect and refetch.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[GoodsSubscription]] = defaultdict(set)
+        self._connected = False
+
+    def subscribe(self, goods_ids: Iterable[int]) -> GoodsSubscription:
+        subscription = GoodsSubscription(frozenset(goods_ids), self.queue_size)
+        for goods_id in subscription.goods_ids:
+            self._subscribers[goods_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: GoodsSubscription) -> None:
+        for goods_id in subscription.goods_ids:
+            subscribers = self._subscribers.get(goods_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[goods_id]
+
+    def publish(self, events: list[dict]) -> None:
+        for event in events:
+            for subscription in list(self._subscribers.get(event["id"], ())):
+                try:
+                    subscription.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    self._drop(subscription)
+
+    def drop_all(self) -> None:
+        subscriptions = {sub for subs in self._subscribers.values() for sub in subs}
+        for subscription in subscriptions:
+            self._drop(subscription)
+
+    def _drop(self, subscription: GoodsSubscription) -> None:
+        self.unsubscribe(subscription)
+        subscription.dropped = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            events = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed {channel} payload")
+            return
+        self.publish(events)
+
+    async def listen(self) -> None:
+        """Hold the LISTEN connection until it is lost.
+
+        Notifications sent while disconnected are lost, so subscribers are
+        dropped on every reconnect and refetch what they display.
+        """
+        url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+        connection = await asyncpg.connect(url.render_as_string(hide_password=False))
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(GOODS_CHANNEL, self._on_notify)
+            if self._connected:
+                self.drop_all()
+            self._connected = True
+            logger.info(f"Listening for {GOODS_CHANNEL} notifications")
+            await closed.wait()
+            logger.warning(f"Lost the {GOODS_CHANNEL} listener connection")
+        finally:
+            await connection.close()
+
+
+goods_events = GoodsEventHub(settings.GOODS_EVENTS_QUEUE_SIZE)
+
+
+async def goods_event_stream(
+    subscription: GoodsSubscription, heartbeat: float
+) -> AsyncIterator[str]:
+    """Render a subscription as a Server-Sent Events stream.
+
+    A comment line goes out every ``heartbeat`` seconds without events, so
+    proxies keep the connection open. The subscription is released when
+    the client disconnects.
+    """
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is None:
+                yield "event: dropped\ndata: {}\n\n"
+                return
+            yield f"event: goods\ndata: {json.dumps(event)}\n\n"
+    finally:
+        goods_events.unsubscribe(subscription)
+
+
+def create_goods_listener() -> PeriodicTask:
+    """Background task keeping this worker's LISTEN connection up."""
+    return PeriodicTask(
+        "goods-events-listener",
+        goods_events.listen,
+        settings.GOODS_EVENTS_RECONNECT_DELAY,
+    )
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy.engine import Row
+
+from api.core.config import settings
+from api.core.database import async_session
+from api.src.goods.repository import EXPORT_COLUMNS, GoodsRepository
+from api.src.goods.schemas import FeedFormat, GoodsFilter
+
+MEDIA_TYPES = {
+    FeedFormat.NDJSON: "application/x-ndjson",
+    FeedFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def encode_ndjson(rows: Sequence[Row]) -> bytes:
+    lines = []
+    for row in rows:
+        record = row._asdict()
+        record["price"] = float(record["price"])
+        lines.append(json.dumps(record, ensure_ascii=False))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def encode_csv(rows: Sequence[Row], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def export_goods(
+    filters: GoodsFilter, fmt: FeedFormat, gzip: bool = False
+) -> AsyncIterator[bytes]:
+    """Produce the catalog as NDJSON or CSV chunks, optionally gzip encoded.
+
+    Opens its own session: the body is produced after the endpoint returns,
+    when request-scoped dependencies may already be closed.
+    """
+    compressor = zlib.compressobj(wbits=31) if gzip else None  # 31: gzip header
+
+    def encode(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if fmt == FeedFormat.CSV:
+        yield encode(encode_csv([], header=True))
+
+    async with async_session() as session:
+        batches = GoodsRepository(session).stream_rows(
+            filters, settings.GOODS_EXPORT_BATCH_SIZE
+        )
+        async for rows in batches:
+            chunk = encode_ndjson(rows) if fmt == FeedFormat.NDJSON else encode_csv(rows)
+            data = encode(chunk)
+            if data:
+                yield data
+
+    if compressor:
+        yield compressor.flush()
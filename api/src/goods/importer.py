@@ -0,0 +1,179 @@
+import csv
+import json
+from collections.abc import AsyncIterator
+
+from asyncpg import PostgresError
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import settings
+from api.core.logging import get_logger
+from api.src.goods.repository import GoodsRepository
+from api.src.goods.schemas import FeedFormat, GoodsCreate
+
+logger = get_logger(__name__)
+
+
+class GoodsImportRow(GoodsCreate):
+    """GoodsCreate with the column limits of the goods table.
+
+    Rows are checked up front so one bad row cannot fail a whole COPY.
+    """
+
+    name: str = Field(..., min_length=1, max_length=100)
+    title: str | None = Field(None, max_length=100)
+    img: str | None = Field(None, max_length=255)
+    detail: str | None = None
+    price: float = Field(..., ge=0, lt=10**8)
+    stock: int = Field(0, ge=0, lt=2**31)
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class GoodsImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = []
+    errors_truncated: bool = False
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body."""
+    pending = b""
+    first = True
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            text = line.decode("utf-8-sig" if first else "utf-8").rstrip("\r")
+            first = False
+            yield text
+    if pending:
+        yield pending.decode("utf-8-sig" if first else "utf-8").rstrip("\r")
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], fmt: FeedFormat
+) -> AsyncIterator[tuple[int, dict | str]]:
+    """Parse NDJSON or CSV (with a header row) into ``(line, record)`` pairs.
+
+    ``record`` is an error message instead of a dict when the line cannot be
+    parsed. Blank lines are skipped.
+    """
+    header: list[str] | None = None
+    record_lines: list[str] = []
+    start = 0
+    line_no = 0
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if fmt == FeedFormat.NDJSON:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, "Expected a JSON object"
+                continue
+            yield line_no, record
+            continue
+
+        # A quoted CSV field may span lines: collect until the quotes balance
+        if not record_lines:
+            if not line.strip():
+                continue
+            start = line_no
+        record_lines.append(line)
+        text = "\n".join(record_lines)
+        if text.count('"') % 2:
+            continue
+        record_lines = []
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells fall back to the schema defaults
+        yield start, {name: value for name, value in zip(header, values) if value != ""}
+
+    if record_lines:
+        yield start, "Unterminated quoted field"
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+class GoodsImporter:
+    """Streams rows into goods through COPY and an upsert, chunk by chunk.
+
+    Each chunk is validated, copied and committed on its own, so a bad row
+    or even a failed chunk is reported without aborting the rest of the feed.
+    """
+
+    def __init__(self, session: AsyncSession, chunk_size: int | None = None):
+        self.session = session
+        self.repository = GoodsRepository(session)
+        self.chunk_size = chunk_size or settings.GOODS_IMPORT_CHUNK_SIZE
+        self.report = GoodsImportReport()
+
+    async def run(
+        self, chunks: AsyncIterator[bytes], fmt: FeedFormat
+    ) -> GoodsImportReport:
+        batch: list[tuple[int, GoodsImportRow]] = []
+        async for line, record in iter_records(chunks, fmt):
+            self.report.total += 1
+            if isinstance(record, str):
+                self._fail(line, record)
+                continue
+            try:
+                batch.append((line, GoodsImportRow.model_validate(record)))
+            except ValidationError as e:
+                self._fail(line, _describe(e))
+                continue
+            if len(batch) >= self.chunk_size:
+                await self._load(batch)
+                batch = []
+        if batch:
+            await self._load(batch)
+
+        logger.info(
+            f"Goods import finished: {self.report.inserted} inserted, "
+            f"{self.report.updated} updated, {self.report.failed} failed"
+        )
+        return self.report
+
+    async def _load(self, batch: list[tuple[int, GoodsImportRow]]) -> None:
+        try:
+            inserted, updated = await self.repository.bulk_upsert(batch)
+            await self.session.commit()
+        except (SQLAlchemyError, PostgresError) as e:
+            await self.session.rollback()
+            logger.warning(f"Goods import chunk at line {batch[0][0]} failed: {e}")
+            for line, _ in batch:
+                self._fail(line, "Chunk rejected by the database")
+            return
+        self.repository.invalidate_all()
+        self.report.inserted += inserted
+        self.report.updated += updated
+
+    def _fail(self, line: int, error: str) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < settings.GOODS_IMPORT_MAX_ERRORS:
+            self.report.errors.append(ImportRowError(line=line, error=error))
+        else:
+            self.report.errors_truncated = True
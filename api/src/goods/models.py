@@ -1,19 +1,110 @@
 
-from sqlalchemy import BigInteger,Integer, Numeric, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func, text
 from api.core.database import Base
 
+# 64-bit id of the writing transaction; see GoodsRepository.list_changes
+CURRENT_XID = "pg_current_xact_id()::text::bigint"
+
 
 class Goods(Base):
     __tablename__ = "goods"
+    __table_args__ = (
+        # Keyset pagination when listing by price
+        Index("ix_goods_price_id", "price", "id"),
+        Index("ix_goods_search_vector", "search_vector", postgresql_using="gin"),
+        # Fuzzy name matching for the search fallback (pg_trgm)
+        Index(
+            "ix_goods_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        # Delta sync (GET /goods/changes)
+        Index("ix_goods_change_xid_id", "change_xid", "id"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
-    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     title: Mapped[str] = mapped_column(String(100), nullable=True)
     img: Mapped[str] = mapped_column(String(255), nullable=True)
     detail: Mapped[str] = mapped_column(Text, nullable=True)
     price: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
     stock: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # 0: stock lives in `stock`; N > 0: stock is split over N goods_stock_shard rows
+    # and `stock` mirrors their sum for readers (GoodsRepository.sync_shard_stock)
+    stock_shards: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Bumped by every write through GoodsRepository; drives ETag/Last-Modified
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    # Transaction that last wrote the row, ordered for the change feed
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text(CURRENT_XID)
+    )
+    # Maintained by PostgreSQL; 'simple' keeps mixed-language text searchable
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(detail, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     order_items: Mapped[list["OrderItem"]] = relationship( 
         "OrderItem", back_populates="goods"
     )
+
+
+class GoodsStockShard(Base):
+    """One slice of a hot goods' stock.
+
+    Flash-sale goods spread their stock over several rows so that concurrent
+    orders lock different rows instead of queueing on the single goods row.
+    """
+
+    __tablename__ = "goods_stock_shard"
+
+    goods_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("goods.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard_no: Mapped[int] = mapped_column(Integer, primary_key=True)
+    stock: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class GoodsTombstone(Base):
+    """Marker left by a deleted goods so delta-sync clients can drop it."""
+
+    __tablename__ = "goods_tombstone"
+    __table_args__ = (
+        Index("ix_goods_tombstone_change_xid_goods_id", "change_xid", "goods_id"),
+    )
+
+    goods_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=False
+    )
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text(CURRENT_XID)
+    )
+    deleted_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -1,11 +1,133 @@
+import re
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from api.core.exceptions import AlreadyExistsException, NotFoundException
-from api.src.goods.models import Goods
-from api.src.goods.schemas import GoodsCreate
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    any_,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import load_only
+from api.core.cache import TTLCache
+from api.core.config import settings
+from api.core.exceptions import (
+    AlreadyExistsException,
+    BadRequestException,
+    InsufficientStockException,
+    NotFoundException,
+)
+from api.src.goods.events import notify_goods_changed
+from api.src.goods.models import CURRENT_XID, Goods, GoodsStockShard, GoodsTombstone
+from api.src.goods.schemas import (
+    GoodsCreate,
+    GoodsFilter,
+    GoodsListParams,
+    GoodsSearchMode,
+    GoodsSearchParams,
+    GoodsSnapshot,
+    GoodsSort,
+)
+from api.utils.pagination import decode_cursor, encode_cursor
+
+
+# Per-process read-through cache of goods by id. Writes going through this
+# repository invalidate their entries; other workers catch up within the TTL.
+goods_cache: TTLCache[int, GoodsSnapshot] = TTLCache(
+    maxsize=settings.GOODS_CACHE_SIZE, ttl=settings.GOODS_CACHE_TTL
+)
+
+# Must match the configuration of the goods.search_vector generated column
+TS_CONFIG = literal_column("'simple'")
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+# What change notifications carry, see api.src.goods.events
+NOTIFY_COLUMNS = (Goods.id, Goods.price, Goods.stock, Goods.version)
+
+# Oldest transaction still running; every older one has committed or aborted
+SNAPSHOT_XMIN = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+# First transaction id not yet assigned; every committed one is below it
+SNAPSHOT_XMAX = "pg_snapshot_xmax(pg_current_snapshot())::text::bigint"
+
+EXPORT_COLUMNS = ["id", "name", "title", "img", "detail", "price", "stock"]
+
+IMPORT_COLUMNS = ["line", "name", "title", "img", "detail", "price", "stock"]
+
+# Survives the session's connection being reused; emptied at every commit
+CREATE_IMPORT_STAGING = text(
+    """
+    CREATE TEMP TABLE IF NOT EXISTS goods_import_staging (
+        line integer NOT NULL,
+        name varchar(100) NOT NULL,
+        title varchar(100),
+        img varchar(255),
+        detail text,
+        price numeric(10, 2) NOT NULL,
+        stock integer NOT NULL
+    ) ON COMMIT DELETE ROWS
+    """
+)
+
+# Goods are matched by name, as in scripts/seed.py; the last line wins when a
+# name repeats. Sharded goods keep their stock in their shards.
+MERGE_IMPORT_STAGING = text(
+    """
+    WITH latest AS (
+        SELECT DISTINCT ON (name) name, title, img, detail, price, stock
+        FROM goods_import_staging
+        ORDER BY name, line DESC
+    ), updated AS (
+        UPDATE goods AS g
+        SET title = l.title,
+            img = l.img,
+            detail = l.detail,
+            price = l.price,
+            stock = CASE WHEN g.stock_shards = 0 THEN l.stock ELSE g.stock END,
+            version = g.version + 1,
+            updated_at = now(),
+            change_xid = pg_current_xact_id()::text::bigint
+        FROM latest AS l
+        WHERE g.name = l.name
+        RETURNING g.name
+    ), inserted AS (
+        INSERT INTO goods (name, title, img, detail, price, stock)
+        SELECT name, title, img, detail, price, stock
+        FROM latest
+        WHERE name NOT IN (SELECT name FROM updated)
+        RETURNING id
+    )
+    SELECT (SELECT count(*) FROM inserted), (SELECT count(DISTINCT name) FROM updated)
+    """
+)
+
 
+def prefix_tsquery(text: str) -> str:
+    """Turn free text into a tsquery matching words that start with each term.
+
+    Only word characters survive, so user input can never inject tsquery
+    operators. Returns an empty string when nothing searchable is left.
+    """
+    return " & ".join(f"{term}:*" for term in re.findall(r"\w+", text.lower()))
 
 
 class GoodsRepository():
@@ -47,6 +169,105 @@ class GoodsRepository():
         return good
 
 
+    async def get_snapshot(self, goods_id: int) -> GoodsSnapshot:
+        """Get an immutable copy of a good, served from the cache when possible.
+
+        Args:
+            goods_id: Good ID
+
+        Returns:
+            GoodsSnapshot: Good data
+
+        Raises:
+            NotFoundException: If good not found
+        """
+        snapshot = goods_cache.get(goods_id)
+        if snapshot is None:
+            good = await self.get_by_id(goods_id)
+            snapshot = GoodsSnapshot.model_validate(good)
+            goods_cache.set(goods_id, snapshot)
+        return snapshot
+
+
+    async def get_fields(
+        self, goods_id: int, fields: frozenset[str]
+    ) -> Goods | GoodsSnapshot:
+        """Get a good for a sparse response, loading only ``fields``.
+
+        A cached snapshot already holds every field and is returned as is;
+        otherwise only the requested columns are selected (and not cached).
+
+        Args:
+            goods_id: Good ID
+            fields: Columns to load
+
+        Returns:
+            Goods | GoodsSnapshot: Object exposing at least ``fields``
+
+        Raises:
+            NotFoundException: If good not found
+        """
+        snapshot = goods_cache.get(goods_id)
+        if snapshot is not None:
+            return snapshot
+
+        query = (
+            select(Goods).where(Goods.id == goods_id).options(self._load_only(fields))
+        )
+        result = await self.session.execute(query)
+        good = result.scalar_one_or_none()
+        if good is None:
+            raise NotFoundException("Good not found")
+        return good
+
+
+    async def get_version(self, goods_id: int) -> tuple[int, datetime]:
+        """Get only the version and modification time of a good.
+
+        Used to answer conditional requests without reading the whole row;
+        a cached snapshot is used when one is available.
+
+        Args:
+            goods_id: Good ID
+
+        Returns:
+            tuple[int, datetime]: Version and last modification time
+
+        Raises:
+            NotFoundException: If good not found
+        """
+        snapshot = goods_cache.get(goods_id)
+        if snapshot is not None:
+            return snapshot.version, snapshot.updated_at
+
+        query = select(Goods.version, Goods.updated_at).where(Goods.id == goods_id)
+        result = await self.session.execute(query)
+        row = result.one_or_none()
+        if row is None:
+            raise NotFoundException("Good not found")
+        return row.version, row.updated_at
+
+
+    async def get_many(self, goods_ids: list[int]) -> dict[int, Goods]:
+        """Get several goods in a single query.
+
+        The ids are bound as one array parameter (``id = ANY(:ids)``) so the
+        statement text is the same for every cart size.
+
+        Args:
+            goods_ids: Goods IDs, duplicates are ignored
+
+        Returns:
+            dict[int, Goods]: Found goods keyed by ID; missing IDs are absent
+        """
+        if not goods_ids:
+            return {}
+        ids = sorted(set(goods_ids))
+        query = select(Goods).where(Goods.id == any_(literal(ids, ARRAY(BigInteger))))
+        result = await self.session.execute(query)
+        return {good.id: good for good in result.scalars().all()}
+
+
     async def get_all(self) -> list[Goods]:
         """Get all goods.
 
@@ -57,6 +278,297 @@ class GoodsRepository():
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def stream_rows(
+        self,
+        filters: GoodsFilter,
+        batch_size: int,
+        columns: list[str] = EXPORT_COLUMNS,
+    ) -> AsyncIterator[list[Row]]:
+        """Stream goods as plain rows through a server-side cursor.
+
+        Only ``batch_size`` rows are held in memory at a time and no ORM
+        objects are built, so memory use does not grow with the catalog.
+
+        Args:
+            filters: Listing filters
+            batch_size: Rows fetched per round trip
+            columns: Goods columns to select
+
+        Yields:
+            list[Row]: Rows with the given columns, in id order
+        """
+        query = self.apply_filters(
+            select(*(getattr(Goods, name) for name in columns)), filters
+        ).order_by(Goods.id)
+        result = await self.session.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def list_page(
+        self, params: GoodsListParams, fields: frozenset[str] | None = None
+    ) -> tuple[list[Goods], str | None]:
+        """Get one page of goods using keyset pagination.
+
+        Pages continue from the sort key of the previous page's last row
+        (``WHERE (price, id) > (:price, :id)``) instead of skipping rows with
+        OFFSET, so every page costs the same index range scan.
+
+        Args:
+            params: Filters, sort key, cursor and page size
+            fields: Columns to load, all when None
+
+        Returns:
+            tuple[list[Goods], str | None]: Goods of the page and the cursor of
+            the next page, None on the last page
+
+        Raises:
+            BadRequestException: If the cursor is invalid or belongs to another sort
+        """
+        keys = self._sort_keys(params.sort)
+        descending = params.sort.value.startswith("-")
+
+        query = self.apply_filters(select(Goods), params)
+        if fields is not None:
+            query = query.options(self._load_only(fields, *keys))
+        if params.cursor:
+            position = tuple_(*keys)
+            after = tuple_(*self._decode_position(params.cursor, params.sort))
+            query = query.where(position < after if descending else position > after)
+        query = query.order_by(
+            *(key.desc() if descending else key.asc() for key in keys)
+        ).limit(params.limit + 1)
+
+        result = await self.session.execute(query)
+        goods = list(result.scalars().all())
+
+        next_cursor = None
+        if len(goods) > params.limit:
+            goods = goods[: params.limit]
+            next_cursor = self._encode_position(goods[-1], params.sort)
+        return goods, next_cursor
+
+    async def change_horizon(self) -> int:
+        """Get the change feed position below which no write is in flight."""
+        return await self.session.scalar(select(literal_column(SNAPSHOT_XMIN)))
+
+    async def change_frontier(self) -> int:
+        """Get the change feed position below which every committed write is.
+
+        The feed has delivered all writes committed so far once its horizon
+        reaches this value; a long transaction holds the horizon back.
+        """
+        return await self.session.scalar(select(literal_column(SNAPSHOT_XMAX)))
+
+    async def list_changes(
+        self, after: tuple[int, int], limit: int
+    ) -> tuple[list[Goods], list[int], tuple[int, int], bool]:
+        """Get goods written or deleted after a change feed position.
+
+        Every goods write stamps the row (or its tombstone) with the id of the
+        writing transaction. Positions are ``(change_xid, id)`` pairs, and only
+        changes from transactions older than every transaction still running
+        (the snapshot xmin) are returned. A plain sequence would not do: its
+        values become visible in commit order, not in allocation order, so a
+        reader could move past a value whose transaction has yet to commit.
+
+        Args:
+            after: Position of the last change the caller has seen
+            limit: Maximum number of changes to return
+
+        Returns:
+            tuple[list[Goods], list[int], tuple[int, int], bool]: Changed goods,
+            deleted goods ids, the position to resume from and whether more
+            changes are already available
+        """
+        horizon = await self.change_horizon()
+        position = tuple_(literal(after[0], BigInteger), literal(after[1], BigInteger))
+
+        changed_query = (
+            select(Goods)
+            .where(
+                tuple_(Goods.change_xid, Goods.id) > position,
+                Goods.change_xid < horizon,
+            )
+            .order_by(Goods.change_xid, Goods.id)
+            .limit(limit + 1)
+        )
+        deleted_query = (
+            select(GoodsTombstone.change_xid, GoodsTombstone.goods_id)
+            .where(
+                tuple_(GoodsTombstone.change_xid, GoodsTombstone.goods_id) > position,
+                GoodsTombstone.change_xid < horizon,
+            )
+            .order_by(GoodsTombstone.change_xid, GoodsTombstone.goods_id)
+            .limit(limit + 1)
+        )
+        changed = (await self.session.execute(changed_query)).scalars().all()
+        deleted = (await self.session.execute(deleted_query)).all()
+
+        merged = sorted(
+            [(good.change_xid, good.id, good) for good in changed]
+            + [(xid, goods_id, None) for xid, goods_id in deleted],
+            key=lambda change: change[:2],
+        )
+        has_more = len(merged) > limit
+        merged = merged[:limit]
+        if has_more:
+            next_position = merged[-1][:2]
+        else:
+            # Everything below the horizon has been seen
+            next_position = max(tuple(after), (horizon, -1))
+        return (
+            [good for _, _, good in merged if good is not None],
+            [goods_id for _, goods_id, good in merged if good is None],
+            next_position,
+            has_more,
+        )
+
+    async def search(
+        self, params: GoodsSearchParams
+    ) -> tuple[list, str | None, GoodsSearchMode]:
+        """Search goods by name, title and detail.
+
+        ``auto`` mode uses prefix matching for queries shorter than
+        ``SEARCH_MIN_FTS_LENGTH`` and ranked full-text search otherwise,
+        falling back to trigram similarity when full-text finds nothing.
+        The first two are served by the GIN index on ``search_vector``, the
+        last by the trigram index on ``name``. Pages are keyed on
+        ``(score, id)``; the cursor pins the mode chosen for the first page.
+
+        Args:
+            params: Query text, mode, cursor and page size
+
+        Returns:
+            tuple[list, str | None, GoodsSearchMode]: Hit rows, cursor of the
+            next page and the mode actually used
+
+        Raises:
+            BadRequestException: If the cursor is invalid
+        """
+        mode = params.mode
+        after = None
+        if params.cursor:
+            data = decode_cursor(params.cursor)
+            try:
+                mode = GoodsSearchMode(data["m"])
+                score, goods_id = data["k"]
+                after = (float(score), int(goods_id))
+            except (KeyError, TypeError, ValueError):
+                raise BadRequestException("Invalid cursor")
+        elif mode == GoodsSearchMode.AUTO:
+            short = len(params.q.strip()) < settings.SEARCH_MIN_FTS_LENGTH
+            mode = GoodsSearchMode.PREFIX if short else GoodsSearchMode.FTS
+
+        rows = await self._search_page(params.q, mode, after, params.limit)
+        if (
+            not rows
+            and after is None
+            and params.mode == GoodsSearchMode.AUTO
+            and mode == GoodsSearchMode.FTS
+        ):
+            mode = GoodsSearchMode.TRIGRAM
+            rows = await self._search_page(params.q, mode, None, params.limit)
+
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[: params.limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({"m": mode.value, "k": [last.score, last.id]})
+        return rows, next_cursor, mode
+
+    async def _search_page(
+        self, text: str, mode: GoodsSearchMode, after: tuple | None, limit: int
+    ) -> list:
+        if mode == GoodsSearchMode.TRIGRAM:
+            match = Goods.name.op("%")(text)
+            score = func.similarity(Goods.name, text)
+            highlight = null()
+        else:
+            if mode == GoodsSearchMode.PREFIX:
+                terms = prefix_tsquery(text)
+                if not terms:
+                    return []
+                tsquery = func.to_tsquery(TS_CONFIG, terms)
+            else:
+                tsquery = func.websearch_to_tsquery(TS_CONFIG, text)
+            match = Goods.search_vector.op("@@")(tsquery)
+            score = func.ts_rank_cd(Goods.search_vector, tsquery)
+            highlight = func.ts_headline(
+                TS_CONFIG,
+                func.coalesce(Goods.detail, Goods.title, Goods.name),
+                tsquery,
+                HEADLINE_OPTIONS,
+            )
+
+        # Rank and cut the page first so the costly headline (and the detail
+        # text it reads) is only produced for the rows being returned
+        page = select(Goods.id.label("id"), score.label("score")).where(match)
+        if after is not None:
+            page = page.where(tuple_(score, Goods.id) < tuple_(*after))
+        page = (
+            page.order_by(score.desc(), Goods.id.desc())
+            .limit(limit + 1)
+            .subquery("page")
+        )
+        query = (
+            select(
+                Goods.id,
+                Goods.name,
+                Goods.title,
+                Goods.img,
+                Goods.price,
+                Goods.stock,
+                page.c.score,
+                highlight.label("highlight"),
+            )
+            .join(page, page.c.id == Goods.id)
+            .order_by(page.c.score.desc(), page.c.id.desc())
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    @staticmethod
+    def apply_filters(query, filters: GoodsFilter):
+        """Add the shared listing filters to a query selecting from goods."""
+        if filters.min_price is not None:
+            query = query.where(Goods.price >= filters.min_price)
+        if filters.max_price is not None:
+            query = query.where(Goods.price <= filters.max_price)
+        if filters.in_stock:
+            # Sharded goods keep their stock in goods_stock_shard
+            query = query.where(or_(Goods.stock > 0, Goods.stock_shards > 0))
+        return query
+
+    @staticmethod
+    def _sort_keys(sort: GoodsSort):
+        if sort in (GoodsSort.PRICE, GoodsSort.PRICE_DESC):
+            return (Goods.price, Goods.id)
+        return (Goods.id,)
+
+    @staticmethod
+    def _encode_position(good: Goods, sort: GoodsSort) -> str:
+        if sort in (GoodsSort.PRICE, GoodsSort.PRICE_DESC):
+            # Prices travel as strings so the NUMERIC comparison stays exact
+            return encode_cursor({"s": sort.value, "k": [str(good.price), good.id]})
+        return encode_cursor({"s": sort.value, "k": [good.id]})
+
+    @staticmethod
+    def _decode_position(cursor: str, sort: GoodsSort) -> list:
+        data = decode_cursor(cursor)
+        key = data.get("k")
+        if data.get("s") != sort.value or not isinstance(key, list):
+            raise BadRequestException("Cursor does not match the requested sort")
+        try:
+            if sort in (GoodsSort.PRICE, GoodsSort.PRICE_DESC):
+                price, goods_id = key
+                return [Decimal(price), int(goods_id)]
+            (goods_id,) = key
+            return [int(goods_id)]
+        except (TypeError, ValueError, InvalidOperation):
+            raise BadRequestException("Invalid cursor")
+
     async def update(self, goods_id: int, goods_data: GoodsCreate) -> Goods:
         """Update good by ID.
 
@@ -74,13 +586,21 @@ class GoodsRepository():
         if not update_data:
             raise ValueError("No fields to update")
 
-        query = update(Goods).where(Goods.id == goods_id).values(**update_data)
+        query = (
+            update(Goods)
+            .where(Goods.id == goods_id)
+            .values(**update_data, **self._bump())
+            .returning(*NOTIFY_COLUMNS)
+        )
         result = await self.session.execute(query)
+        rows = result.all()
 
-        if result.rowcount == 0:
+        if not rows:
             raise NotFoundException(f"Goods with id {goods_id} not found")
 
+        await notify_goods_changed(self.session, rows)
         await self.session.commit()
+        goods_cache.delete(goods_id)
         return await self.get_by_id(goods_id)
 
     async def delete(self, goods_id: int) -> None:
@@ -98,4 +618,410 @@ class GoodsRepository():
         if result.rowcount == 0:
             raise NotFoundException(f"Goods with id {goods_id} not found")
 
+        # Left for delta-sync clients, see list_changes
+        tombstone = pg_insert(GoodsTombstone).values(goods_id=goods_id)
+        await self.session.execute(
+            tombstone.on_conflict_do_update(
+                index_elements=[GoodsTombstone.goods_id],
+                set_={
+                    "change_xid": literal_column(CURRENT_XID),
+                    "deleted_at": func.now(),
+                },
+            )
+        )
         await self.session.commit()
+        goods_cache.delete(goods_id)
+
+    async def bulk_upsert(
+        self, rows: list[tuple[int, GoodsCreate]]
+    ) -> tuple[int, int]:
+        """Load validated rows with COPY into a staging table, then upsert.
+
+        Does not commit; the staging table empties itself on commit. Updated
+        rows are found by name, so the caller drops every cached snapshot
+        with ``invalidate_all`` once it has committed.
+
+        Args:
+            rows: ``(source line, goods data)`` pairs
+
+        Returns:
+            tuple[int, int]: Number of inserted and updated goods
+        """
+        await self.session.execute(CREATE_IMPORT_STAGING)
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "goods_import_staging",
+            records=[
+                (
+                    line,
+                    good.name,
+                    good.title,
+                    good.img,
+                    good.detail,
+                    Decimal(str(good.price)),
+                    good.stock,
+                )
+                for line, good in rows
+            ],
+            columns=IMPORT_COLUMNS,
+        )
+        result = await self.session.execute(MERGE_IMPORT_STAGING)
+        inserted, updated = result.one()
+        return inserted, updated
+
+    async def commit_stock(
+        self, counts: dict[int, int], sharded: frozenset[int] = frozenset()
+    ) -> None:
+        """Atomically take stock for a whole cart.
+
+        Plain goods are decremented by a single conditional
+        ``UPDATE ... WHERE stock >= n``. Their rows are locked in ascending id
+        order first, so concurrent carts touching the same goods cannot
+        deadlock. Goods listed in ``sharded`` are taken from one of their
+        stock shards instead (see ``enable_stock_shards``).
+
+        Nothing is committed here: the caller commits together with the order,
+        and must roll the session back if this raises. Once committed, it
+        drops the cached snapshots of the goods with ``invalidate``.
+
+        Args:
+            counts: Requested quantity keyed by goods ID
+            sharded: IDs of goods whose stock is split into shards
+
+        Raises:
+            InsufficientStockException: If any goods cannot cover its count
+        """
+        plain_ids = sorted(goods_id for goods_id in counts if goods_id not in sharded)
+        if plain_ids:
+            requested = values(
+                column("goods_id", BigInteger),
+                column("count", Integer),
+                name="requested",
+            ).data([(goods_id, counts[goods_id]) for goods_id in plain_ids])
+            locked = self._lock_goods(plain_ids)
+            query = (
+                update(Goods)
+                .where(
+                    Goods.id == locked.c.id,
+                    Goods.id == requested.c.goods_id,
+                    Goods.stock >= requested.c.count,
+                )
+                .values(stock=Goods.stock - requested.c.count, **self._bump())
+                .returning(*NOTIFY_COLUMNS)
+            )
+            result = await self.session.execute(query)
+            rows = result.all()
+            taken = {row.id for row in rows}
+            for goods_id in plain_ids:
+                if goods_id not in taken:
+                    raise InsufficientStockException(goods_id)
+            await notify_goods_changed(self.session, rows)
+
+        await self.take_from_shards(
+            {
+                goods_id: count
+                for goods_id, count in counts.items()
+                if goods_id in sharded
+            }
+        )
+
+    async def take_from_shards(self, counts: dict[int, int]) -> None:
+        """Take stock of sharded goods, each line from one shard. Does not commit.
+
+        ``Goods.stock`` is then refreshed from the shards, bumped and
+        announced like a plain ``commit_stock`` (see ``sync_shard_stock``).
+
+        Raises:
+            InsufficientStockException: If no shard of a goods can cover its count
+        """
+        for goods_id in sorted(counts):
+            await self._take_from_shard(goods_id, counts[goods_id])
+        if counts:
+            await self.sync_shard_stock(sorted(counts))
+
+    async def lock_stock(self, goods_ids: list[int]) -> dict[int, int]:
+        """Lock goods rows in id order and read their stock. Does not commit.
+
+        Lets a caller share out stock between several orders itself, then
+        take it all with one ``commit_stock``.
+
+        Args:
+            goods_ids: Goods IDs
+
+        Returns:
+            dict[int, int]: Stock keyed by goods ID; missing IDs are absent
+        """
+        if not goods_ids:
+            return {}
+        ids = sorted(set(goods_ids))
+        query = (
+            select(Goods.id, Goods.stock)
+            .where(Goods.id == any_(literal(ids, ARRAY(BigInteger))))
+            .order_by(Goods.id)
+            .with_for_update()
+        )
+        result = await self.session.execute(query)
+        return {row.id: row.stock for row in result.all()}
+
+    async def restore_stock(self, counts: dict[int, int]) -> None:
+        """Give stock back, e.g. when a reservation expires.
+
+        Rows are locked in id order like ``commit_stock``. Stock of sharded
+        goods goes back to their first shard, then their mirrored stock is
+        refreshed. Does not commit; the caller drops the cached snapshots
+        with ``invalidate`` after committing.
+
+        Args:
+            counts: Quantity to return keyed by goods ID
+        """
+        goods_ids = sorted(counts)
+        if not goods_ids:
+            return
+
+        returned = values(
+            column("goods_id", BigInteger),
+            column("count", Integer),
+            name="returned",
+        ).data([(goods_id, counts[goods_id]) for goods_id in goods_ids])
+        locked = self._lock_goods(goods_ids)
+        query = (
+            update(Goods)
+            .where(
+                Goods.id == locked.c.id,
+                Goods.id == returned.c.goods_id,
+                Goods.stock_shards == 0,
+            )
+            .values(stock=Goods.stock + returned.c.count, **self._bump())
+            .returning(*NOTIFY_COLUMNS)
+        )
+        result = await self.session.execute(query)
+        rows = result.all()
+        restored = {row.id for row in rows}
+        await notify_goods_changed(self.session, rows)
+
+        for goods_id in goods_ids:
+            if goods_id in restored:
+                continue
+            query = (
+                update(GoodsStockShard)
+                .where(
+                    GoodsStockShard.goods_id == goods_id,
+                    GoodsStockShard.shard_no == 0,
+                )
+                .values(stock=GoodsStockShard.stock + counts[goods_id])
+            )
+            await self.session.execute(query)
+        sharded_ids = [goods_id for goods_id in goods_ids if goods_id not in restored]
+        if sharded_ids:
+            await self.sync_shard_stock(sharded_ids)
+
+    async def sync_shard_stock(self, goods_ids: list[int] | None = None) -> list[int]:
+        """Refresh ``Goods.stock`` of sharded goods from their shards. Does not commit.
+
+        Goods whose mirrored stock differs from their shard sum get it,
+        with a version bump and a change notification, so every reader of
+        ``Goods.stock`` (snapshots, listings, search, export, the change
+        feed and live events) sees shard sales. Goods rows locked by another
+        transaction are skipped rather than waited for: that would queue
+        every sale on the one row sharding spreads out. A skipped refresh
+        is made by the next sale or the periodic ``refresh_shard_stock`` job.
+
+        Args:
+            goods_ids: Goods to refresh, every sharded goods when None
+
+        Returns:
+            list[int]: IDs of the refreshed goods
+        """
+        shard_stock = (
+            select(func.coalesce(func.sum(GoodsStockShard.stock), 0))
+            .where(GoodsStockShard.goods_id == Goods.id)
+            .scalar_subquery()
+        )
+        locked = select(Goods.id).where(Goods.stock_shards > 0)
+        if goods_ids is not None:
+            locked = locked.where(
+                Goods.id == any_(literal(goods_ids, ARRAY(BigInteger)))
+            )
+        locked = (
+            locked.order_by(Goods.id)
+            .with_for_update(skip_locked=True)
+            .cte("locked")
+            .prefix_with("MATERIALIZED")
+        )
+        query = (
+            update(Goods)
+            .where(Goods.id == locked.c.id, Goods.stock != shard_stock)
+            .values(stock=shard_stock, **self._bump())
+            .returning(*NOTIFY_COLUMNS)
+        )
+        result = await self.session.execute(query)
+        rows = result.all()
+        await notify_goods_changed(self.session, rows)
+        return [row.id for row in rows]
+
+    async def enable_stock_shards(self, goods_id: int, shards: int) -> Goods:
+        """Spread a goods' stock over ``shards`` rows for flash sales.
+
+        While sharded, the available quantity is the sum of the goods'
+        ``goods_stock_shard`` rows, which ``Goods.stock`` mirrors for readers
+        (see ``sync_shard_stock``). Each order line is
+        served from a single shard, so a line can take at most what one shard
+        holds; flash-sale carts normally take one unit at a time.
+
+        Args:
+            goods_id: Goods ID
+            shards: Number of shards, at least 1
+
+        Returns:
+            Goods: Updated goods
+
+        Raises:
+            NotFoundException: If goods not found
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        good = await self._get_for_update(goods_id)
+        # Resharding: the mirrored stock is already in the shards
+        total = await self._pop_shards(goods_id) if good.stock_shards else good.stock
+        base, extra = divmod(total, shards)
+        await self.session.execute(
+            insert(GoodsStockShard),
+            [
+                {
+                    "goods_id": goods_id,
+                    "shard_no": shard_no,
+                    "stock": base + (1 if shard_no < extra else 0),
+                }
+                for shard_no in range(shards)
+            ],
+        )
+        good.stock = total
+        good.stock_shards = shards
+        self._bump_loaded(good)
+        await self.session.commit()
+        goods_cache.delete(goods_id)
+        return good
+
+    async def disable_stock_shards(self, goods_id: int) -> Goods:
+        """Fold sharded stock back into ``Goods.stock``.
+
+        Args:
+            goods_id: Goods ID
+
+        Returns:
+            Goods: Updated goods
+
+        Raises:
+            NotFoundException: If goods not found
+        """
+        good = await self._get_for_update(goods_id)
+        if good.stock_shards:
+            good.stock = await self._pop_shards(goods_id)
+        good.stock_shards = 0
+        self._bump_loaded(good)
+        await self.session.commit()
+        goods_cache.delete(goods_id)
+        return good
+
+    @staticmethod
+    def invalidate(goods_ids: Iterable[int]) -> None:
+        """Drop cached snapshots of goods changed by a committed transaction.
+
+        Dropping them before the commit is not enough: a concurrent read
+        would cache the old row again until GOODS_CACHE_TTL runs out.
+        """
+        for goods_id in goods_ids:
+            goods_cache.delete(goods_id)
+
+    @staticmethod
+    def invalidate_all() -> None:
+        """Drop every cached snapshot, after a committed bulk change."""
+        goods_cache.clear()
+
+    @staticmethod
+    def _load_only(fields: frozenset[str], *extra):
+        """Loader option restricting a goods query to the given columns."""
+        return load_only(
+            *(getattr(Goods, name) for name in fields), *extra, raiseload=True
+        )
+
+    @staticmethod
+    def _bump() -> dict:
+        """Values marking a goods row as changed, for UPDATE statements."""
+        return {
+            "version": Goods.version + 1,
+            "updated_at": func.now(),
+            "change_xid": literal_column(CURRENT_XID),
+        }
+
+    @staticmethod
+    def _bump_loaded(good: Goods) -> None:
+        """Mark a loaded goods object as changed; flushed with its UPDATE."""
+        good.version += 1
+        good.updated_at = func.now()
+        good.change_xid = literal_column(CURRENT_XID)
+
+    @staticmethod
+    def _lock_goods(goods_ids: list[int]):
+        # Materialized so every row is locked, in id order, before the outer
+        # statement touches any of them. Sharded goods are left out: their
+        # stock is in the shards, and sales lock those before the goods row
+        return (
+            select(Goods.id)
+            .where(
+                Goods.id == any_(literal(goods_ids, ARRAY(BigInteger))),
+                Goods.stock_shards == 0,
+            )
+            .order_by(Goods.id)
+            .with_for_update()
+            .cte("locked")
+            .prefix_with("MATERIALIZED")
+        )
+
+    async def _take_from_shard(self, goods_id: int, count: int) -> None:
+        # Try a random unlocked shard first; only wait on a locked one when
+        # every free shard is too small
+        for skip_locked in (True, False):
+            shard_no = (
+                select(GoodsStockShard.shard_no)
+                .where(
+                    GoodsStockShard.goods_id == goods_id,
+                    GoodsStockShard.stock >= count,
+                )
+                .order_by(func.random())
+                .limit(1)
+                .with_for_update(skip_locked=skip_locked)
+                .scalar_subquery()
+            )
+            query = (
+                update(GoodsStockShard)
+                .where(
+                    GoodsStockShard.goods_id == goods_id,
+                    GoodsStockShard.shard_no == shard_no,
+                )
+                .values(stock=GoodsStockShard.stock - count)
+                .returning(GoodsStockShard.shard_no)
+            )
+            result = await self.session.execute(query)
+            if result.scalar_one_or_none() is not None:
+                return
+        raise InsufficientStockException(goods_id)
+
+    async def _get_for_update(self, goods_id: int) -> Goods:
+        query = select(Goods).where(Goods.id == goods_id).with_for_update()
+        result = await self.session.execute(query)
+        good = result.scalar_one_or_none()
+        if not good:
+            raise NotFoundException(f"Goods with id {goods_id} not found")
+        return good
+
+    async def _pop_shards(self, goods_id: int) -> int:
+        query = (
+            delete(GoodsStockShard)
+            .where(GoodsStockShard.goods_id == goods_id)
+            .returning(GoodsStockShard.stock)
+        )
+        result = await self.session.execute(query)
+        return sum(result.scalars().all())
@@ -1,10 +1,37 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.core.config import settings
 from api.core.database import get_session
+from api.core.exceptions import BadRequestException
 from api.core.logging import get_logger
-from api.src.goods.schemas import GoodsCreate, GoodsResponse
+from api.core.security import get_current_admin
+from api.src.goods.events import goods_event_stream, goods_events
+from api.src.goods.export import MEDIA_TYPES, export_goods
+from api.src.goods.importer import GoodsImportReport
+from api.src.goods.schemas import (
+    FeedFormat,
+    GoodsChanges,
+    GoodsChangesParams,
+    GoodsCreate,
+    GoodsExportParams,
+    GoodsListParams,
+    GoodsPage,
+    GoodsResponse,
+    GoodsSearchPage,
+    GoodsSearchParams,
+)
 from api.src.goods.service import GoodsService
+from api.utils.conditional import (
+    etag_matches,
+    http_date,
+    make_etag,
+    not_modified_since,
+)
+from api.utils.fields import parse_fields
 
 
 logger = get_logger(__name__)
@@ -19,3 +46,150 @@ async def create_goods(
     logger.debug(f"Creating goods: {goods_data.name}")
     return await GoodsService(session).create_good(goods_data)
 
+
+@router.post(
+    "/import",
+    response_model=GoodsImportReport,
+    dependencies=[Depends(get_current_admin)],
+)
+async def import_goods(
+    request: Request,
+    format: FeedFormat = FeedFormat.NDJSON,
+    chunk_size: int | None = Query(None, ge=1, le=50000),
+    session: AsyncSession = Depends(get_session),
+) -> GoodsImportReport:
+    """Bulk create or update goods (matched by name) from an NDJSON or CSV body.
+
+    The body is streamed, so feeds of any size can be posted.
+    """
+    return await GoodsService(session).import_goods(
+        request.stream(), format, chunk_size
+    )
+
+
+@router.get("/export", dependencies=[Depends(get_current_admin)])
+async def export_catalog(
+    request: Request, params: Annotated[GoodsExportParams, Query()]
+) -> StreamingResponse:
+    """Stream the whole (filtered) catalog as NDJSON or CSV.
+
+    Compressed with gzip when the client accepts it.
+    """
+    gzip = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {
+        "Content-Disposition": f"attachment; filename=goods.{params.format.value}",
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_goods(params, params.format, gzip),
+        media_type=MEDIA_TYPES[params.format],
+        headers=headers,
+    )
+
+
+@router.get("/", response_model=GoodsPage)
+async def list_goods(
+    params: Annotated[GoodsListParams, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> GoodsPage:
+    """List goods page by page; pass next_cursor back as cursor."""
+    selected = parse_fields(params.fields, GoodsResponse)
+    page = await GoodsService(session).list_goods(params, selected)
+    if selected is None:
+        return page
+    return JSONResponse(page)
+
+
+@router.get("/changes", response_model=GoodsChanges)
+async def list_goods_changes(
+    params: Annotated[GoodsChangesParams, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> GoodsChanges:
+    """Goods changed or deleted since a token, for incremental catalog sync.
+
+    Start without ``since`` for a full sync, then keep passing back
+    ``next_token``; while ``has_more`` is true the next page is ready.
+    """
+    return await GoodsService(session).list_changes(params)
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_goods_events(
+    ids: Annotated[list[int], Query(description="Goods to follow, repeatable")],
+) -> StreamingResponse:
+    """Live price and stock of the given goods as Server-Sent Events.
+
+    Each change arrives as a ``goods`` event. A ``dropped`` event means the
+    client fell behind (or the server lost its feed) and should reconnect
+    and refetch.
+    """
+    if len(ids) > settings.GOODS_EVENTS_MAX_IDS:
+        raise BadRequestException(
+            f"At most {settings.GOODS_EVENTS_MAX_IDS} goods can be followed"
+        )
+    subscription = goods_events.subscribe(ids)
+    return StreamingResponse(
+        goods_event_stream(subscription, settings.GOODS_EVENTS_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/search", response_model=GoodsSearchPage)
+async def search_goods(
+    params: Annotated[GoodsSearchParams, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> GoodsSearchPage:
+    """Ranked goods search with highlighted matches."""
+    return await GoodsService(session).search_goods(params)
+
+
+@router.get(
+    "/{goods_id}",
+    response_model=GoodsResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+)
+async def get_goods(
+    goods_id: int,
+    response: Response,
+    fields: Annotated[
+        str | None,
+        Query(description="Comma separated fields to return, e.g. id,name,price"),
+    ] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+    if_modified_since: Annotated[str | None, Header()] = None,
+    session: AsyncSession = Depends(get_session),
+) -> GoodsResponse | Response:
+    """Get a good, honouring ``If-None-Match``/``If-Modified-Since``.
+
+    Revalidation only reads the row version, so a ``304`` never loads or
+    serializes the full row. Sparse representations get their own ETag.
+    """
+    service = GoodsService(session)
+    selected = parse_fields(fields, GoodsResponse)
+    tag = (goods_id,) if selected is None else (goods_id, *sorted(selected))
+    version, updated_at = await service.get_good_version(goods_id)
+    headers = {
+        "ETag": make_etag(*tag, version),
+        "Last-Modified": http_date(updated_at),
+        "Cache-Control": "no-cache",
+    }
+    if if_none_match is not None:
+        not_modified = etag_matches(headers["ETag"], if_none_match)
+    else:
+        not_modified = not_modified_since(updated_at, if_modified_since)
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if selected is not None:
+        content = await service.get_good_fields(goods_id, selected)
+        return JSONResponse(content, headers=headers)
+
+    good = await service.get_good(goods_id)
+    # The row may have changed between the two reads; describe what is sent
+    headers["ETag"] = make_etag(*tag, good.version)
+    headers["Last-Modified"] = http_date(good.updated_at)
+    response.headers.update(headers)
+    return good
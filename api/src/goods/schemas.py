@@ -1,5 +1,10 @@
+from datetime import datetime
+from enum import Enum
+
 from pydantic import BaseModel, ConfigDict, Field
 
+from api.core.config import settings
+
 
 class GoodsCreate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -22,3 +27,103 @@ class GoodsResponse(BaseModel):
     detail: str | None = None
     price: float
     stock: int
+
+
+class GoodsSnapshot(GoodsResponse):
+    """Immutable copy of a goods row, safe to share through the cache."""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    version: int
+    updated_at: datetime
+
+
+class FeedFormat(str, Enum):
+    """Wire format of bulk goods imports and exports."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class GoodsSort(str, Enum):
+    ID = "id"
+    ID_DESC = "-id"
+    PRICE = "price"
+    PRICE_DESC = "-price"
+
+
+class GoodsFilter(BaseModel):
+    min_price: float | None = Field(None, ge=0, description="Lowest price")
+    max_price: float | None = Field(None, ge=0, description="Highest price")
+    in_stock: bool = Field(False, description="Only goods that can be ordered")
+
+
+class GoodsExportParams(GoodsFilter):
+    format: FeedFormat = Field(FeedFormat.NDJSON, description="Output format")
+
+
+class GoodsListParams(GoodsFilter):
+    sort: GoodsSort = Field(GoodsSort.ID, description="Sort key, '-' for descending")
+    cursor: str | None = Field(None, description="next_cursor of the previous page")
+    limit: int = Field(
+        settings.GOODS_PAGE_SIZE, ge=1, le=settings.GOODS_PAGE_SIZE_MAX
+    )
+    fields: str | None = Field(
+        None, description="Comma separated fields to return, e.g. id,name,price"
+    )
+
+
+class GoodsPage(BaseModel):
+    items: list[GoodsResponse]
+    next_cursor: str | None = None
+
+
+class GoodsChangesParams(BaseModel):
+    since: str | None = Field(
+        None, description="next_token of the previous call; omit for a full sync"
+    )
+    limit: int = Field(
+        settings.GOODS_CHANGES_PAGE_SIZE, ge=1, le=settings.GOODS_CHANGES_PAGE_SIZE
+    )
+
+
+class GoodsChanges(BaseModel):
+    changed: list[GoodsResponse]
+    deleted: list[int]
+    next_token: str = Field(..., description="Pass back as since to resume")
+    has_more: bool = Field(..., description="Call again at once for the rest")
+
+
+class GoodsSearchMode(str, Enum):
+    AUTO = "auto"
+    FTS = "fts"  # ranked full-text match
+    PREFIX = "prefix"  # words starting with the query, for short queries
+    TRIGRAM = "trigram"  # fuzzy name similarity, tolerates typos
+
+
+class GoodsSearchParams(BaseModel):
+    q: str = Field(..., min_length=1, max_length=200, description="Search text")
+    mode: GoodsSearchMode = Field(GoodsSearchMode.AUTO, description="Match mode")
+    cursor: str | None = Field(None, description="next_cursor of the previous page")
+    limit: int = Field(
+        settings.GOODS_PAGE_SIZE, ge=1, le=settings.GOODS_PAGE_SIZE_MAX
+    )
+
+
+class GoodsSearchHit(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    title: str | None = None
+    img: str | None = None
+    price: float
+    stock: int
+    score: float
+    highlight: str | None = Field(None, description="Matched text, <mark> tagged")
+
+
+class GoodsSearchPage(BaseModel):
+    items: list[GoodsSearchHit]
+    next_cursor: str | None = None
+    mode: GoodsSearchMode
@@ -1,9 +1,29 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.core.config import settings
+from api.core.exceptions import BadRequestException
 from api.core.logging import get_logger
+from api.src.goods.catalog import CATALOG_FIELDS, goods_catalog
+from api.src.goods.importer import GoodsImporter, GoodsImportReport
 from api.src.goods.models import Goods
 from api.src.goods.repository import GoodsRepository
-from api.src.goods.schemas import GoodsCreate
+from api.src.goods.schemas import (
+    FeedFormat,
+    GoodsChanges,
+    GoodsChangesParams,
+    GoodsCreate,
+    GoodsListParams,
+    GoodsPage,
+    GoodsResponse,
+    GoodsSearchPage,
+    GoodsSearchParams,
+    GoodsSnapshot,
+)
+from api.utils.fields import sparse_dump
+from api.utils.pagination import decode_cursor, encode_cursor
 
 
 logger = get_logger(__name__)
@@ -18,3 +38,75 @@ class GoodsService:
         logger.debug(f"Creating goods: {goods_data.name}")
         return await self.repository.create(goods_data)
 
+    async def list_goods(
+        self, params: GoodsListParams, fields: frozenset[str] | None = None
+    ) -> GoodsPage | dict:
+        """List a page of goods; sparse pages come back as plain JSON data.
+
+        Sparse pages limited to ``CATALOG_FIELDS`` are answered from the
+        in-memory catalog snapshot while it is fresh.
+        """
+        if (
+            fields is not None
+            and fields <= CATALOG_FIELDS
+            and goods_catalog.is_fresh(settings.GOODS_CATALOG_MAX_STALENESS)
+        ):
+            return goods_catalog.query(params, fields)
+        goods, next_cursor = await self.repository.list_page(params, fields)
+        if fields is None:
+            return GoodsPage(items=goods, next_cursor=next_cursor)
+        return {
+            "items": [sparse_dump(GoodsResponse, fields, good) for good in goods],
+            "next_cursor": next_cursor,
+        }
+
+    async def list_changes(self, params: GoodsChangesParams) -> GoodsChanges:
+        after = self._decode_change_token(params.since) if params.since else (0, -1)
+        changed, deleted, position, has_more = await self.repository.list_changes(
+            after, params.limit
+        )
+        return GoodsChanges(
+            changed=changed,
+            deleted=deleted,
+            next_token=encode_cursor({"x": position[0], "i": position[1]}),
+            has_more=has_more,
+        )
+
+    async def search_goods(self, params: GoodsSearchParams) -> GoodsSearchPage:
+        hits, next_cursor, mode = await self.repository.search(params)
+        return GoodsSearchPage(items=hits, next_cursor=next_cursor, mode=mode)
+
+    async def import_goods(
+        self,
+        chunks: AsyncIterator[bytes],
+        fmt: FeedFormat,
+        chunk_size: int | None = None,
+    ) -> GoodsImportReport:
+        logger.info(f"Importing goods from {fmt.value} stream")
+        return await GoodsImporter(self.session, chunk_size).run(chunks, fmt)
+
+    async def get_good(self, goods_id: int) -> GoodsSnapshot:
+        return await self.repository.get_snapshot(goods_id)
+
+    async def get_good_fields(self, goods_id: int, fields: frozenset[str]) -> dict:
+        good = await self.repository.get_fields(goods_id, fields)
+        return sparse_dump(GoodsResponse, fields, good)
+
+    async def get_good_version(self, goods_id: int) -> tuple[int, datetime]:
+        return await self.repository.get_version(goods_id)
+
+    @staticmethod
+    def _decode_change_token(token: str) -> tuple[int, int]:
+        data = decode_cursor(token)
+        position = (data.get("x"), data.get("i"))
+        if not all(isinstance(value, int) for value in position):
+            raise BadRequestException("Invalid change token")
+        return position
+
+    async def enable_stock_shards(self, goods_id: int, shards: int) -> Goods:
+        logger.info(f"Sharding stock of goods {goods_id} into {shards} shards")
+        return await self.repository.enable_stock_shards(goods_id, shards)
+
+    async def disable_stock_shards(self, goods_id: int) -> Goods:
+        logger.info(f"Folding stock shards of goods {goods_id}")
+        return await self.repository.disable_stock_shards(goods_id)
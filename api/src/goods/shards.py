@@ -0,0 +1,35 @@
+from api.core.config import settings
+from api.core.database import async_session
+from api.core.logging import get_logger
+from api.src.goods.repository import GoodsRepository
+from api.utils.tasks import PeriodicTask
+
+logger = get_logger(__name__)
+
+
+async def refresh_shard_stock() -> int:
+    """Bring the mirrored stock of every sharded goods up to date.
+
+    Sales refresh the mirror themselves but skip a goods row another
+    transaction holds, so the last sales of a burst may not be reflected
+    until this job runs.
+
+    Returns:
+        int: Number of refreshed goods
+    """
+    async with async_session() as session:
+        repository = GoodsRepository(session)
+        refreshed = await repository.sync_shard_stock()
+        await session.commit()
+    repository.invalidate(refreshed)
+    if refreshed:
+        logger.debug(f"Refreshed the stock of {len(refreshed)} sharded goods")
+    return len(refreshed)
+
+
+def create_shard_stock_sync() -> PeriodicTask:
+    return PeriodicTask(
+        "goods-shard-stock-sync",
+        refresh_shard_stock,
+        settings.GOODS_SHARD_SYNC_INTERVAL,
+    )
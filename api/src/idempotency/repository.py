@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.cache import TTLCache
+from api.core.config import settings
+from api.src.idempotency.models import IdempotencyKey
+from api.src.idempotency.schemas import StoredResponse
+
+# Per-process cache of completed responses. They never change, so replays
+# served from here cannot be stale.
+idempotency_cache: TTLCache[tuple[int, str], StoredResponse] = TTLCache(
+    maxsize=settings.IDEMPOTENCY_CACHE_SIZE, ttl=settings.IDEMPOTENCY_CACHE_TTL
+)
+
+
+class IdempotencyRepository:
+    """Repository for idempotency keys."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def get_cached(self, user_id: int, key: str) -> StoredResponse | None:
+        return idempotency_cache.get((user_id, key))
+
+    async def claim(
+        self, user_id: int, key: str, fingerprint: str, ttl: timedelta
+    ) -> bool:
+        """Take a key for the current transaction. Does not commit.
+
+        If another transaction inserted the key and has not finished yet,
+        the insert waits on the primary key until it commits or rolls back,
+        so concurrent duplicates line up behind the first attempt. An
+        expired key is taken over.
+
+        Args:
+            user_id: Owner of the key
+            key: Idempotency-Key header value
+            fingerprint: Hash of the request
+            ttl: How long the key is kept
+
+        Returns:
+            bool: True if the caller now owns the key, False if a completed
+            response exists for it
+        """
+        query = pg_insert(IdempotencyKey).values(
+            user_id=user_id,
+            key=key,
+            fingerprint=fingerprint,
+            expires_at=func.now() + ttl,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_={
+                "fingerprint": query.excluded.fingerprint,
+                "status_code": None,
+                "response_body": None,
+                "created_at": func.now(),
+                "expires_at": query.excluded.expires_at,
+            },
+            where=IdempotencyKey.expires_at <= func.now(),
+        ).returning(IdempotencyKey.key)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    async def get(self, user_id: int, key: str) -> StoredResponse | None:
+        """Get the completed response of a key, from the cache if possible."""
+        stored = idempotency_cache.get((user_id, key))
+        if stored is not None:
+            return stored
+
+        query = select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.status_code,
+            IdempotencyKey.response_body,
+        ).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > func.now(),
+        )
+        result = await self.session.execute(query)
+        row = result.one_or_none()
+        if row is None or row.response_body is None:
+            return None
+        stored = StoredResponse(
+            fingerprint=row.fingerprint,
+            status_code=row.status_code,
+            body=row.response_body,
+        )
+        idempotency_cache.set((user_id, key), stored)
+        return stored
+
+    async def complete(self, user_id: int, key: str, stored: StoredResponse) -> None:
+        """Record the response of a claimed key. Does not commit."""
+        query = (
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(status_code=stored.status_code, response_body=stored.body)
+        )
+        await self.session.execute(query)
+
+    async def purge_expired(self, limit: int) -> int:
+        """Delete up to ``limit`` expired keys and commit.
+
+        Returns:
+            int: Number of deleted keys
+        """
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= func.now())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = delete(IdempotencyKey).where(
+            tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired)
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return result.rowcount
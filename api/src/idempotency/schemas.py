@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class StoredResponse(BaseModel):
+    """Immutable response of a completed request, safe to share through the cache."""
+
+    model_config = ConfigDict(frozen=True)
+
+    fingerprint: str
+    status_code: int
+    body: str  # serialized JSON, replayed byte for byte
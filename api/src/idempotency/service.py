@@ -0,0 +1,57 @@
+import hashlib
+from datetime import timedelta
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import settings
+from api.core.exceptions import AlreadyExistsException, IdempotencyKeyReusedException
+from api.src.idempotency.repository import IdempotencyRepository
+from api.src.idempotency.schemas import StoredResponse
+
+
+def request_fingerprint(scope: str, payload: BaseModel) -> str:
+    """Hash of an endpoint and its parsed body, insensitive to JSON formatting."""
+    return hashlib.sha256(f"{scope}\n{payload.model_dump_json()}".encode()).hexdigest()
+
+
+class IdempotencyService:
+    """Runs a request at most once per (user, Idempotency-Key)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = IdempotencyRepository(session)
+
+    async def begin(
+        self, user_id: int, key: str, fingerprint: str
+    ) -> StoredResponse | None:
+        """Claim a key for this request, or get the response to replay.
+
+        A cached response is returned without touching the database. While
+        another request holding the key is in flight this waits for it.
+
+        Returns:
+            StoredResponse | None: The response to replay, or None when the
+            caller owns the key and must call ``finish`` before committing
+
+        Raises:
+            IdempotencyKeyReusedException: If the key was used for another request
+            AlreadyExistsException: If the key is claimed but has no response
+        """
+        stored = self.repository.get_cached(user_id, key)
+        if stored is None:
+            ttl = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL)
+            if await self.repository.claim(user_id, key, fingerprint, ttl):
+                return None
+            stored = await self.repository.get(user_id, key)
+            if stored is None:
+                raise AlreadyExistsException(
+                    "A request with this Idempotency-Key is in progress"
+                )
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyKeyReusedException()
+        return stored
+
+    async def finish(self, user_id: int, key: str, stored: StoredResponse) -> None:
+        """Store the response of a claimed key. The caller commits."""
+        await self.repository.complete(user_id, key, stored)
@@ -0,0 +1,29 @@
+from api.core.config import settings
+from api.core.database import async_session
+from api.src.idempotency.repository import IdempotencyRepository
+from api.utils.tasks import PeriodicTask
+
+
+async def purge_expired_keys() -> int:
+    """Delete expired idempotency keys batch by batch until none are left.
+
+    Returns:
+        int: Number of deleted keys
+    """
+    batch_size = settings.IDEMPOTENCY_PURGE_BATCH_SIZE
+    total = 0
+    while True:
+        async with async_session() as session:
+            deleted = await IdempotencyRepository(session).purge_expired(batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+def create_idempotency_sweeper() -> PeriodicTask:
+    """Background task deleting expired idempotency keys."""
+    return PeriodicTask(
+        "idempotency-sweeper",
+        purge_expired_keys,
+        settings.IDEMPOTENCY_PURGE_INTERVAL,
+    )
@@ -0,0 +1,120 @@
+import asyncio
+
+from asyncpg import PostgresError
+from sqlalchemy.exc import SQLAlchemyError
+
+from api.core.config import settings
+from api.core.database import async_session
+from api.core.logging import get_logger
+from api.src.orders.models import OrderInfo
+from api.src.orders.schemas import OrderCreate
+from api.src.orders.service import OrderService
+
+logger = get_logger(__name__)
+
+
+class PendingOrder:
+    """An order waiting for its group, and the future its request awaits."""
+
+    def __init__(self, user_id: int, order_data: OrderCreate, future: asyncio.Future):
+        self.user_id = user_id
+        self.order_data = order_data
+        self.future = future
+
+    def resolve(self, outcome: OrderInfo | Exception) -> None:
+        # The request may have gone away; the order stands regardless
+        if self.future.done():
+            return
+        if isinstance(outcome, Exception):
+            self.future.set_exception(outcome)
+        else:
+            self.future.set_result(outcome)
+
+
+class OrderBatcher:
+    """Group commit for ``POST /orders``.
+
+    The first order to arrive opens a window of ``window`` seconds; the
+    orders that join it are placed together by
+    ``OrderService.create_order_group``, in one transaction with multi-row
+    INSERTs and a single commit. The window closes early once ``max_size``
+    orders are waiting. Each request still gets its own order or error.
+
+    If the database rejects a whole group, its orders are retried one by
+    one, so a failure none of them caused alone fails only the order that
+    causes it again.
+    """
+
+    def __init__(self, window: float, max_size: int):
+        self.window = window
+        self.max_size = max_size
+        self._pending: list[PendingOrder] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # Strong references, so running groups are not garbage collected
+        self._groups: set[asyncio.Task] = set()
+
+    async def submit(self, user_id: int, order_data: OrderCreate) -> OrderInfo:
+        """Place an order with the next group.
+
+        Raises:
+            HTTPException: If the order is invalid or short of stock, as
+                ``OrderService.create_order`` would
+        """
+        loop = asyncio.get_running_loop()
+        pending = PendingOrder(user_id, order_data, loop.create_future())
+        self._pending.append(pending)
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await pending.future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        group, self._pending = self._pending, []
+        if not group:
+            return
+        task = asyncio.create_task(self._place(group))
+        self._groups.add(task)
+        task.add_done_callback(self._groups.discard)
+
+    async def _place(self, group: list[PendingOrder]) -> None:
+        try:
+            async with async_session() as session:
+                outcomes = await OrderService(session).create_order_group(
+                    [(pending.user_id, pending.order_data) for pending in group]
+                )
+        except (SQLAlchemyError, PostgresError) as e:
+            logger.warning(
+                f"Group of {len(group)} orders rejected, placing them one by one: {e}"
+            )
+            await asyncio.gather(*(self._place_alone(pending) for pending in group))
+            return
+        except Exception as e:
+            # Nothing else would ever wake the requests up
+            logger.exception(f"Group of {len(group)} orders failed")
+            for pending in group:
+                pending.resolve(e)
+            return
+
+        for pending, outcome in zip(group, outcomes):
+            pending.resolve(outcome)
+
+    @staticmethod
+    async def _place_alone(pending: PendingOrder) -> None:
+        try:
+            async with async_session() as session:
+                order = await OrderService(session).create_order(
+                    pending.user_id, pending.order_data
+                )
+        except Exception as e:
+            pending.resolve(e)
+            return
+        pending.resolve(order)
+
+
+order_batcher = OrderBatcher(
+    settings.ORDERS_GROUP_COMMIT_WINDOW, settings.ORDERS_GROUP_COMMIT_MAX_SIZE
+)
@@ -0,0 +1,94 @@
+import importlib
+import itertools
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+from api.core.cache import TTLCache
+from api.core.config import settings
+
+
+class OrderListCache(ABC):
+    """Storage of serialized ``GET /orders`` pages, grouped per user.
+
+    Pages are stored under keys that include the user's current
+    generation. Invalidating a user moves them to a new generation, which
+    orphans all their pages at once; orphans age out with the TTL.
+
+    A generation must never repeat for a user, or pages orphaned earlier
+    would come back. Implementations for a shared store (e.g. Redis with
+    ``INCR`` on a key that never expires) make invalidation visible to
+    every worker at once.
+    """
+
+    @abstractmethod
+    async def generation(self, user_id: int) -> int:
+        """Current generation of a user's pages."""
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        """Cached page body, None when missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, body: str) -> None:
+        """Store a page body, subject to the backend's size bound and TTL."""
+
+    @abstractmethod
+    async def invalidate(self, user_ids: Iterable[int]) -> None:
+        """Move users to a new generation."""
+
+    @abstractmethod
+    def stats(self) -> dict[str, int | float]:
+        """Counters for monitoring, at least ``hits`` and ``misses``."""
+
+
+class LocalOrderListCache(OrderListCache):
+    """Per-worker LRU of order pages, the default backend.
+
+    Invalidation only reaches the worker that made the write; the others
+    serve their copy until it expires, so keep the TTL short.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.pages: TTLCache[str, str] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: TTLCache[int, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Shared by all users, so a user whose generation was evicted gets
+        # a value never handed out before
+        self._counter = itertools.count(1)
+
+    async def generation(self, user_id: int) -> int:
+        generation = self._generations.get(user_id)
+        if generation is None:
+            generation = next(self._counter)
+            self._generations.set(user_id, generation)
+        return generation
+
+    async def get(self, key: str) -> str | None:
+        return self.pages.get(key)
+
+    async def set(self, key: str, body: str) -> None:
+        self.pages.set(key, body)
+
+    async def invalidate(self, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:
+            self._generations.set(user_id, next(self._counter))
+
+    def stats(self) -> dict[str, int | float]:
+        stats: dict[str, int | float] = self.pages.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def create_order_list_cache() -> OrderListCache:
+    """Build the backend named by ``ORDERS_CACHE_BACKEND``, or the local LRU.
+
+    The setting is a ``package.module:factory`` path; the factory is called
+    without arguments and returns an ``OrderListCache``.
+    """
+    if not settings.ORDERS_CACHE_BACKEND:
+        return LocalOrderListCache(settings.ORDERS_CACHE_SIZE, settings.ORDERS_CACHE_TTL)
+    module, _, factory = settings.ORDERS_CACHE_BACKEND.partition(":")
+    return getattr(importlib.import_module(module), factory)()
+
+
+order_list_cache = create_order_list_cache()
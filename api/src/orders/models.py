@@ -1,23 +1,60 @@
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, Numeric, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from enum import IntEnum
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 from sqlalchemy.sql import func
 
 from api.core.database import Base
 
 
+class OrderStatus(IntEnum):
+    PENDING = 0
+    PAID = 1
+    CANCELLED = 2
+
 
 class OrderInfo(Base):
     __tablename__ = "order_info"
+    __table_args__ = (
+        # Keyset pagination of a user's order history, newest first; also
+        # serves every other lookup by user_id
+        Index(
+            "ix_order_info_user_id_create_time_id",
+            "user_id",
+            text("create_time DESC"),
+            text("id DESC"),
+        ),
+        # Monthly range partitions, managed by OrderPartitionRepository. The
+        # partition key must be part of the primary key, hence (id, create_time)
+        {"postgresql_partition_by": "RANGE (create_time)"},
+    )
+    # Fetch server defaults (create_time) in the INSERT's RETURNING clause,
+    # so a new order is complete without being read back
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True, index=True
+    )
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     delivery_addr_id: Mapped[int] = mapped_column(Integer, nullable=False)
     total_amount: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
     status: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     create_time: Mapped[DateTime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
     )
     order_type: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Number of items, only loaded on request (see OrderRepository.list_page)
+    item_count: Mapped[int | None] = query_expression()
 
     user: Mapped["User"] = relationship("User", back_populates="orders") # noqa: F821
     items: Mapped[list["OrderItem"]] = relationship(
@@ -27,10 +64,25 @@ class OrderInfo(Base):
 
 class OrderItem(Base):
     __tablename__ = "order_item"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["order_id", "order_create_time"],
+            ["order_info.id", "order_info.create_time"],
+            name="order_item_order_fkey",
+            ondelete="CASCADE",
+        ),
+        # Co-partitioned with order_info: an order and its items always sit
+        # in partitions of the same month
+        {"postgresql_partition_by": "RANGE (order_create_time)"},
+    )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
-    order_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("order_info.id", ondelete="CASCADE"), nullable=False
+    id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True, index=True
+    )
+    order_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    # Copy of the order's create_time, filled in from the relationship
+    order_create_time: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
     )
     goods_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("goods.id", ondelete="RESTRICT"), nullable=False
@@ -43,3 +95,24 @@ class OrderItem(Base):
     order_info: Mapped["OrderInfo"] = relationship(back_populates="items")
     goods: Mapped["Goods"] = relationship("Goods", back_populates="order_items") 
 
+
+
+class UserOrderStats(Base):
+    """Running order counters of one user, kept by the order service.
+
+    Updated with an additive upsert in the transaction that creates or pays
+    the orders, so the account summary is a primary key lookup.
+    """
+
+    __tablename__ = "user_order_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    paid_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Total of the paid orders
+    total_spent: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0
+    )
+    last_order_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True))
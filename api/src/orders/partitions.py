@@ -0,0 +1,75 @@
+from datetime import date, datetime, timezone
+
+from api.core.config import settings
+from api.core.database import async_session
+from api.core.logging import get_logger
+from api.src.orders.repository import OrderPartitionRepository, add_months
+from api.utils.tasks import PeriodicTask
+
+logger = get_logger(__name__)
+
+
+async def maintain_partitions(
+    ahead: int | None = None, retain: int | None = None, drop: bool = False
+) -> tuple[list[date], list[date]]:
+    """Create upcoming order partitions and detach the expired ones.
+
+    Runs in one transaction under an advisory lock, so concurrent workers
+    do not race each other; a run that finds the lock taken does nothing.
+
+    Args:
+        ahead: Months after the current one that must have partitions,
+            ``ORDER_PARTITIONS_AHEAD`` by default
+        retain: Months kept attached, the current one included,
+            ``ORDER_PARTITIONS_RETAIN`` by default; 0 keeps every month
+        drop: Drop detached partitions instead of leaving them for archiving
+
+    Returns:
+        tuple[list[date], list[date]]: Months created and months detached
+    """
+    ahead = settings.ORDER_PARTITIONS_AHEAD if ahead is None else ahead
+    retain = settings.ORDER_PARTITIONS_RETAIN if retain is None else retain
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+
+    async with async_session() as session:
+        repository = OrderPartitionRepository(session)
+        if not await repository.lock():
+            return [], []
+
+        existing = await repository.list_months()
+        # Months between the oldest partition and the newest wanted one
+        # are filled in too, so there are no gaps
+        first = min(existing[0], this_month) if existing else this_month
+        wanted = add_months(this_month, ahead)
+        created = []
+        month = first
+        while month <= wanted:
+            if month not in existing:
+                await repository.create(month)
+                created.append(month)
+            month = add_months(month, 1)
+
+        detached = []
+        if retain > 0:
+            oldest_kept = add_months(this_month, 1 - retain)
+            detached = [month for month in existing if month < oldest_kept]
+            for month in detached:
+                await repository.detach(month, drop)
+
+        await session.commit()
+
+    if created or detached:
+        logger.info(
+            f"Order partitions: created {[f'{m:%Y-%m}' for m in created]}, "
+            f"detached {[f'{m:%Y-%m}' for m in detached]}"
+        )
+    return created, detached
+
+
+def create_partition_maintainer() -> PeriodicTask:
+    """Background task keeping the order partitions ahead of time."""
+    return PeriodicTask(
+        "order-partitions",
+        maintain_partitions,
+        settings.ORDER_PARTITIONS_INTERVAL,
+    )
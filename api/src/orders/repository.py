@@ -1,9 +1,64 @@
-from sqlalchemy import Select, select
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TypeVar
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Float,
+    Select,
+    Text,
+    any_,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload, with_expression
+
+from api.core.config import settings
+from api.core.exceptions import BadRequestException, NotFoundException
+from api.src.orders.models import OrderInfo, OrderItem, OrderStatus, UserOrderStats
+from api.src.orders.schemas import OrderInfoResponse, OrderListItem, OrderListParams
+from api.src.reservations.models import StockReservation
+from api.utils.pagination import decode_cursor, encode_cursor
+
+# Partitioned tables, parent first; partitions are named <table>_pYYYYMM
+PARTITIONED_TABLES = ("order_info", "order_item")
+
+# Key of the advisory lock serializing partition maintenance across workers
+PARTITION_LOCK_KEY = 7_310_022
+
+# Partition DDL locks the parent tables; give up rather than queue order
+# writes behind a long transaction, the next run tries again
+PARTITION_LOCK_TIMEOUT = "5s"
+
+
+T = TypeVar("T")
 
-from api.core.exceptions import NotFoundException
-from api.src.orders.models import OrderInfo, OrderItem
+
+def _json_pairs(columns: dict[str, ColumnElement]) -> list[ColumnElement]:
+    """Key/value arguments of ``json_build_object``, keys inlined as literals."""
+    return [
+        element
+        for name, column in columns.items()
+        for element in (literal_column(f"'{name}'"), column)
+    ]
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after (or before) ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
 
 
 class OrderRepository:
@@ -11,45 +66,542 @@ class OrderRepository:
         self.session = session
 
     async def create(self, order: OrderInfo) -> OrderInfo:
+        """Insert an order with its items. Does not commit.
+
+        The INSERT returns ``id`` and ``create_time`` (``eager_defaults``) and
+        the items are the objects given, so the order is returned as is
+        instead of being read back. Sessions do not expire on commit.
+        """
         self.session.add(order)
-        await self.session.commit()
-        # Reload order with items to ensure all fields (including server defaults) are present
-        # and items are eagerly loaded for the schema
-        query = (
-            select(OrderInfo)
-            .where(OrderInfo.id == order.id)
-            .options(selectinload(OrderInfo.items))
+        await self.session.flush()
+        return order
+
+    async def create_many(
+        self, orders: list[dict], items: list[list[dict]]
+    ) -> list[OrderInfo]:
+        """Insert orders and their items with multi-row INSERTs. Does not commit.
+
+        The generated keys come back through RETURNING, so the new orders are
+        built in memory rather than read back. They are not added to the
+        session.
+
+        Args:
+            orders: ``order_info`` column values of each order
+            items: ``order_item`` column values of each order's items,
+                without ``order_id``
+
+        Returns:
+            list[OrderInfo]: The new orders with their items, in the order given
+        """
+        result = await self.session.execute(
+            insert(OrderInfo).returning(
+                OrderInfo.id, OrderInfo.create_time, sort_by_parameter_order=True
+            ),
+            orders,
         )
-        result = await self.session.execute(query)
-        return result.scalar_one()
+        created = [
+            OrderInfo(id=order_id, create_time=create_time, **values)
+            for (order_id, create_time), values in zip(result.all(), orders)
+        ]
+        rows = [
+            {**item, "order_id": order.id, "order_create_time": order.create_time}
+            for order, order_items in zip(created, items)
+            for item in order_items
+        ]
+        result = await self.session.execute(
+            insert(OrderItem).returning(OrderItem.id, sort_by_parameter_order=True),
+            rows,
+        )
+        new_items = iter(
+            OrderItem(id=item_id, **row)
+            for item_id, row in zip(result.scalars().all(), rows)
+        )
+        for order, order_items in zip(created, items):
+            order.items = [next(new_items) for _ in order_items]
+        return created
 
-    async def get_by_id(self, order_id: int) -> OrderInfo:
+    async def get_by_id(
+        self, order_id: int, fields: frozenset[str] | None = None
+    ) -> OrderInfo:
         query: Select[tuple[OrderInfo]] = (
             select(OrderInfo)
             .where(OrderInfo.id == order_id)
-            .options(selectinload(OrderInfo.items))
+            .options(*self._load_options(fields))
         )
-        result = await self.session.execute(query)
-        order = result.scalar_one_or_none()
+        return await self._find(query)
 
-        if not order:
-            raise NotFoundException("Order not found")
+    async def list_page(
+        self,
+        user_id: int,
+        params: OrderListParams,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[OrderInfo], str | None]:
+        """Get one page of a user's orders, newest first.
 
-        return order
+        Pages continue from the ``(create_time, id)`` of the previous page's
+        last order, so each page is one range scan of
+        ``ix_order_info_user_id_create_time_id`` however deep the history.
+        The sort follows the partition key: monthly partitions are read
+        newest first and the scan stops once the page is full, and the
+        cursor prunes the partitions newer than it.
+
+        Args:
+            user_id: Owner of the orders
+            params: Filters, cursor and page size
+            fields: Response fields to load, all when None. ``item_count``
+                is computed with a subquery instead of loading the items.
+
+        Returns:
+            tuple[list[OrderInfo], str | None]: Orders of the page and the
+            cursor of the next page, None on the last page
 
-    async def list_by_user(self, user_id: int) -> list[OrderInfo]:
+        Raises:
+            BadRequestException: If the cursor is invalid
+        """
         query: Select[tuple[OrderInfo]] = (
             select(OrderInfo)
-            .where(OrderInfo.user_id == user_id)
-            .options(selectinload(OrderInfo.items))
+            .where(*self._history_filter(user_id, params))
+            .options(*self._load_options(fields, OrderInfo.create_time))
+            .order_by(OrderInfo.create_time.desc(), OrderInfo.id.desc())
+            .limit(params.limit + 1)
         )
+
         result = await self.session.execute(query)
-        return list(result.scalars().all())
+        orders = list(result.scalars().all())
+
+        next_cursor = None
+        if len(orders) > params.limit:
+            orders = orders[: params.limit]
+            next_cursor = self._encode_position(orders[-1].create_time, orders[-1].id)
+        return orders, next_cursor
+
+    async def list_page_json(
+        self,
+        user_id: int,
+        params: OrderListParams,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[list[str], str | None]:
+        """Get one page of a user's orders as JSON documents built by PostgreSQL.
+
+        Same page and cursor as ``list_page``, but each order comes back as
+        the text of its response object (items aggregated with
+        ``json_agg``), so no ORM objects are built.
+
+        Args:
+            user_id: Owner of the orders
+            params: Filters, cursor and page size
+            fields: Response fields, a subset of ``OrderListItem``; all the
+                ``OrderInfoResponse`` fields when None
+
+        Returns:
+            tuple[list[str], str | None]: One JSON object per order and the
+            cursor of the next page, None on the last page
+
+        Raises:
+            BadRequestException: If the cursor is invalid
+        """
+        query = (
+            select(self._json_object(fields), OrderInfo.create_time, OrderInfo.id)
+            .where(*self._history_filter(user_id, params))
+            .order_by(OrderInfo.create_time.desc(), OrderInfo.id.desc())
+            .limit(params.limit + 1)
+        )
+        result = await self.session.execute(query)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[: params.limit]
+            next_cursor = self._encode_position(rows[-1].create_time, rows[-1].id)
+        return [row[0] for row in rows], next_cursor
+
+    async def get_json(
+        self, order_id: int, user_id: int, fields: frozenset[str] | None = None
+    ) -> str:
+        """Get one order of a user as a JSON document built by PostgreSQL.
+
+        Raises:
+            NotFoundException: If the user has no order with this ID
+        """
+        query = select(self._json_object(fields)).where(
+            OrderInfo.id == order_id, OrderInfo.user_id == user_id
+        )
+        return await self._find(query)
 
-    async def list_items_by_order(self, order_id: int) -> list[OrderItem]:
+    async def list_items_by_order(self, order: OrderInfo) -> list[OrderItem]:
         query: Select[tuple[OrderItem]] = select(OrderItem).where(
-            OrderItem.order_id == order_id
+            OrderItem.order_id == order.id,
+            OrderItem.order_create_time == order.create_time,
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def get_for_update(self, order_id: int) -> OrderInfo:
+        query: Select[tuple[OrderInfo]] = (
+            select(OrderInfo).where(OrderInfo.id == order_id).with_for_update()
+        )
+        return await self._find(query)
+
+    async def set_status(self, order: OrderInfo, status: OrderStatus) -> OrderInfo:
+        order.status = status
+        await self.session.commit()
+        return order
+
+    async def cancel_pending(
+        self, order_ids: list[int], created_from: datetime
+    ) -> list[tuple[int, int]]:
+        """Cancel the given orders that are still pending. Does not commit.
+
+        Args:
+            order_ids: Orders to cancel
+            created_from: No later than the oldest order's ``create_time``;
+                the partitions before it are skipped
+
+        Returns:
+            list[tuple[int, int]]: ``(order_id, user_id)`` of the cancelled orders
+        """
+        query = (
+            update(OrderInfo)
+            .where(
+                OrderInfo.id == any_(literal(order_ids, ARRAY(BigInteger))),
+                OrderInfo.create_time >= created_from,
+                OrderInfo.status == OrderStatus.PENDING,
+            )
+            .values(status=OrderStatus.CANCELLED)
+            .returning(OrderInfo.id, OrderInfo.user_id)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def count_created(self, user_id: int, orders: int = 1) -> None:
+        """Add new orders to a user's counters. Does not commit.
+
+        ``last_order_at`` is ``now()``, the transaction start time, which is
+        also the ``create_time`` of orders inserted in the same transaction.
+        """
+        query = pg_insert(UserOrderStats).values(
+            user_id=user_id,
+            order_count=orders,
+            paid_count=0,
+            total_spent=0,
+            last_order_at=func.now(),
+        )
+        await self.session.execute(
+            query.on_conflict_do_update(
+                index_elements=[UserOrderStats.user_id],
+                set_={
+                    "order_count": UserOrderStats.order_count
+                    + query.excluded.order_count,
+                    "last_order_at": func.greatest(
+                        UserOrderStats.last_order_at, query.excluded.last_order_at
+                    ),
+                },
+            )
+        )
+
+    async def count_paid(self, user_id: int, amount) -> None:
+        """Add a paid order to a user's counters. Does not commit."""
+        query = pg_insert(UserOrderStats).values(
+            user_id=user_id, order_count=0, paid_count=1, total_spent=amount
+        )
+        await self.session.execute(
+            query.on_conflict_do_update(
+                index_elements=[UserOrderStats.user_id],
+                set_={
+                    "paid_count": UserOrderStats.paid_count + 1,
+                    "total_spent": UserOrderStats.total_spent
+                    + query.excluded.total_spent,
+                },
+            )
+        )
+
+    async def get_stats(self, user_id: int) -> UserOrderStats | None:
+        """Get a user's order counters by primary key."""
+        return await self.session.get(UserOrderStats, user_id)
+
+    async def rebuild_stats(self) -> int:
+        """Recompute every user's order counters from ``order_info`` and commit.
+
+        The counters table is locked against writes first. A writer holds
+        that lock from its counter update until it commits, so it either
+        finishes before the rebuild reads ``order_info`` or applies its
+        increments after the rebuild, and each order is counted once.
+
+        Returns:
+            int: Number of users with orders
+        """
+        await self.session.execute(
+            text("LOCK TABLE user_order_stats IN SHARE ROW EXCLUSIVE MODE")
+        )
+        paid = OrderInfo.status == OrderStatus.PAID
+        totals = select(
+            OrderInfo.user_id,
+            func.count(),
+            func.count().filter(paid),
+            func.coalesce(func.sum(OrderInfo.total_amount).filter(paid), 0),
+            func.max(OrderInfo.create_time),
+        ).group_by(OrderInfo.user_id)
+        query = pg_insert(UserOrderStats).from_select(
+            ["user_id", "order_count", "paid_count", "total_spent", "last_order_at"],
+            totals,
+        )
+        result = await self.session.execute(
+            query.on_conflict_do_update(
+                index_elements=[UserOrderStats.user_id],
+                set_={
+                    name: query.excluded[name]
+                    for name in (
+                        "order_count",
+                        "paid_count",
+                        "total_spent",
+                        "last_order_at",
+                    )
+                },
+            )
+        )
+        # Counters of users who no longer have any order
+        await self.session.execute(
+            delete(UserOrderStats).where(
+                ~exists().where(OrderInfo.user_id == UserOrderStats.user_id)
+            )
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def _find(self, query: Select[tuple[T]]) -> T:
+        """Run a lookup by order ID, searching the recent partitions first.
+
+        An ID says nothing about the month an order was created in, so on
+        its own it has to be probed in every partition. Orders looked up by
+        ID are nearly always recent ones, so the query first runs with a
+        ``create_time`` bound that prunes all but the last
+        ``ORDERS_RECENT_DAYS``, and over the whole history only if that
+        finds nothing.
+
+        Raises:
+            NotFoundException: If no order matches
+        """
+        recent = query.where(
+            OrderInfo.create_time
+            >= func.now() - timedelta(days=settings.ORDERS_RECENT_DAYS)
+        )
+        order = (await self.session.execute(recent)).scalar_one_or_none()
+        if order is None:
+            order = (await self.session.execute(query)).scalar_one_or_none()
+
+        if not order:
+            raise NotFoundException("Order not found")
+
+        return order
+
+    @staticmethod
+    def _history_filter(user_id: int, params: OrderListParams) -> list:
+        """WHERE clauses of a page of a user's order history."""
+        clauses = [OrderInfo.user_id == user_id]
+        if params.status is not None:
+            clauses.append(OrderInfo.status == params.status)
+        if params.order_type is not None:
+            clauses.append(OrderInfo.order_type == params.order_type)
+        if params.created_from is not None:
+            clauses.append(OrderInfo.create_time >= params.created_from)
+        if params.created_to is not None:
+            clauses.append(OrderInfo.create_time < params.created_to)
+        if params.cursor:
+            clauses.append(
+                tuple_(OrderInfo.create_time, OrderInfo.id)
+                < tuple_(*OrderRepository._decode_position(params.cursor))
+            )
+        return clauses
+
+    @staticmethod
+    def _encode_position(create_time: datetime, order_id: int) -> str:
+        return encode_cursor({"t": create_time.isoformat(), "i": order_id})
+
+    @staticmethod
+    def _decode_position(cursor: str) -> tuple[datetime, int]:
+        data = decode_cursor(cursor)
+        try:
+            return datetime.fromisoformat(data["t"]), int(data["i"])
+        except (KeyError, TypeError, ValueError):
+            raise BadRequestException("Invalid cursor")
+
+    @staticmethod
+    def _load_options(fields: frozenset[str] | None, *required) -> list:
+        """Loader options fetching only the requested response fields.
+
+        ``user_id`` (and any ``required`` column) is always loaded for the
+        ownership check; items are only fetched (with their own query) when
+        ``items`` is requested, and counted in SQL for ``item_count``.
+        """
+        if fields is None:
+            return [selectinload(OrderInfo.items)]
+        columns = [
+            getattr(OrderInfo, name)
+            for name in fields
+            if name not in ("items", "item_count")
+        ]
+        options = [load_only(OrderInfo.user_id, *required, *columns, raiseload=True)]
+        if "items" in fields:
+            options.append(selectinload(OrderInfo.items))
+        if "item_count" in fields:
+            item_count = (
+                select(func.count())
+                .where(
+                    OrderItem.order_id == OrderInfo.id,
+                    OrderItem.order_create_time == OrderInfo.create_time,
+                )
+                .scalar_subquery()
+            )
+            options.append(with_expression(OrderInfo.item_count, item_count))
+        return options
+
+    @staticmethod
+    def _json_object(fields: frozenset[str] | None) -> ColumnElement[str]:
+        """``json_build_object`` of an order's response fields, as text.
+
+        Keys follow the response model order and amounts are sent as
+        floats, like the response models serialize them.
+        """
+        of_order = (
+            OrderItem.order_id == OrderInfo.id,
+            OrderItem.order_create_time == OrderInfo.create_time,
+        )
+        item = func.json_build_object(
+            *_json_pairs(
+                {
+                    "id": OrderItem.id,
+                    "goods_id": OrderItem.goods_id,
+                    "goods_name": OrderItem.goods_name,
+                    "goods_price": cast(OrderItem.goods_price, Float),
+                    "count": OrderItem.count,
+                    "item_amount": cast(OrderItem.item_amount, Float),
+                }
+            )
+        )
+        items = (
+            select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(item, OrderItem.id)),
+                    literal_column("'[]'::json"),
+                )
+            )
+            .where(*of_order)
+            .scalar_subquery()
+        )
+        item_count = select(func.count()).where(*of_order).scalar_subquery()
+        columns = {
+            "id": OrderInfo.id,
+            "user_id": OrderInfo.user_id,
+            "delivery_addr_id": OrderInfo.delivery_addr_id,
+            "total_amount": cast(OrderInfo.total_amount, Float),
+            "status": OrderInfo.status,
+            "create_time": OrderInfo.create_time,
+            "order_type": OrderInfo.order_type,
+            "items": items,
+            "item_count": item_count,
+        }
+        if fields is None:
+            fields = frozenset(OrderInfoResponse.model_fields)
+        selected = {
+            name: columns[name] for name in OrderListItem.model_fields if name in fields
+        }
+        return cast(func.json_build_object(*_json_pairs(selected)), Text)
+
+
+class OrderPartitionRepository:
+    """DDL for the monthly partitions of ``order_info`` and ``order_item``.
+
+    Both tables are range partitioned by UTC calendar month, ``order_item``
+    on its copy of the order's ``create_time``, so an order and its items
+    always live in partitions of the same month. There is no default
+    partition, which would keep the planner from reading partitions in
+    order for the order history: months must be created before orders
+    arrive for them.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def lock(self) -> bool:
+        """Take the maintenance lock until the transaction ends.
+
+        Returns:
+            bool: False if another session holds it
+        """
+        locked = await self.session.scalar(
+            select(func.pg_try_advisory_xact_lock(PARTITION_LOCK_KEY))
+        )
+        if locked:
+            await self.session.execute(
+                text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'")
+            )
+        return locked
+
+    async def list_months(self) -> list[date]:
+        """Months with an attached ``order_info`` partition, oldest first."""
+        result = await self.session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = 'order_info'::regclass"
+            )
+        )
+        return sorted(
+            datetime.strptime(name.removeprefix("order_info_p"), "%Y%m").date()
+            for name in result.scalars()
+        )
+
+    async def create(self, month: date) -> None:
+        """Create the partitions of one month. Does not commit."""
+        start, end = self._bounds(month)
+        for table in PARTITIONED_TABLES:
+            await self.session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {self.partition_name(table, month)}"
+                    f" PARTITION OF {table}"
+                    f" FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+
+    async def detach(self, month: date, drop: bool = False) -> None:
+        """Take the partitions of one month out of the tables. Does not commit.
+
+        Detached partitions stay behind as plain ``<table>_pYYYYMM`` tables
+        to be archived (e.g. with ``pg_dump``) and dropped, unless ``drop``
+        drops them right away. The month's reservations, long settled, are
+        deleted since they reference the orders.
+        """
+        items = self.partition_name("order_item", month)
+        orders = self.partition_name("order_info", month)
+        start, end = self._bounds(month)
+
+        await self.session.execute(
+            text(f"ALTER TABLE order_item DETACH PARTITION {items}")
+        )
+        # The detached table keeps its own copy of the foreign key to the
+        # orders, which would block detaching them
+        await self.session.execute(
+            text(f"ALTER TABLE {items} DROP CONSTRAINT IF EXISTS order_item_order_fkey")
+        )
+        await self.session.execute(
+            delete(StockReservation).where(
+                StockReservation.create_time >= start,
+                StockReservation.create_time < end,
+            )
+        )
+        await self.session.execute(
+            text(f"ALTER TABLE order_info DETACH PARTITION {orders}")
+        )
+        if drop:
+            await self.session.execute(text(f"DROP TABLE {items}, {orders}"))
+
+    @staticmethod
+    def partition_name(table: str, month: date) -> str:
+        return f"{table}_p{month:%Y%m}"
+
+    @staticmethod
+    def _bounds(month: date) -> tuple[datetime, datetime]:
+        return (
+            datetime.combine(month, time(), timezone.utc),
+            datetime.combine(add_months(month, 1), time(), timezone.utc),
+        )
@@ -1,46 +1,150 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.core.database import get_session
+from api.core.config import settings
+from api.core.database import async_session, get_session
 from api.core.logging import get_logger
-from api.core.security import get_current_user
+from api.core.security import get_current_admin, get_current_user
 from api.src.users.models import User
-from api.src.orders.schemas import OrderCreate, OrderInfoResponse
+from api.src.orders.batcher import order_batcher
+from api.src.orders.cache import order_list_cache
+from api.src.orders.schemas import (
+    OrderBatchCreate,
+    OrderBatchReport,
+    OrderCreate,
+    OrderInfoResponse,
+    OrderListCacheStats,
+    OrderListParams,
+    OrderPage,
+    OrderSummary,
+)
 from api.src.orders.service import OrderService
+from api.utils.fields import parse_fields, sparse_dump
 
 logger = get_logger(__name__)
 
+FieldsQuery = Annotated[
+    str | None,
+    Query(description="Comma separated fields to return, e.g. id,status,total_amount"),
+]
+
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
 @router.post("/", response_model=OrderInfoResponse, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order_data: OrderCreate,
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
 ) -> OrderInfoResponse:
-    """Create a new order."""
+    """Create a new order.
+
+    With an ``Idempotency-Key`` header, retries of the same request get the
+    first response back (marked ``Idempotent-Replayed: true``) instead of
+    creating another order. Without one, orders are group committed with
+    concurrent ones when ``ORDERS_GROUP_COMMIT`` is on.
+    """
     logger.debug(f"Creating order for user: {current_user.id}")
+    if idempotency_key is None and settings.ORDERS_GROUP_COMMIT:
+        # The group brings its own session; none is opened per request
+        return await order_batcher.submit(current_user.id, order_data)
+    async with async_session() as session:
+        service = OrderService(session)
+        if idempotency_key is None:
+            return await service.create_order(current_user.id, order_data)
+        stored, replayed = await service.create_order_once(
+            current_user.id, order_data, idempotency_key
+        )
+    return Response(
+        stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"} if replayed else None,
+    )
+
+
+@router.post("/batch", response_model=OrderBatchReport)
+async def create_orders(
+    batch: OrderBatchCreate,
+    chunk_size: int | None = Query(None, ge=1, le=settings.ORDERS_BATCH_MAX_SIZE),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> OrderBatchReport:
+    """Create many orders at once, committed in chunks.
+
+    Every order is reported with its new id or the reason it was rejected;
+    one bad order does not stop the others.
+    """
+    logger.debug(f"Creating {len(batch.orders)} orders for user: {current_user.id}")
     service = OrderService(session)
-    return await service.create_order(current_user.id, order_data)
+    return await service.create_orders(current_user.id, batch.orders, chunk_size)
 
 
-@router.get("/", response_model=list[OrderInfoResponse])
+@router.get("/", response_model=OrderPage)
 async def list_orders(
+    params: Annotated[OrderListParams, Query()],
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> list[OrderInfoResponse]:
-    """List current user's orders."""
+) -> OrderPage:
+    """List current user's orders newest first; pass next_cursor back as cursor.
+
+    Use ``items=count`` or ``items=none`` to skip loading the order items.
+    Pages are cached per user until the user's orders change.
+    """
+    selected = parse_fields(params.fields, OrderInfoResponse)
     service = OrderService(session)
-    return await service.get_user_orders(current_user.id)
+    body = await service.get_user_orders_body(current_user.id, params, selected)
+    return Response(body, media_type="application/json")
+
+
+@router.get("/summary", response_model=OrderSummary)
+async def get_order_summary(
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> OrderSummary:
+    """Order count, lifetime spend and last order time of the current user."""
+    return await OrderService(session).get_summary(current_user.id)
+
+
+@router.get(
+    "/cache-stats",
+    response_model=OrderListCacheStats,
+    dependencies=[Depends(get_current_admin)],
+)
+async def get_order_list_cache_stats() -> OrderListCacheStats:
+    """Order list cache counters of the worker serving the request."""
+    return OrderListCacheStats.model_validate(order_list_cache.stats())
 
 
 @router.get("/{order_id}", response_model=OrderInfoResponse)
 async def get_order(
     order_id: int,
+    fields: FieldsQuery = None,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> OrderInfoResponse:
     """Get specific order details."""
+    selected = parse_fields(fields, OrderInfoResponse)
+    service = OrderService(session)
+    if settings.ORDERS_JSON_READS:
+        body = await service.get_order_json(current_user.id, order_id, selected)
+        return Response(body, media_type="application/json")
+    order = await service.get_order_details(current_user.id, order_id, selected)
+    if selected is None:
+        return order
+    return JSONResponse(sparse_dump(OrderInfoResponse, selected, order))
+
+
+@router.post("/{order_id}/pay", response_model=OrderInfoResponse)
+async def pay_order(
+    order_id: int,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> OrderInfoResponse:
+    """Mark a pending order as paid, confirming its stock reservation."""
+    logger.debug(f"Paying order {order_id} for user: {current_user.id}")
     service = OrderService(session)
-    return await service.get_order_details(current_user.id, order_id)
+    return await service.pay_order(current_user.id, order_id)
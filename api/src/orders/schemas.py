@@ -1,9 +1,15 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from api.core.config import settings
+from api.src.orders.models import OrderStatus
+
 
 class OrderItemCreate(BaseModel):
     goods_id: int
-    count: int
+    count: int = Field(..., gt=0)
 
 
 class OrderCreate(BaseModel):
@@ -11,6 +17,24 @@ class OrderCreate(BaseModel):
     items: list[OrderItemCreate]
 
 
+class OrderBatchCreate(BaseModel):
+    orders: list[OrderCreate] = Field(
+        ..., min_length=1, max_length=settings.ORDERS_BATCH_MAX_SIZE
+    )
+
+
+class OrderBatchResult(BaseModel):
+    index: int = Field(..., description="Position of the order in the request")
+    order_id: int | None = None
+    error: str | None = None
+
+
+class OrderBatchReport(BaseModel):
+    created: int = 0
+    failed: int = 0
+    results: list[OrderBatchResult] = []
+
+
 class OrderItemResponse(BaseModel):
     id: int
     goods_id: int
@@ -33,3 +57,60 @@ class OrderInfoResponse(BaseModel):
     items: list[OrderItemResponse]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class OrderListItem(OrderInfoResponse):
+    item_count: int = Field(..., description="Only returned with items=count")
+
+
+class OrderItemsMode(str, Enum):
+    FULL = "full"  # every item of every order
+    COUNT = "count"  # item_count instead of the items
+    NONE = "none"
+
+
+class OrderListParams(BaseModel):
+    status: OrderStatus | None = Field(None, description="Only orders in this status")
+    order_type: int | None = Field(None, description="Only orders of this type")
+    created_from: datetime | None = Field(None, description="Placed at or after")
+    created_to: datetime | None = Field(None, description="Placed before")
+    items: OrderItemsMode = Field(OrderItemsMode.FULL, description="Items to return")
+    cursor: str | None = Field(None, description="next_cursor of the previous page")
+    limit: int = Field(
+        settings.ORDERS_PAGE_SIZE, ge=1, le=settings.ORDERS_PAGE_SIZE_MAX
+    )
+    fields: str | None = Field(
+        None, description="Comma separated fields to return, e.g. id,status"
+    )
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if (
+            self.created_from is not None
+            and self.created_to is not None
+            and self.created_to <= self.created_from
+        ):
+            raise ValueError("created_to must be after created_from")
+        return self
+
+
+class OrderPage(BaseModel):
+    items: list[OrderInfoResponse]
+    next_cursor: str | None = None
+
+
+class OrderSummary(BaseModel):
+    order_count: int = 0
+    paid_count: int = 0
+    total_spent: float = Field(0, description="Total of the paid orders")
+    last_order_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OrderListCacheStats(BaseModel):
+    size: int = Field(..., description="Pages currently cached")
+    hits: int
+    misses: int
+    evictions: int = 0
+    hit_rate: float = Field(..., description="hits / (hits + misses)")
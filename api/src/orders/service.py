@@ -1,11 +1,82 @@
+import json
+from collections import Counter
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import NamedTuple
+
+from asyncpg import PostgresError
 from fastapi import HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.core.exceptions import NotFoundException
+from api.core.config import settings
+from api.core.exceptions import (
+    BadRequestException,
+    InsufficientStockException,
+    NotFoundException,
+)
+from api.core.logging import get_logger
+from api.src.goods.models import Goods
 from api.src.goods.repository import GoodsRepository
-from api.src.orders.models import OrderInfo, OrderItem
+from api.src.idempotency.schemas import StoredResponse
+from api.src.idempotency.service import IdempotencyService, request_fingerprint
+from api.src.orders.cache import order_list_cache
+from api.src.orders.models import OrderInfo, OrderItem, OrderStatus
 from api.src.orders.repository import OrderRepository
-from api.src.orders.schemas import OrderCreate
+from api.src.orders.schemas import (
+    OrderBatchReport,
+    OrderBatchResult,
+    OrderCreate,
+    OrderInfoResponse,
+    OrderItemsMode,
+    OrderListItem,
+    OrderListParams,
+    OrderPage,
+    OrderSummary,
+)
+from api.src.outbox.service import OutboxService
+from api.src.reservations.service import ReservationService
+from api.utils.fields import sparse_dump
+
+logger = get_logger(__name__)
+
+# Outbox topics, delivered to handlers after the order transaction commits
+ORDER_CREATED = "order.created"
+ORDER_PAID = "order.paid"
+
+
+def order_event(order: OrderInfo) -> dict:
+    return {
+        "order_id": order.id,
+        "user_id": order.user_id,
+        "total_amount": float(order.total_amount),
+    }
+
+
+class BatchGoods(NamedTuple):
+    """The fields of a goods row that batch order creation reads.
+
+    A chunk the database rejects rolls the session back, which expires
+    every loaded ``Goods``; reading one afterwards would need a lazy load,
+    which AsyncSession cannot do. Chunks therefore work on plain copies.
+    """
+
+    id: int
+    name: str
+    price: Decimal
+    stock: int
+    stock_shards: int
+
+
+class PricedOrder(NamedTuple):
+    """A validated order of a batch, ready to be written."""
+
+    index: int
+    user_id: int
+    delivery_addr_id: int
+    counts: dict[int, int]
+    lines: list[dict]
+    total_amount: float
 
 
 class OrderService:
@@ -13,61 +84,510 @@ class OrderService:
         self.session = session
         self.order_repo = OrderRepository(session)
         self.goods_repo = GoodsRepository(session)
+        self.reservations = ReservationService(session)
+        self.outbox = OutboxService(session)
+        self.idempotency = IdempotencyService(session)
+        self.list_cache = order_list_cache
 
     async def create_order(self, user_id: int, order_data: OrderCreate) -> OrderInfo:
-        total_amount = 0
-        order_items = []
+        order = await self._place_order(user_id, order_data)
+        await self.session.commit()
+        self.goods_repo.invalidate(item.goods_id for item in order.items)
+        await self.list_cache.invalidate([user_id])
+        return order
+
+    async def create_order_once(
+        self, user_id: int, order_data: OrderCreate, idempotency_key: str
+    ) -> tuple[StoredResponse, bool]:
+        """Create an order at most once per Idempotency-Key.
+
+        The key is claimed in the order's transaction and the serialized
+        response stored before it commits. A retry gets that response back
+        without the order tables being touched, and a concurrent duplicate
+        waits for the first attempt; if that one fails, the duplicate runs.
+
+        Returns:
+            tuple[StoredResponse, bool]: The response and whether it is a replay
+
+        Raises:
+            IdempotencyKeyReusedException: If the key came with another request
+        """
+        fingerprint = request_fingerprint("POST /orders", order_data)
+        stored = await self.idempotency.begin(user_id, idempotency_key, fingerprint)
+        if stored is not None:
+            await self.session.rollback()
+            return stored, True
+
+        order = await self._place_order(user_id, order_data)
+        stored = StoredResponse(
+            fingerprint=fingerprint,
+            status_code=status.HTTP_201_CREATED,
+            body=OrderInfoResponse.model_validate(order).model_dump_json(),
+        )
+        await self.idempotency.finish(user_id, idempotency_key, stored)
+        await self.session.commit()
+        self.goods_repo.invalidate(item.goods_id for item in order.items)
+        await self.list_cache.invalidate([user_id])
+        return stored, False
+
+    async def _place_order(self, user_id: int, order_data: OrderCreate) -> OrderInfo:
+        """Validate, price and write one order with its reservation. Does not commit."""
+        counts = self._merge_lines(order_data)
+        goods_map = await self.goods_repo.get_many(list(counts))
+        lines, total_amount = self._price_lines(counts, goods_map)
+
+        order = OrderInfo(
+            user_id=user_id,
+            delivery_addr_id=order_data.delivery_addr_id,
+            total_amount=total_amount,
+            items=[OrderItem(**line) for line in lines],
+            status=OrderStatus.PENDING,
+            order_type=0
+        )
+
+        sharded = frozenset(
+            goods_id for goods_id, goods in goods_map.items() if goods.stock_shards
+        )
+        try:
+            # Stock is held until the order is paid or the reservation expires
+            await self.reservations.reserve(order, counts, sharded)
+        except InsufficientStockException as e:
+            # Read before the rollback expires the goods
+            name = goods_map[e.goods_id].name
+            await self.session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock for goods '{name}'"
+            )
+
+        await self.order_repo.count_created(user_id)
+        order = await self.order_repo.create(order)
+        self.outbox.publish(ORDER_CREATED, order_event(order))
+        return order
+
+    async def create_orders(
+        self,
+        user_id: int,
+        orders: list[OrderCreate],
+        chunk_size: int | None = None,
+    ) -> OrderBatchReport:
+        """Create many orders with a handful of statements per chunk.
+
+        The goods of the whole batch are fetched with one query. Each chunk
+        then locks its goods, allocates stock order by order and writes the
+        orders, items and reservations with multi-row INSERTs before it
+        commits. An order that is invalid or runs out of stock is reported
+        and skipped; the rest of its chunk goes through.
+
+        Args:
+            user_id: Owner of the orders
+            orders: Orders to create
+            chunk_size: Orders per transaction, ORDERS_BATCH_CHUNK_SIZE if None
+
+        Returns:
+            OrderBatchReport: Outcome of every order, in request order
+        """
+        chunk_size = chunk_size or settings.ORDERS_BATCH_CHUNK_SIZE
+        results = [OrderBatchResult(index=index) for index in range(len(orders))]
+        priced, goods_map = await self._price_orders(
+            [(user_id, order_data) for order_data in orders], results
+        )
+
+        for start in range(0, len(priced), chunk_size):
+            await self._create_chunk(
+                priced[start : start + chunk_size], goods_map, results
+            )
+
+        created = sum(result.order_id is not None for result in results)
+        if created:
+            await self.list_cache.invalidate([user_id])
+        logger.info(
+            f"Batch of {len(orders)} orders for user {user_id}: {created} created"
+        )
+        return OrderBatchReport(
+            created=created, failed=len(orders) - created, results=results
+        )
+
+    async def create_order_group(
+        self, orders: list[tuple[int, OrderCreate]]
+    ) -> list[OrderInfo | HTTPException]:
+        """Place the orders of concurrent requests with one commit.
+
+        Group commit for ``OrderBatcher``: the orders, possibly of different
+        users, are written like a chunk of ``create_orders``, so one bad cart
+        is rejected on its own while the rest share the multi-row INSERTs
+        and the commit.
+
+        Args:
+            orders: ``(user_id, order)`` of each request
+
+        Returns:
+            list[OrderInfo | HTTPException]: The new order, or the error
+            ``create_order`` would have raised, of each request in order
+
+        Raises:
+            SQLAlchemyError, PostgresError: If the database rejects the group;
+                nothing is written
+        """
+        results = [OrderBatchResult(index=index) for index in range(len(orders))]
+        priced, goods_map = await self._price_orders(orders, results)
+        try:
+            created = await self._write_chunk(priced, goods_map, results)
+            await self.session.commit()
+        except (SQLAlchemyError, PostgresError):
+            await self.session.rollback()
+            raise
+
+        self.goods_repo.invalidate(
+            {goods_id for order in priced for goods_id in order.counts}
+        )
+        await self.list_cache.invalidate({orders[index][0] for index in created})
+        return [
+            created[index]
+            if index in created
+            else HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=result.error
+            )
+            for index, result in enumerate(results)
+        ]
+
+    async def _price_orders(
+        self,
+        orders: list[tuple[int, OrderCreate]],
+        results: list[OrderBatchResult],
+    ) -> tuple[list[PricedOrder], dict[int, BatchGoods]]:
+        """Validate and price ``(user_id, order)`` pairs against one goods fetch.
 
+        Invalid orders get their error in ``results`` and are left out.
+        """
+        counts_by_order: dict[int, dict[int, int]] = {}
+        for index, (_, order_data) in enumerate(orders):
+            try:
+                counts_by_order[index] = self._merge_lines(order_data)
+            except HTTPException as e:
+                results[index].error = e.detail
+
+        goods = await self.goods_repo.get_many(
+            [goods_id for counts in counts_by_order.values() for goods_id in counts]
+        )
+        goods_map = {
+            goods_id: BatchGoods(
+                good.id, good.name, good.price, good.stock, good.stock_shards
+            )
+            for goods_id, good in goods.items()
+        }
+        priced: list[PricedOrder] = []
+        for index, counts in counts_by_order.items():
+            try:
+                lines, total_amount = self._price_lines(counts, goods_map)
+            except HTTPException as e:
+                results[index].error = e.detail
+                continue
+            user_id, order_data = orders[index]
+            priced.append(
+                PricedOrder(
+                    index,
+                    user_id,
+                    order_data.delivery_addr_id,
+                    counts,
+                    lines,
+                    total_amount,
+                )
+            )
+        return priced, goods_map
+
+    async def _create_chunk(
+        self,
+        chunk: list[PricedOrder],
+        goods_map: dict[int, BatchGoods],
+        results: list[OrderBatchResult],
+    ) -> None:
+        try:
+            created = await self._write_chunk(chunk, goods_map, results)
+            await self.session.commit()
+        except (SQLAlchemyError, PostgresError) as e:
+            await self.session.rollback()
+            logger.warning(f"Order batch chunk at index {chunk[0].index} failed: {e}")
+            for order in chunk:
+                results[order.index] = OrderBatchResult(
+                    index=order.index, error="Chunk rejected by the database"
+                )
+            return
+
+        self.goods_repo.invalidate(
+            {goods_id for order in chunk for goods_id in order.counts}
+        )
+        for index, order in created.items():
+            results[index].order_id = order.id
+
+    async def _write_chunk(
+        self,
+        chunk: list[PricedOrder],
+        goods_map: dict[int, BatchGoods],
+        results: list[OrderBatchResult],
+    ) -> dict[int, OrderInfo]:
+        """Take stock for a chunk and write the orders that got it. Does not commit.
+
+        The chunk's goods are locked in id order up front, so chunks of
+        concurrent transactions cannot deadlock on them. Orders short of
+        stock get their error in ``results``.
+
+        Returns:
+            dict[int, OrderInfo]: New order, with its items, keyed by the index
+            of each written order
+        """
+        sharded = frozenset(
+            goods_id for goods_id, goods in goods_map.items() if goods.stock_shards
+        )
+        available = await self.goods_repo.lock_stock(
+            sorted(
+                {
+                    goods_id
+                    for order in chunk
+                    for goods_id in order.counts
+                    if goods_id not in sharded
+                }
+            )
+        )
+        taken: dict[int, int] = {}
+        accepted: list[PricedOrder] = []
+        for order in chunk:
+            short = await self._allocate(order.counts, sharded, available, taken)
+            if short is not None:
+                results[order.index].error = (
+                    f"Insufficient stock for goods '{goods_map[short].name}'"
+                )
+                continue
+            accepted.append(order)
+        if not accepted:
+            return {}
+
+        if taken:
+            # The goods are locked, so this one UPDATE cannot come up short
+            await self.goods_repo.commit_stock(taken)
+        created = await self.order_repo.create_many(
+            [
+                {
+                    "user_id": order.user_id,
+                    "delivery_addr_id": order.delivery_addr_id,
+                    "total_amount": order.total_amount,
+                    "status": OrderStatus.PENDING,
+                    "order_type": 0,
+                }
+                for order in accepted
+            ],
+            [order.lines for order in accepted],
+        )
+        await self.reservations.hold_many(
+            [(new.id, order.counts) for new, order in zip(created, accepted)]
+        )
+        # In user order, so concurrent groups lock the counter rows alike
+        created_by_user = Counter(order.user_id for order in accepted)
+        for user_id in sorted(created_by_user):
+            await self.order_repo.count_created(user_id, created_by_user[user_id])
+        self.outbox.publish_many(
+            ORDER_CREATED,
+            [
+                {
+                    "order_id": new.id,
+                    "user_id": order.user_id,
+                    "total_amount": order.total_amount,
+                }
+                for order, new in zip(accepted, created)
+            ],
+        )
+        return {order.index: new for order, new in zip(accepted, created)}
+
+    async def _allocate(
+        self,
+        counts: dict[int, int],
+        sharded: frozenset[int],
+        available: dict[int, int],
+        taken: dict[int, int],
+    ) -> int | None:
+        """Take one order's stock within a chunk; the id of a short goods if any.
+
+        Plain goods are checked against the locked stock minus what earlier
+        orders of the chunk took, and only added to ``taken``. Sharded goods
+        are taken from their shards right away, inside a savepoint so a short
+        shard undoes just this order.
+        """
+        plain = {
+            goods_id: count
+            for goods_id, count in counts.items()
+            if goods_id not in sharded
+        }
+        for goods_id, count in plain.items():
+            if available.get(goods_id, 0) - taken.get(goods_id, 0) < count:
+                return goods_id
+
+        shard_counts = {
+            goods_id: count for goods_id, count in counts.items() if goods_id in sharded
+        }
+        if shard_counts:
+            try:
+                async with self.session.begin_nested():
+                    await self.goods_repo.take_from_shards(shard_counts)
+            except InsufficientStockException as e:
+                return e.goods_id
+
+        for goods_id, count in plain.items():
+            taken[goods_id] = taken.get(goods_id, 0) + count
+        return None
+
+    @staticmethod
+    def _merge_lines(order_data: OrderCreate) -> dict[int, int]:
         if not order_data.items:
              raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Order must contain at least one item"
             )
 
+        # Merge duplicate lines so each goods is validated and priced once
+        counts: dict[int, int] = {}
         for item_data in order_data.items:
-            try:
-                goods = await self.goods_repo.get_by_id(item_data.goods_id)
-            except NotFoundException:
+            counts[item_data.goods_id] = counts.get(item_data.goods_id, 0) + item_data.count
+        return counts
+
+    @staticmethod
+    def _price_lines(
+        counts: dict[int, int], goods_map: Mapping[int, Goods | BatchGoods]
+    ) -> tuple[list[dict], float]:
+        total_amount = 0
+        lines = []
+
+        for goods_id, count in counts.items():
+            goods = goods_map.get(goods_id)
+            if goods is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Goods with id {item_data.goods_id} not found"
+                    detail=f"Goods with id {goods_id} not found"
                 )
 
-            if goods.stock < item_data.count:
+            # Sharded goods keep no stock on the goods row; the atomic
+            # decrement is the only check for them
+            if not goods.stock_shards and goods.stock < count:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Insufficient stock for goods '{goods.name}'"
                 )
 
-            item_amount = float(goods.price) * item_data.count
+            item_amount = float(goods.price) * count
             total_amount += item_amount
 
-            order_item = OrderItem(
-                goods_id=goods.id,
-                goods_name=goods.name,
-                goods_price=goods.price,
-                count=item_data.count,
-                item_amount=item_amount
+            lines.append(
+                {
+                    "goods_id": goods.id,
+                    "goods_name": goods.name,
+                    "goods_price": goods.price,
+                    "count": count,
+                    "item_amount": item_amount,
+                }
             )
-            order_items.append(order_item)
 
-        order = OrderInfo(
-            user_id=user_id,
-            delivery_addr_id=order_data.delivery_addr_id,
-            total_amount=total_amount,
-            items=order_items,
-            status=0,  # 0: Pending/Created
-            order_type=0
+        return lines, total_amount
+
+    async def get_user_orders(
+        self,
+        user_id: int,
+        params: OrderListParams,
+        fields: frozenset[str] | None = None,
+    ) -> OrderPage | dict:
+        """List a page of the user's orders; trimmed pages come back as plain JSON data.
+
+        ``params.items`` narrows the requested fields (see ``_list_fields``).
+        """
+        fields = self._list_fields(params, fields)
+        orders, next_cursor = await self.order_repo.list_page(user_id, params, fields)
+        if fields is None:
+            return OrderPage(items=orders, next_cursor=next_cursor)
+        return {
+            "items": [sparse_dump(OrderListItem, fields, order) for order in orders],
+            "next_cursor": next_cursor,
+        }
+
+    async def get_user_orders_body(
+        self,
+        user_id: int,
+        params: OrderListParams,
+        fields: frozenset[str] | None = None,
+    ) -> str:
+        """Serialized page of the user's orders, from the list cache if possible.
+
+        The user's cache generation is read before the database, and every
+        write moves the user to a new one after it commits. A page read
+        concurrently with a write is therefore stored under the generation
+        the write retires, never served after it.
+        """
+        generation = await self.list_cache.generation(user_id)
+        key = f"orders:{user_id}:{generation}:{params.model_dump_json()}"
+        body = await self.list_cache.get(key)
+        if body is not None:
+            return body
+
+        if settings.ORDERS_JSON_READS:
+            body = await self.get_user_orders_json(user_id, params, fields)
+        else:
+            page = await self.get_user_orders(user_id, params, fields)
+            if isinstance(page, OrderPage):
+                body = page.model_dump_json()
+            else:
+                body = json.dumps(page)
+        await self.list_cache.set(key, body)
+        return body
+
+    async def get_user_orders_json(
+        self,
+        user_id: int,
+        params: OrderListParams,
+        fields: frozenset[str] | None = None,
+    ) -> str:
+        """Same page as ``get_user_orders``, as a JSON body built by PostgreSQL."""
+        orders, next_cursor = await self.order_repo.list_page_json(
+            user_id, params, self._list_fields(params, fields)
+        )
+        return (
+            f'{{"items":[{",".join(orders)}],'
+            f'"next_cursor":{json.dumps(next_cursor)}}}'
         )
 
-        return await self.order_repo.create(order)
+    async def get_order_json(
+        self, user_id: int, order_id: int, fields: frozenset[str] | None = None
+    ) -> str:
+        """One of the user's orders as a JSON body built by PostgreSQL.
+
+        Raises:
+            NotFoundException: If the user has no such order
+        """
+        return await self.order_repo.get_json(order_id, user_id, fields)
+
+    @staticmethod
+    def _list_fields(
+        params: OrderListParams, fields: frozenset[str] | None
+    ) -> frozenset[str] | None:
+        """Narrow the requested fields by ``params.items``.
+
+        ``count`` replaces the items with ``item_count`` and ``none`` leaves
+        them out, so the items are never loaded for either.
+        """
+        if params.items is OrderItemsMode.FULL:
+            return fields
+        fields = (fields or frozenset(OrderInfoResponse.model_fields)) - {"items"}
+        if params.items is OrderItemsMode.COUNT:
+            fields |= {"item_count"}
+        return fields
 
-    async def get_user_orders(self, user_id: int) -> list[OrderInfo]:
-        return await self.order_repo.list_by_user(user_id)
+    async def get_summary(self, user_id: int) -> OrderSummary:
+        stats = await self.order_repo.get_stats(user_id)
+        if stats is None:
+            return OrderSummary()
+        return OrderSummary.model_validate(stats)
 
-    async def get_order_details(self, user_id: int, order_id: int) -> OrderInfo:
+    async def get_order_details(
+        self, user_id: int, order_id: int, fields: frozenset[str] | None = None
+    ) -> OrderInfo:
         try:
-            order = await self.order_repo.get_by_id(order_id)
+            order = await self.order_repo.get_by_id(order_id, fields)
         except NotFoundException:
              raise NotFoundException("Order not found")
 
@@ -75,3 +595,23 @@ class OrderService:
             raise NotFoundException("Order not found")  # Hide existence for security
 
         return order
+
+    async def pay_order(self, user_id: int, order_id: int) -> OrderInfo:
+        order = await self.order_repo.get_for_update(order_id)
+        if order.user_id != user_id:
+            await self.session.rollback()
+            raise NotFoundException("Order not found")  # Hide existence for security
+
+        if order.status != OrderStatus.PENDING:
+            await self.session.rollback()
+            raise BadRequestException("Order is not awaiting payment")
+
+        if not await self.reservations.confirm(order.id):
+            await self.session.rollback()
+            raise BadRequestException("Order reservation has expired")
+
+        await self.order_repo.count_paid(user_id, order.total_amount)
+        self.outbox.publish(ORDER_PAID, order_event(order))
+        await self.order_repo.set_status(order, OrderStatus.PAID)
+        await self.list_cache.invalidate([user_id])
+        return await self.order_repo.get_by_id(order_id)
@@ -0,0 +1,39 @@
+"""Run outbox workers on their own: ``python -m api.src.outbox``."""
+
+import argparse
+import asyncio
+import signal
+
+import api.src  # noqa: F401  (register all models)
+from api.core.config import settings
+from api.core.logging import get_logger, setup_logging
+from api.src.outbox.worker import create_outbox_workers
+
+logger = get_logger(__name__)
+
+
+async def main(workers: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    tasks = create_outbox_workers(workers)
+    for task in tasks:
+        task.start()
+    logger.info(f"Outbox worker process running {len(tasks)} workers")
+    await stop.wait()
+    # Events being handled now are redelivered once their lease runs out
+    for task in tasks:
+        await task.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deliver outbox events.")
+    parser.add_argument(
+        "--workers", type=int, default=max(settings.OUTBOX_WORKERS, 1)
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(main(args.workers))
@@ -0,0 +1,48 @@
+import importlib
+from collections.abc import Awaitable, Callable
+
+from api.core.config import settings
+from api.src.outbox.models import OutboxEvent
+
+OutboxHandler = Callable[[OutboxEvent], Awaitable[None]]
+
+
+class OutboxHandlers:
+    """Registry of the coroutine that delivers each outbox topic.
+
+    Register with the decorator::
+
+        @outbox_handlers.register("order.created")
+        async def send_confirmation(event: OutboxEvent) -> None: ...
+
+    Delivery is at least once (a worker may die after the handler ran but
+    before the event was deleted), so handlers must be idempotent; the
+    event id makes a good deduplication key.
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, OutboxHandler] = {}
+
+    def register(self, topic: str) -> Callable[[OutboxHandler], OutboxHandler]:
+        def decorator(handler: OutboxHandler) -> OutboxHandler:
+            if topic in self._handlers:
+                raise ValueError(f"Outbox topic {topic} already has a handler")
+            self._handlers[topic] = handler
+            return handler
+
+        return decorator
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def get(self, topic: str) -> OutboxHandler | None:
+        return self._handlers.get(topic)
+
+
+outbox_handlers = OutboxHandlers()
+
+
+def load_handler_modules() -> None:
+    """Import ``OUTBOX_HANDLER_MODULES`` so their handlers register."""
+    for module in settings.OUTBOX_HANDLER_MODULES:
+        importlib.import_module(module)
@@ -0,0 +1,45 @@
+from enum import IntEnum
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from api.core.database import Base
+
+
+class OutboxStatus(IntEnum):
+    PENDING = 0
+    DEAD = 1  # gave up after OUTBOX_MAX_ATTEMPTS; delivered events are deleted
+
+
+class OutboxEvent(Base):
+    """A side effect to run after the transaction that wrote it commits."""
+
+    __tablename__ = "outbox_event"
+    __table_args__ = (
+        # Lets workers claim the next ready events without scanning dead ones
+        Index(
+            "ix_outbox_event_pending_available_at_id",
+            "available_at",
+            "id",
+            postgresql_where=text("status = 0"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    topic: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    status: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=OutboxStatus.PENDING
+    )
+    # Deliveries so far, counted when an event is claimed
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Not claimable before; pushed forward by claims (lease) and retries
+    available_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_error: Mapped[str | None] = mapped_column(Text)
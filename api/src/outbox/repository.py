@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from sqlalchemy import (
+    BigInteger,
+    any_,
+    delete,
+    extract,
+    func,
+    literal,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.outbox.models import OutboxEvent, OutboxStatus
+from api.src.outbox.schemas import OutboxStats
+
+# Inlined rather than bound so prepared statements still match the partial
+# index on pending events
+IS_PENDING = OutboxEvent.status == literal_column(str(OutboxStatus.PENDING.value))
+
+
+class OutboxRepository:
+    """Repository for outbox events."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def add(self, topic: str, payload: dict) -> None:
+        """Queue an event in the caller's transaction. Does not commit.
+
+        The event is inserted when the session flushes, so it becomes
+        visible to workers exactly when the caller's writes do.
+        """
+        self.session.add(OutboxEvent(topic=topic, payload=payload))
+
+    def add_many(self, topic: str, payloads: list[dict]) -> None:
+        """Queue several events of one topic. Does not commit."""
+        self.session.add_all(
+            [OutboxEvent(topic=topic, payload=payload) for payload in payloads]
+        )
+
+    async def claim(self, limit: int, lease: timedelta) -> list[OutboxEvent]:
+        """Claim up to ``limit`` ready events for one worker.
+
+        Rows are picked with ``FOR UPDATE SKIP LOCKED``, so concurrent workers
+        take disjoint batches, and pushed ``lease`` into the future so nobody
+        else claims them while they are handled. If the worker dies, they
+        become ready again when the lease runs out. The caller commits.
+
+        Args:
+            limit: Maximum number of events to claim
+            lease: How long the events stay claimed
+
+        Returns:
+            list[OutboxEvent]: Claimed events, oldest first
+        """
+        ready = (
+            select(OutboxEvent.id)
+            .where(IS_PENDING, OutboxEvent.available_at <= func.now())
+            .order_by(OutboxEvent.available_at, OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(ready.scalar_subquery()))
+            .values(
+                available_at=func.now() + lease,
+                attempts=OutboxEvent.attempts + 1,
+            )
+            .returning(OutboxEvent)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(query)
+        return sorted(result.scalars().all(), key=lambda event: event.id)
+
+    async def complete(self, event_ids: list[int]) -> None:
+        """Delete delivered events. Does not commit."""
+        if not event_ids:
+            return
+        query = delete(OutboxEvent).where(
+            OutboxEvent.id == any_(literal(event_ids, ARRAY(BigInteger)))
+        )
+        await self.session.execute(query)
+
+    async def retry(self, event_id: int, delay: timedelta, error: str) -> None:
+        """Make a failed event ready again after ``delay``. Does not commit."""
+        query = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(available_at=func.now() + delay, last_error=error)
+        )
+        await self.session.execute(query)
+
+    async def bury(self, event_id: int, error: str) -> None:
+        """Give up on an event, kept in the table for inspection. Does not commit."""
+        query = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(status=OutboxStatus.DEAD, last_error=error)
+        )
+        await self.session.execute(query)
+
+    async def stats(self) -> OutboxStats:
+        """Queue depth by state, in one scan of the (normally short) table."""
+        query = select(
+            func.count().filter(IS_PENDING),
+            func.count().filter(IS_PENDING, OutboxEvent.available_at <= func.now()),
+            func.count().filter(OutboxEvent.status == OutboxStatus.DEAD),
+            extract(
+                "epoch",
+                func.now() - func.min(OutboxEvent.created_at).filter(IS_PENDING),
+            ),
+        )
+        result = await self.session.execute(query)
+        pending_count, ready, dead, age = result.one()
+        return OutboxStats(
+            pending=pending_count,
+            ready=ready,
+            dead=dead,
+            oldest_pending_age=float(age) if age is not None else None,
+        )
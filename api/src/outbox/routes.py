@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.database import get_session
+from api.core.security import get_current_admin
+from api.src.outbox.schemas import OutboxStats
+from api.src.outbox.service import OutboxService
+
+router = APIRouter(
+    prefix="/outbox",
+    tags=["outbox"],
+    dependencies=[Depends(get_current_admin)],
+)
+
+
+@router.get("/stats", response_model=OutboxStats)
+async def outbox_stats(session: AsyncSession = Depends(get_session)) -> OutboxStats:
+    """Queue depth of the outbox, for monitoring and alerting."""
+    return await OutboxService(session).stats()
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class OutboxStats(BaseModel):
+    pending: int = Field(..., description="Events not delivered yet")
+    ready: int = Field(..., description="Pending events claimable right now")
+    dead: int = Field(..., description="Events that exhausted their attempts")
+    oldest_pending_age: float | None = Field(
+        None, description="Seconds since the oldest pending event was written"
+    )
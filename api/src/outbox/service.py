@@ -0,0 +1,22 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.outbox.repository import OutboxRepository
+from api.src.outbox.schemas import OutboxStats
+
+
+class OutboxService:
+    """Queues side effects to run once the current transaction commits."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = OutboxRepository(session)
+
+    def publish(self, topic: str, payload: dict) -> None:
+        """Queue an event; it is written, and delivered, only if the caller commits."""
+        self.repository.add(topic, payload)
+
+    def publish_many(self, topic: str, payloads: list[dict]) -> None:
+        self.repository.add_many(topic, payloads)
+
+    async def stats(self) -> OutboxStats:
+        return await self.repository.stats()
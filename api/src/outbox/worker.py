@@ -0,0 +1,116 @@
+import asyncio
+from datetime import timedelta
+
+from api.core.config import settings
+from api.core.database import async_session
+from api.core.logging import get_logger
+from api.src.outbox.handlers import (
+    OutboxHandlers,
+    load_handler_modules,
+    outbox_handlers,
+)
+from api.src.outbox.models import OutboxEvent
+from api.src.outbox.repository import OutboxRepository
+from api.utils.tasks import PeriodicTask
+
+logger = get_logger(__name__)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the ``attempts``-th failed delivery."""
+    seconds = settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.OUTBOX_RETRY_MAX_DELAY))
+
+
+class OutboxWorker:
+    """Claims ready outbox events and runs their handlers.
+
+    A batch is claimed and committed in one short transaction, handled
+    concurrently with no transaction open, and settled in a second one:
+    delivered events are deleted, failed ones rescheduled with backoff or,
+    after ``OUTBOX_MAX_ATTEMPTS``, marked dead. Events of topics without a
+    handler fail the same way, so they are kept, not lost, until a process
+    that handles them picks them up or they are marked dead.
+    """
+
+    def __init__(
+        self, handlers: OutboxHandlers = outbox_handlers, session_factory=None
+    ):
+        self.handlers = handlers
+        self.session_factory = session_factory or async_session
+
+    async def run_once(self) -> int:
+        """Claim, handle and settle one batch.
+
+        Returns:
+            int: Number of events claimed
+        """
+        async with self.session_factory() as session:
+            events = await OutboxRepository(session).claim(
+                settings.OUTBOX_BATCH_SIZE, timedelta(seconds=settings.OUTBOX_LEASE)
+            )
+            await session.commit()
+        if not events:
+            return 0
+
+        errors = await asyncio.gather(*(self._deliver(event) for event in events))
+
+        async with self.session_factory() as session:
+            repository = OutboxRepository(session)
+            await repository.complete(
+                [event.id for event, error in zip(events, errors) if error is None]
+            )
+            for event, error in zip(events, errors):
+                if error is None:
+                    continue
+                if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    logger.error(
+                        f"Outbox event {event.id} ({event.topic}) is dead after "
+                        f"{event.attempts} attempts: {error}"
+                    )
+                    await repository.bury(event.id, error)
+                else:
+                    await repository.retry(event.id, retry_delay(event.attempts), error)
+            await session.commit()
+        return len(events)
+
+    async def drain(self) -> None:
+        """Handle batches until fewer than a full batch is ready."""
+        while await self.run_once() == settings.OUTBOX_BATCH_SIZE:
+            pass
+
+    async def _deliver(self, event: OutboxEvent) -> str | None:
+        """Run the handler of one event; the error text if it failed."""
+        handler = self.handlers.get(event.topic)
+        if handler is None:
+            logger.warning(f"Outbox event {event.id} has no handler for {event.topic}")
+            return f"No handler for outbox topic {event.topic}"
+        try:
+            await asyncio.wait_for(handler(event), settings.OUTBOX_HANDLER_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Outbox event {event.id} ({event.topic}) failed: {e!r}")
+            return repr(e)
+        return None
+
+
+def create_outbox_workers(count: int | None = None) -> list[PeriodicTask]:
+    """Background tasks delivering outbox events, ``OUTBOX_WORKERS`` by default.
+
+    Workers only contend through ``SKIP LOCKED`` claims, so they can run in
+    every API process, in dedicated ``python -m api.src.outbox`` processes,
+    or both. None are created while no handler is registered, since they
+    would only claim events to fail them.
+    """
+    count = settings.OUTBOX_WORKERS if count is None else count
+    if count:
+        load_handler_modules()
+        if not outbox_handlers:
+            logger.warning("No outbox handlers registered, not starting outbox workers")
+            return []
+    worker = OutboxWorker()
+    return [
+        PeriodicTask(
+            f"outbox-worker-{number}", worker.drain, settings.OUTBOX_POLL_INTERVAL
+        )
+        for number in range(count)
+    ]
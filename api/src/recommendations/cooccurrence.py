@@ -0,0 +1,130 @@
+import numpy as np
+
+# Pairs are packed into one int64 as (goods_id << 32) | related_id
+ID_BITS = 32
+ID_MASK = (1 << ID_BITS) - 1
+# Fewest buffered pairs worth a merge into the running totals
+MIN_MERGE = 1 << 20
+
+
+def order_pairs(
+    order_ids: np.ndarray, goods_ids: np.ndarray, max_items: int
+) -> np.ndarray:
+    """Packed ordered goods pairs of every order in a chunk.
+
+    Each order with ``n`` distinct goods yields its ``n * (n - 1)`` ordered
+    pairs, built with ``repeat``/``arange`` arithmetic rather than a loop.
+    Orders with more than ``max_items`` distinct goods are skipped: they are
+    bulk purchases, say little about affinity and would add pairs
+    quadratically.
+
+    Args:
+        order_ids: Order id of each order item
+        goods_ids: Goods id of each order item
+        max_items: Largest order, in distinct goods, that is counted
+
+    Returns:
+        np.ndarray: One packed key per ordered pair
+    """
+    items = np.unique(np.stack((order_ids, goods_ids), axis=1), axis=0)
+    if not len(items):
+        return np.empty(0, np.int64)
+    orders, goods = items[:, 0], items[:, 1]
+
+    starts = np.flatnonzero(np.r_[True, orders[1:] != orders[:-1]])
+    sizes = np.diff(np.r_[starts, len(orders)])
+    kept = (sizes > 1) & (sizes <= max_items)
+    goods = goods[np.repeat(kept, sizes)]
+    sizes = sizes[kept]
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    group = np.repeat(np.arange(len(sizes)), sizes)
+
+    # Item i pairs with every item of its order, itself included
+    partners = sizes[group]
+    left = np.repeat(goods, partners)
+    first = np.repeat(starts[group], partners)
+    emitted_before = np.cumsum(partners) - partners
+    offset = np.arange(len(left)) - np.repeat(emitted_before, partners)
+    right = goods[first + offset]
+
+    distinct = left != right
+    return (left[distinct] << ID_BITS) | right[distinct]
+
+
+class CooccurrenceCounter:
+    """Sparse goods x goods co-occurrence counts.
+
+    The matrix is kept in coordinate form: sorted unique packed pair keys
+    with a parallel count array, so memory follows the number of distinct
+    pairs, not the number of order items.
+
+    Chunks are buffered until they hold about as many pairs as the totals,
+    then counted with ``np.unique`` and merged into the sorted totals with
+    ``np.searchsorted``. Each merge costs time linear in the totals and is
+    paid for by at least as many buffered pairs, so the work per pair does
+    not grow with the number of chunks.
+    """
+
+    def __init__(self):
+        self._keys = np.empty(0, np.int64)
+        self._counts = np.empty(0, np.int64)
+        self._buffer: list[np.ndarray] = []
+        self._buffered = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def keys(self) -> np.ndarray:
+        self._merge()
+        return self._keys
+
+    @property
+    def counts(self) -> np.ndarray:
+        self._merge()
+        return self._counts
+
+    def add(self, pairs: np.ndarray) -> None:
+        if not len(pairs):
+            return
+        self._buffer.append(pairs)
+        self._buffered += len(pairs)
+        if self._buffered >= max(MIN_MERGE, len(self._keys)):
+            self._merge()
+
+    def _merge(self) -> None:
+        if not self._buffer:
+            return
+        keys, counts = np.unique(np.concatenate(self._buffer), return_counts=True)
+        self._buffer, self._buffered = [], 0
+
+        at = np.searchsorted(self._keys, keys)
+        found = at < len(self._keys)
+        found[found] = self._keys[at[found]] == keys[found]
+        # Keys are unique, so each existing total is hit at most once
+        self._counts[at[found]] += counts[found]
+        new = ~found
+        if new.any():
+            self._keys = np.insert(self._keys, at[new], keys[new])
+            self._counts = np.insert(self._counts, at[new], counts[new])
+
+    def top_k(self, k: int) -> tuple[np.ndarray, ...]:
+        """Best ``k`` neighbours of every goods.
+
+        Neighbours are ranked by count, ties broken by the lower goods id.
+
+        Returns:
+            tuple[np.ndarray, ...]: ``goods_id``, ``rank`` (from 0),
+            ``related_id`` and ``score`` arrays
+        """
+        self._merge()
+        goods = self._keys >> ID_BITS
+        related = self._keys & ID_MASK
+        order = np.lexsort((related, -self._counts, goods))
+        goods, related, counts = goods[order], related[order], self._counts[order]
+
+        starts = np.flatnonzero(np.r_[True, goods[1:] != goods[:-1]])
+        sizes = np.diff(np.r_[starts, len(goods)])
+        rank = np.arange(len(goods)) - np.repeat(starts, sizes)
+        best = rank < k
+        return goods[best], rank[best], related[best], counts[best]
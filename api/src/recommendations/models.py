@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, ForeignKey, Integer, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.core.database import Base
+
+
+class GoodsRelated(Base):
+    """Precomputed "frequently bought together" neighbours of a goods.
+
+    Rebuilt wholesale by the recommendations job; the primary key serves
+    ``GET /goods/{id}/related`` as a single index range scan.
+    """
+
+    __tablename__ = "goods_related"
+
+    goods_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("goods.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    related_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("goods.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # Number of orders containing both goods
+    score: Mapped[int] = mapped_column(Integer, nullable=False)
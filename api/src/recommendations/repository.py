@@ -0,0 +1,73 @@
+from collections.abc import AsyncIterator
+
+from sqlalchemy import Row, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.goods.models import Goods
+from api.src.orders.models import OrderInfo, OrderItem, OrderStatus
+from api.src.recommendations.models import GoodsRelated
+
+RELATED_COLUMNS = ["goods_id", "rank", "related_id", "score"]
+
+
+class RecommendationRepository:
+    """Repository for precomputed goods recommendations."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def list_related(self, goods_id: int, limit: int) -> list[Row]:
+        """Get the best neighbours of a goods with their display fields.
+
+        Args:
+            goods_id: Goods ID
+            limit: Maximum number of neighbours
+
+        Returns:
+            list[Row]: Rows with ``id``, ``name``, ``img``, ``price`` and
+            ``score``, best first
+        """
+        query = (
+            select(Goods.id, Goods.name, Goods.img, Goods.price, GoodsRelated.score)
+            .join(Goods, Goods.id == GoodsRelated.related_id)
+            .where(GoodsRelated.goods_id == goods_id)
+            .order_by(GoodsRelated.rank)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def stream_order_items(self, batch_size: int) -> AsyncIterator[list[Row]]:
+        """Stream ``(order_id, goods_id)`` of non-cancelled orders in order id order.
+
+        Rows come through a server-side cursor, ``batch_size`` at a time.
+        Items of one order may be split over two batches.
+        """
+        query = (
+            select(OrderItem.order_id, OrderItem.goods_id)
+            .join(OrderItem.order_info)
+            .where(OrderInfo.status != OrderStatus.CANCELLED)
+            .order_by(OrderItem.order_id)
+        )
+        result = await self.session.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def replace_related(self, records: list[tuple]) -> None:
+        """Swap in a new set of neighbours.
+
+        The old rows are deleted and the new ones loaded with COPY in one
+        transaction, so readers see either the old or the new set. Commits.
+
+        Args:
+            records: Tuples in ``RELATED_COLUMNS`` order
+        """
+        await self.session.execute(delete(GoodsRelated))
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            GoodsRelated.__tablename__, records=records, columns=RELATED_COLUMNS
+        )
+        await self.session.commit()
@@ -0,0 +1,20 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.database import get_session
+from api.src.recommendations.schemas import RelatedGoods, RelatedParams
+from api.src.recommendations.service import RecommendationService
+
+router = APIRouter(prefix="/goods", tags=["recommendations"])
+
+
+@router.get("/{goods_id}/related", response_model=list[RelatedGoods])
+async def list_related_goods(
+    goods_id: int,
+    params: Annotated[RelatedParams, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> list[RelatedGoods]:
+    """Goods most often ordered together with this one, best first."""
+    return await RecommendationService(session).get_related(goods_id, params.limit)
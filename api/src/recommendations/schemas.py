@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+from api.core.config import settings
+
+
+class RelatedParams(BaseModel):
+    limit: int = Field(
+        settings.RECOMMENDATIONS_TOP_K, ge=1, le=settings.RECOMMENDATIONS_TOP_K
+    )
+
+
+class RelatedGoods(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    img: str | None = None
+    price: float
+    score: int = Field(..., description="Orders containing both goods")
+
+
+class RebuildReport(BaseModel):
+    orders: int
+    pairs: int
+    rows: int
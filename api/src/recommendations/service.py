@@ -0,0 +1,63 @@
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.logging import get_logger
+from api.src.recommendations.cooccurrence import CooccurrenceCounter, order_pairs
+from api.src.recommendations.repository import RecommendationRepository
+from api.src.recommendations.schemas import RebuildReport, RelatedGoods
+
+logger = get_logger(__name__)
+
+
+class RecommendationService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = RecommendationRepository(session)
+
+    async def get_related(self, goods_id: int, limit: int) -> list[RelatedGoods]:
+        rows = await self.repository.list_related(goods_id, limit)
+        return [RelatedGoods.model_validate(row) for row in rows]
+
+    async def rebuild(
+        self, batch_size: int, top_k: int, max_items: int
+    ) -> RebuildReport:
+        """Recount co-occurrences over all orders and replace the neighbours.
+
+        Order items are read in ``batch_size`` chunks. The items of the last
+        order in a chunk are held back until the next one, so every order is
+        counted whole.
+
+        Args:
+            batch_size: Order items fetched per round trip
+            top_k: Neighbours kept per goods
+            max_items: Largest order, in distinct goods, that is counted
+
+        Returns:
+            RebuildReport: Orders read, distinct pairs and rows written
+        """
+        counter = CooccurrenceCounter()
+        orders = 0
+        pending = np.empty((0, 2), np.int64)
+        async for rows in self.repository.stream_order_items(batch_size):
+            chunk = np.concatenate((pending, np.array(rows, np.int64).reshape(-1, 2)))
+            last = chunk[-1, 0]
+            complete = chunk[:, 0] != last
+            pending = chunk[~complete]
+            chunk = chunk[complete]
+            orders += len(np.unique(chunk[:, 0]))
+            counter.add(order_pairs(chunk[:, 0], chunk[:, 1], max_items))
+        if len(pending):
+            orders += 1
+            counter.add(order_pairs(pending[:, 0], pending[:, 1], max_items))
+
+        goods, rank, related, score = counter.top_k(top_k)
+        records = list(
+            zip(goods.tolist(), rank.tolist(), related.tolist(), score.tolist())
+        )
+        await self.repository.replace_related(records)
+
+        logger.info(
+            f"Rebuilt recommendations from {orders} orders: "
+            f"{len(counter)} goods pairs, {len(records)} neighbours stored"
+        )
+        return RebuildReport(orders=orders, pairs=len(counter), rows=len(records))
@@ -0,0 +1,54 @@
+from enum import IntEnum
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from api.core.database import Base
+
+
+class ReservationStatus(IntEnum):
+    HELD = 0
+    CONFIRMED = 1
+    RELEASED = 2
+
+
+class StockReservation(Base):
+    """Stock held by a pending order until it is paid or expires."""
+
+    __tablename__ = "stock_reservation"
+    __table_args__ = (
+        # Lets the sweeper find expired held rows without scanning history
+        Index("ix_stock_reservation_status_expires_at", "status", "expires_at"),
+        # A reservation is written in its order's transaction, so both rows
+        # get the same now() as create_time; it completes the order's key
+        ForeignKeyConstraint(
+            ["order_id", "create_time"],
+            ["order_info.id", "order_info.create_time"],
+            name="stock_reservation_order_fkey",
+            ondelete="CASCADE",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    order_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    goods_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("goods.id", ondelete="CASCADE"), nullable=False
+    )
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=ReservationStatus.HELD
+    )
+    expires_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+    create_time: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    order_info: Mapped["OrderInfo"] = relationship("OrderInfo")  # noqa: F821
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.orders.models import OrderInfo
+from api.src.reservations.models import ReservationStatus, StockReservation
+
+# SQLSTATE of a NOWAIT lock request that found the row locked
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class ReservationRepository:
+    """Repository for stock reservation rows."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def hold(self, order: OrderInfo, counts: dict[int, int], ttl: timedelta) -> None:
+        """Add one held reservation per goods of a not yet flushed order.
+
+        The expiry is computed by the database so it shares a clock with the
+        sweeper. Nothing is committed here.
+
+        Args:
+            order: Order the stock is held for
+            counts: Held quantity keyed by goods ID
+            ttl: How long the stock is held
+        """
+        self.session.add_all(
+            [
+                StockReservation(
+                    order_info=order,
+                    goods_id=goods_id,
+                    count=count,
+                    status=ReservationStatus.HELD,
+                    expires_at=func.now() + ttl,
+                )
+                for goods_id, count in counts.items()
+            ]
+        )
+
+    async def hold_many(
+        self, holds: list[tuple[int, dict[int, int]]], ttl: timedelta
+    ) -> None:
+        """Insert the held reservations of many orders with one multi-row INSERT.
+
+        ``now()`` is fixed for the whole transaction, so reading it once gives
+        every row the expiry ``hold`` would. Nothing is committed here.
+
+        Args:
+            holds: ``(order ID, held quantity keyed by goods ID)`` per order
+            ttl: How long the stock is held
+        """
+        expires_at = await self.session.scalar(select(func.now() + ttl))
+        await self.session.execute(
+            insert(StockReservation),
+            [
+                {
+                    "order_id": order_id,
+                    "goods_id": goods_id,
+                    "count": count,
+                    "status": ReservationStatus.HELD,
+                    "expires_at": expires_at,
+                }
+                for order_id, counts in holds
+                for goods_id, count in counts.items()
+            ],
+        )
+
+    async def confirm(self, order_id: int) -> int:
+        """Confirm the unexpired held reservations of an order.
+
+        The caller holds the order row. The sweeper locks reservations
+        before their order, so waiting here for one it holds could deadlock;
+        the held rows are locked with NOWAIT instead, and a row the sweeper
+        holds is expiring anyway, so nothing is confirmed.
+
+        Args:
+            order_id: Order ID
+
+        Returns:
+            int: Number of confirmed reservations, 0 if any is being released
+        """
+        held = (
+            select(StockReservation.id)
+            .where(
+                StockReservation.order_id == order_id,
+                StockReservation.status == ReservationStatus.HELD,
+            )
+            .with_for_update(nowait=True)
+        )
+        try:
+            async with self.session.begin_nested():
+                await self.session.execute(held)
+        except DBAPIError as e:
+            if getattr(e.orig, "sqlstate", None) != LOCK_NOT_AVAILABLE:
+                raise
+            return 0
+
+        query = (
+            update(StockReservation)
+            .where(
+                StockReservation.order_id == order_id,
+                StockReservation.status == ReservationStatus.HELD,
+                StockReservation.expires_at > func.now(),
+            )
+            .values(status=ReservationStatus.CONFIRMED)
+            .returning(StockReservation.id)
+        )
+        result = await self.session.execute(query)
+        return len(result.scalars().all())
+
+    async def release_expired(
+        self, limit: int
+    ) -> list[tuple[int, int, int, datetime]]:
+        """Mark up to ``limit`` expired held reservations as released.
+
+        Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so concurrent sweepers
+        each take a disjoint batch instead of waiting on one another.
+
+        Args:
+            limit: Maximum number of reservations to release
+
+        Returns:
+            list[tuple[int, int, int, datetime]]: ``(order_id, goods_id, count,
+            create_time)`` per row
+        """
+        expired = (
+            select(StockReservation.id)
+            .where(
+                StockReservation.status == ReservationStatus.HELD,
+                StockReservation.expires_at < func.now(),
+            )
+            .order_by(StockReservation.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("expired")
+            .prefix_with("MATERIALIZED")
+        )
+        query = (
+            update(StockReservation)
+            .where(StockReservation.id == expired.c.id)
+            .values(status=ReservationStatus.RELEASED)
+            .returning(
+                StockReservation.order_id,
+                StockReservation.goods_id,
+                StockReservation.count,
+                StockReservation.create_time,
+            )
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.config import settings
+from api.core.logging import get_logger
+from api.src.goods.repository import GoodsRepository
+from api.src.orders.cache import order_list_cache
+from api.src.orders.models import OrderInfo
+from api.src.orders.repository import OrderRepository
+from api.src.reservations.repository import ReservationRepository
+
+logger = get_logger(__name__)
+
+
+class ReservationService:
+    """Holds stock for pending orders and gives it back when they expire."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = ReservationRepository(session)
+        self.goods_repo = GoodsRepository(session)
+        self.order_repo = OrderRepository(session)
+        self.list_cache = order_list_cache
+
+    async def reserve(
+        self,
+        order: OrderInfo,
+        counts: dict[int, int],
+        sharded: frozenset[int] = frozenset(),
+    ) -> None:
+        """Take stock for an order and record the hold.
+
+        Runs in the caller's transaction; the caller commits with the order.
+
+        Raises:
+            InsufficientStockException: If any goods cannot cover its count
+        """
+        await self.goods_repo.commit_stock(counts, sharded)
+        await self.repository.hold(
+            order, counts, timedelta(minutes=settings.RESERVATION_TTL)
+        )
+
+    async def hold_many(self, holds: list[tuple[int, dict[int, int]]]) -> None:
+        """Record holds for orders whose stock the caller already took.
+
+        Runs in the caller's transaction; the caller commits with the orders.
+        """
+        await self.repository.hold_many(
+            holds, timedelta(minutes=settings.RESERVATION_TTL)
+        )
+
+    async def confirm(self, order_id: int) -> bool:
+        """Turn an order's holds into a sale. False if they already expired."""
+        return await self.repository.confirm(order_id) > 0
+
+    async def release_expired(self, batch_size: int) -> int:
+        """Release one batch of expired holds and cancel their orders.
+
+        Returns:
+            int: Number of released reservations
+        """
+        rows = await self.repository.release_expired(batch_size)
+        if not rows:
+            await self.session.rollback()
+            return 0
+
+        counts: dict[int, int] = {}
+        for _, goods_id, count, _ in rows:
+            counts[goods_id] = counts.get(goods_id, 0) + count
+        order_ids = sorted({order_id for order_id, _, _, _ in rows})
+        # A reservation's create_time is its order's
+        created_from = min(create_time for _, _, _, create_time in rows)
+
+        await self.goods_repo.restore_stock(counts)
+        cancelled = await self.order_repo.cancel_pending(order_ids, created_from)
+        await self.session.commit()
+        self.goods_repo.invalidate(counts)
+        await self.list_cache.invalidate({user_id for _, user_id in cancelled})
+
+        logger.info(
+            f"Released {len(rows)} expired reservations of {len(order_ids)} orders"
+        )
+        return len(rows)
@@ -0,0 +1,32 @@
+from api.core.config import settings
+from api.core.database import async_session
+from api.src.reservations.service import ReservationService
+from api.utils.tasks import PeriodicTask
+
+
+async def sweep_expired_reservations() -> int:
+    """Release expired reservations batch by batch until none are left.
+
+    Each batch runs in its own short transaction, so stock is returned
+    progressively and row locks are never held for long.
+
+    Returns:
+        int: Number of released reservations
+    """
+    batch_size = settings.RESERVATION_SWEEP_BATCH_SIZE
+    total = 0
+    while True:
+        async with async_session() as session:
+            released = await ReservationService(session).release_expired(batch_size)
+        total += released
+        if released < batch_size:
+            return total
+
+
+def create_reservation_sweeper() -> PeriodicTask:
+    """Background task releasing expired reservations of this worker."""
+    return PeriodicTask(
+        "reservation-sweeper",
+        sweep_expired_reservations,
+        settings.RESERVATION_SWEEP_INTERVAL,
+    )
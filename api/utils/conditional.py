@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+
+def make_etag(*parts) -> str:
+    """Build a strong entity tag from the parts identifying a representation."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """Check an ``If-None-Match`` header against the current entity tag.
+
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``, so
+    ``W/`` prefixes sent back by proxies still match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp as an HTTP-date (always GMT)."""
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(modified: datetime, if_modified_since: str | None) -> bool:
+    """Check an ``If-Modified-Since`` header against a modification time.
+
+    HTTP-dates have one second resolution, so sub-second parts are ignored.
+    Unparseable dates are treated as absent.
+    """
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return modified.replace(microsecond=0) <= since
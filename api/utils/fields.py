@@ -0,0 +1,55 @@
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+from api.core.exceptions import BadRequestException
+
+
+def parse_fields(
+    raw: str | None, model: type[BaseModel], always: tuple[str, ...] = ("id",)
+) -> frozenset[str] | None:
+    """Parse a comma separated ``fields`` parameter against a response model.
+
+    Args:
+        raw: Value of the query parameter, e.g. ``"id,name,price"``
+        model: Response model the names must belong to
+        always: Fields included whether requested or not
+
+    Returns:
+        frozenset[str] | None: Requested field names, None for the full model
+
+    Raises:
+        BadRequestException: If a name is not a field of ``model``
+    """
+    if not raw:
+        return None
+    names = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = names - model.model_fields.keys()
+    if unknown:
+        raise BadRequestException(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return frozenset(names.union(always))
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    """Build (once per field set) a copy of ``model`` with only ``fields``."""
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in model.model_fields.items()
+        if name in fields
+    }
+    return create_model(
+        f"{model.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+def sparse_dump(model: type[BaseModel], fields: frozenset[str], obj: Any) -> dict:
+    """Serialize ``obj`` through the trimmed model as JSON-ready data.
+
+    Only the attributes in ``fields`` are read, so deferred columns that
+    were not loaded are never touched.
+    """
+    return sparse_model(model, fields).model_validate(obj).model_dump(mode="json")
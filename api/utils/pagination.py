@@ -0,0 +1,27 @@
+import base64
+import binascii
+import json
+
+from api.core.exceptions import BadRequestException
+
+
+def encode_cursor(data: dict) -> str:
+    """Pack keyset position data into an opaque, URL-safe cursor."""
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Unpack a cursor made by ``encode_cursor``.
+
+    Raises:
+        BadRequestException: If the cursor was not produced by this API
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequestException("Invalid cursor")
+    if not isinstance(data, dict):
+        raise BadRequestException("Invalid cursor")
+    return data
@@ -0,0 +1,48 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from api.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    """Run a coroutine function every ``interval`` seconds in the background.
+
+    Errors are logged and the loop keeps going, so a transient database
+    failure does not kill the task for the lifetime of the worker.
+    """
+
+    def __init__(
+        self, name: str, func: Callable[[], Awaitable[object]], interval: float
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the loop on the running event loop. A zero interval disables it."""
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"Started background task {self.name} (every {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Cancel the loop and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.func()
+            except Exception:
+                logger.exception(f"Background task {self.name} failed")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path to ensure imports work
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+
+import api.src  # noqa: F401  (register all models)
+from api.core.config import settings
+from api.core.database import async_session
+from api.src.orders.models import OrderInfo
+from api.src.orders.schemas import OrderInfoResponse, OrderListParams, OrderPage
+from api.src.orders.service import OrderService
+
+
+async def orm_page(user_id: int, params: OrderListParams) -> bytes:
+    """GET /orders as served with ORDERS_JSON_READS off."""
+    async with async_session() as session:
+        page = await OrderService(session).get_user_orders(user_id, params)
+    # FastAPI dumps a returned model, validates the dump against the
+    # response model and serializes that; model_dump_json is the cheap end
+    return OrderPage.model_validate(page.model_dump()).model_dump_json().encode()
+
+
+async def json_page(user_id: int, params: OrderListParams) -> bytes:
+    async with async_session() as session:
+        body = await OrderService(session).get_user_orders_json(user_id, params)
+    return body.encode()
+
+
+async def orm_order(user_id: int, order_id: int) -> bytes:
+    """GET /orders/{id} as served with ORDERS_JSON_READS off."""
+    async with async_session() as session:
+        order = await OrderService(session).get_order_details(user_id, order_id)
+    return OrderInfoResponse.model_validate(order).model_dump_json().encode()
+
+
+async def json_order(user_id: int, order_id: int) -> bytes:
+    async with async_session() as session:
+        body = await OrderService(session).get_order_json(user_id, order_id)
+    return body.encode()
+
+
+async def measure(label: str, read, rounds: int) -> None:
+    await read()  # warm up connections and statement caches
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(rounds):
+        size = len(await read())
+    wall = (time.perf_counter() - wall) / rounds * 1000
+    cpu = (time.process_time() - cpu) / rounds * 1000
+    print(f"{label:<28} {wall:8.2f} ms wall {cpu:8.2f} ms CPU {size:8} bytes")
+
+
+async def main(user_id: int | None, limit: int, rounds: int):
+    async with async_session() as session:
+        if user_id is None:
+            # The user with the most orders
+            user_id = await session.scalar(
+                select(OrderInfo.user_id)
+                .group_by(OrderInfo.user_id)
+                .order_by(func.count().desc())
+                .limit(1)
+            )
+        order_id = await session.scalar(
+            select(func.max(OrderInfo.id)).where(OrderInfo.user_id == user_id)
+        )
+    if order_id is None:
+        print("No orders to read")
+        return
+
+    params = OrderListParams(limit=limit)
+    print(f"User {user_id}, pages of {limit} orders, order {order_id}")
+    reads = {
+        "GET /orders (ORM)": lambda: orm_page(user_id, params),
+        "GET /orders (SQL JSON)": lambda: json_page(user_id, params),
+        "GET /orders/{id} (ORM)": lambda: orm_order(user_id, order_id),
+        "GET /orders/{id} (SQL JSON)": lambda: json_order(user_id, order_id),
+    }
+    for label, read in reads.items():
+        await measure(label, read, rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the ORM and the SQL-built JSON read paths of the "
+        "order endpoints against the configured database. CPU time is this "
+        "process's, i.e. what an API node would spend per request."
+    )
+    parser.add_argument("--user-id", type=int, help="defaults to the busiest user")
+    parser.add_argument("--limit", type=int, default=settings.ORDERS_PAGE_SIZE_MAX)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.user_id, args.limit, args.rounds))
@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Add project root to path to ensure imports work
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api.src  # noqa: F401  (register all models)
+from api.core.config import settings
+from api.core.database import async_session
+from api.src.recommendations.service import RecommendationService
+
+
+async def main(batch_size: int, top_k: int, max_items: int):
+    async with async_session() as session:
+        report = await RecommendationService(session).rebuild(
+            batch_size, top_k, max_items
+        )
+
+    print(
+        f"Orders: {report.orders}, goods pairs: {report.pairs}, "
+        f"neighbours stored: {report.rows}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild 'frequently bought together' recommendations "
+        "from order history. Meant to run periodically, e.g. nightly from cron."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.RECOMMENDATIONS_BATCH_SIZE
+    )
+    parser.add_argument("--top-k", type=int, default=settings.RECOMMENDATIONS_TOP_K)
+    parser.add_argument(
+        "--max-order-items",
+        type=int,
+        default=settings.RECOMMENDATIONS_MAX_ORDER_ITEMS,
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.batch_size, args.top_k, args.max_order_items))
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Add project root to path to ensure imports work
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api.src  # noqa: F401  (register all models)
+from api.core.database import async_session
+from api.src.goods.schemas import FeedFormat
+from api.src.goods.service import GoodsService
+
+READ_SIZE = 1 << 16
+
+
+async def read_file(path: str):
+    """Yield the file in blocks without blocking the event loop."""
+    with open(path, "rb") as f:
+        while block := await asyncio.to_thread(f.read, READ_SIZE):
+            yield block
+
+
+async def main(path: str, fmt: FeedFormat, chunk_size: int | None):
+    async with async_session() as session:
+        report = await GoodsService(session).import_goods(
+            read_file(path), fmt, chunk_size
+        )
+
+    print(
+        f"Rows: {report.total}, inserted: {report.inserted}, "
+        f"updated: {report.updated}, failed: {report.failed}"
+    )
+    for error in report.errors:
+        print(f"  line {error.line}: {error.error}")
+    if report.errors_truncated:
+        print("  (more errors not shown)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk import goods from an NDJSON or CSV file."
+    )
+    parser.add_argument("path")
+    parser.add_argument(
+        "--format",
+        choices=[f.value for f in FeedFormat],
+        help="defaults to the file extension",
+    )
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    asyncio.run(main(args.path, FeedFormat(fmt), args.chunk_size))
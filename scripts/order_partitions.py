@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Add project root to path to ensure imports work
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api.src  # noqa: F401  (register all models)
+from api.core.config import settings
+from api.src.orders.partitions import maintain_partitions
+
+
+async def main(ahead: int, retain: int, drop: bool):
+    created, detached = await maintain_partitions(ahead, retain, drop)
+
+    print(f"Created partitions: {', '.join(f'{m:%Y-%m}' for m in created) or '-'}")
+    action = "Dropped" if drop else "Detached"
+    print(f"{action} partitions: {', '.join(f'{m:%Y-%m}' for m in detached) or '-'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Create the monthly partitions of order_info/order_item "
+        "ahead of time and detach the months past retention. Detached "
+        "partitions remain as order_info_pYYYYMM/order_item_pYYYYMM tables "
+        "to be archived, unless --drop is given."
+    )
+    parser.add_argument(
+        "--ahead", type=int, default=settings.ORDER_PARTITIONS_AHEAD
+    )
+    parser.add_argument(
+        "--retain",
+        type=int,
+        default=settings.ORDER_PARTITIONS_RETAIN,
+        help="months kept attached, the current one included; 0 keeps all",
+    )
+    parser.add_argument("--drop", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.ahead, args.retain, args.drop))
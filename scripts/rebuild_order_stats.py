@@ -0,0 +1,23 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path to ensure imports work
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api.src  # noqa: F401  (register all models)
+from api.core.database import async_session
+from api.src.orders.repository import OrderRepository
+
+
+async def main():
+    async with async_session() as session:
+        users = await OrderRepository(session).rebuild_stats()
+
+    print(f"Rebuilt order counters of {users} users")
+
+
+if __name__ == "__main__":
+    # Repairs user_order_stats after manual data fixes or a suspected drift;
+    # order writes wait while it runs
+    asyncio.run(main())
@@ -81,10 +81,15 @@ async def seed_data():
                 },
             ]
             
+            # One query for every existing good instead of one per name
+            result = await session.execute(
+                select(Goods).where(Goods.name.in_([item["name"] for item in goods_list]))
+            )
+            existing_goods = {good.name: good for good in result.scalars().all()}
+
             created_goods = []
             for item in goods_list:
-                result = await session.execute(select(Goods).where(Goods.name == item["name"]))
-                existing = result.scalar_one_or_none()
+                existing = existing_goods.get(item["name"])
                 if not existing:
                     new_good = Goods(**item)
                     session.add(new_good)
@@ -122,6 +127,7 @@ async def seed_data():
                     # Add items to order
                     item1 = OrderItem(
                         order_id=order.id,
+                        order_create_time=order.create_time,
                         goods_id=good1.id,
                         goods_name=good1.name,
                         goods_price=good1.price,
@@ -130,6 +136,7 @@ async def seed_data():
                     )
                     item2 = OrderItem(
                         order_id=order.id,
+                        order_create_time=order.create_time,
                         goods_id=good2.id,
                         goods_name=good2.name,
                         goods_price=good2.price,
@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Add project root to path to ensure imports work
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api.src  # noqa: F401  (register all models)
+from api.core.database import async_session
+from api.src.goods.service import GoodsService
+
+
+async def main(goods_id: int, shards: int):
+    """Split a goods' stock into shards, or fold it back with --shards 0."""
+    async with async_session() as session:
+        service = GoodsService(session)
+        if shards:
+            good = await service.enable_stock_shards(goods_id, shards)
+            print(f"Goods {good.id} now has its stock split over {shards} shards")
+        else:
+            good = await service.disable_stock_shards(goods_id)
+            print(f"Goods {good.id} is no longer sharded, stock: {good.stock}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Toggle flash-sale stock sharding for a goods."
+    )
+    parser.add_argument("goods_id", type=int)
+    parser.add_argument(
+        "--shards", type=int, default=8, help="number of shards, 0 to disable"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.goods_id, args.shards))
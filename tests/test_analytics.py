@@ -0,0 +1,89 @@
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from api.src.analytics.repository import AnalyticsRepository
+from api.src.analytics.schemas import SalesMetric, SalesWindow
+from api.src.analytics.service import AnalyticsService
+
+
+def compiled(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def analytics_service():
+    service = AnalyticsService(AsyncMock())
+    service.repository = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_roll_up_folds_batch_and_moves_watermark(analytics_service):
+    analytics_service.repository.lock_watermark.return_value = 100
+    analytics_service.repository.next_batch_end.return_value = 250
+
+    assert await analytics_service.roll_up(batch_size=500) == 250
+
+    analytics_service.repository.fold_orders.assert_awaited_once_with(100, 250, "UTC")
+    analytics_service.repository.set_watermark.assert_awaited_once_with("sales", 250)
+    analytics_service.session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_roll_up_skips_when_another_worker_holds_the_lock(analytics_service):
+    analytics_service.repository.lock_watermark.return_value = None
+
+    assert await analytics_service.roll_up(batch_size=500) == 0
+
+    analytics_service.repository.fold_orders.assert_not_called()
+    analytics_service.session.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_roll_up_does_nothing_until_orders_settle(analytics_service):
+    analytics_service.repository.lock_watermark.return_value = 100
+    analytics_service.repository.next_batch_end.return_value = None
+
+    assert await analytics_service.roll_up(batch_size=500) == 0
+
+    analytics_service.repository.fold_orders.assert_not_called()
+    analytics_service.repository.set_watermark.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fold_orders_upserts_paid_orders_only():
+    session = AsyncMock()
+    await AnalyticsRepository(session).fold_orders(100, 250, "UTC")
+
+    goods_sql, users_sql = (
+        compiled(call.args[0]) for call in session.execute.await_args_list
+    )
+    assert goods_sql.startswith("INSERT INTO sales_goods_daily")
+    assert "ON CONFLICT (day, goods_id) DO UPDATE" in goods_sql
+    assert "units = (sales_goods_daily.units + excluded.units)" in goods_sql
+    assert "order_info.status = " in goods_sql
+    assert users_sql.startswith("INSERT INTO sales_user_daily")
+
+
+@pytest.mark.asyncio
+async def test_top_sellers_rank_on_the_rollup():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    await AnalyticsRepository(session).top_sellers(
+        date(2026, 1, 1), date(2026, 1, 31), SalesMetric.UNITS, 10
+    )
+
+    sql = compiled(session.execute.await_args.args[0])
+    assert "FROM sales_goods_daily" in sql
+    assert "order_item" not in sql
+    assert "ORDER BY units DESC" in sql
+
+
+def test_sales_window_is_validated():
+    with pytest.raises(ValidationError):
+        SalesWindow(start=date(2026, 2, 1), end=date(2026, 1, 1))
+    with pytest.raises(ValidationError):
+        SalesWindow(start=date(2024, 1, 1), end=date(2026, 1, 1))
@@ -0,0 +1,56 @@
+from api.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_set_counts_hits_and_misses():
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=30, timer=clock)
+    cache.set("a", 1)
+
+    clock.now = 29
+    assert cache.get("a") == 1
+    clock.now = 30
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_delete_and_disabled_cache():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+
+    disabled = TTLCache(maxsize=0, ttl=60)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
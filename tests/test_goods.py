@@ -0,0 +1,443 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+
+from api.core.exceptions import BadRequestException, NotFoundException
+from api.src.goods.events import (
+    GOODS_CHANNEL,
+    NOTIFY_BATCH_SIZE,
+    GoodsEventHub,
+    notify_goods_changed,
+)
+from api.src.goods.repository import GoodsRepository, goods_cache, prefix_tsquery
+from api.src.goods.service import GoodsService
+from api.src.goods.schemas import (
+    GoodsChangesParams,
+    GoodsListParams,
+    GoodsResponse,
+    GoodsSearchMode,
+    GoodsSearchParams,
+    GoodsSnapshot,
+    GoodsSort,
+)
+from api.utils.fields import parse_fields, sparse_dump
+from api.utils.conditional import etag_matches, http_date, make_etag, not_modified_since
+from api.utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture(autouse=True)
+def clear_goods_cache():
+    goods_cache.clear()
+    yield
+    goods_cache.clear()
+
+
+@pytest.fixture
+def mock_session():
+    session = AsyncMock()
+    session.add = MagicMock()
+    return session
+
+
+def make_good(**overrides):
+    data = {
+        "id": 1,
+        "name": "Test Good",
+        "title": None,
+        "img": None,
+        "detail": "A long description",
+        "price": 10.0,
+        "stock": 5,
+        "version": 3,
+        "updated_at": datetime(2026, 10, 18, 12, 0, 0, 500000, tzinfo=timezone.utc),
+    }
+    data.update(overrides)
+    good = MagicMock()
+    for key, value in data.items():
+        setattr(good, key, value)
+    return good
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot_reads_through_cache(mock_session):
+    mock_session.get.return_value = make_good()
+    repo = GoodsRepository(mock_session)
+
+    first = await repo.get_snapshot(1)
+    second = await repo.get_snapshot(1)
+
+    assert isinstance(first, GoodsSnapshot)
+    assert second is first
+    mock_session.get.assert_awaited_once()
+    assert goods_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_invalidate_snapshot(mock_session):
+    mock_session.get.return_value = make_good()
+    mock_session.execute.return_value = MagicMock(rowcount=1)
+    repo = GoodsRepository(mock_session)
+
+    await repo.get_snapshot(1)
+    await repo.update(1, MagicMock(model_dump=lambda **_: {"price": 12.0}))
+    assert goods_cache.get(1) is None
+
+    await repo.get_snapshot(1)
+    await repo.delete(1)
+    assert goods_cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_update_bumps_version(mock_session):
+    mock_session.execute.return_value = MagicMock(rowcount=1)
+    repo = GoodsRepository(mock_session)
+
+    await repo.update(1, MagicMock(model_dump=lambda **_: {"price": 12.0}))
+
+    sql = compiled(mock_session.execute.await_args.args[0])
+    assert "version=(goods.version +" in sql
+    assert "updated_at=now()" in sql
+
+
+@pytest.mark.asyncio
+async def test_get_version_prefers_cached_snapshot(mock_session):
+    mock_session.get.return_value = make_good()
+    repo = GoodsRepository(mock_session)
+    await repo.get_snapshot(1)
+
+    assert await repo.get_version(1) == (3, make_good().updated_at)
+    mock_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_version_skips_detail_column(mock_session):
+    result = MagicMock()
+    result.one_or_none.return_value = MagicMock(version=3, updated_at=None)
+    mock_session.execute.return_value = result
+    repo = GoodsRepository(mock_session)
+
+    assert (await repo.get_version(1))[0] == 3
+    sql = compiled(mock_session.execute.await_args.args[0])
+    assert "detail" not in sql
+
+    result.one_or_none.return_value = None
+    with pytest.raises(NotFoundException):
+        await repo.get_version(2)
+
+
+def test_etag_matching():
+    etag = make_etag(1, 3)
+    assert etag == '"1-3"'
+    assert etag_matches(etag, '"1-2", W/"1-3"')
+    assert etag_matches(etag, "*")
+    assert not etag_matches(etag, '"1-2"')
+    assert not etag_matches(etag, None)
+
+
+def test_not_modified_since_ignores_subseconds():
+    modified = make_good().updated_at
+    header = http_date(modified)
+    assert header == "Sun, 18 Oct 2026 12:00:00 GMT"
+    assert not_modified_since(modified, header)
+    assert not not_modified_since(modified, "Sun, 18 Oct 2026 11:59:59 GMT")
+    assert not not_modified_since(modified, "garbage")
+
+
+@pytest.mark.asyncio
+async def test_stock_change_is_invalidated_after_commit(mock_session):
+    mock_session.get.return_value = make_good()
+    result = MagicMock()
+    result.all.return_value = [make_good(stock=3)]
+    mock_session.execute.return_value = result
+    repo = GoodsRepository(mock_session)
+
+    await repo.get_snapshot(1)
+    await repo.commit_stock({1: 2})
+
+    # Not before the caller commits, or a concurrent read re-caches the old row
+    assert goods_cache.get(1) is not None
+    repo.invalidate([1])
+    assert goods_cache.get(1) is None
+    notify = compiled(mock_session.execute.await_args_list[-1].args[0])
+    assert "pg_notify" in notify
+
+
+def compiled(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_shard_sale_refreshes_mirrored_stock(mock_session):
+    taken, refreshed = MagicMock(), MagicMock()
+    taken.scalar_one_or_none.return_value = 0
+    refreshed.all.return_value = [make_good(stock=41, version=4)]
+    mock_session.execute.side_effect = [taken, refreshed, MagicMock()]
+    repo = GoodsRepository(mock_session)
+
+    await repo.take_from_shards({1: 1})
+
+    sync, notify = (
+        compiled(call.args[0]) for call in mock_session.execute.await_args_list[1:]
+    )
+    # Readers see the shard sum, bumped like any stock change, without
+    # queueing sales on the goods row
+    assert "sum(goods_stock_shard.stock)" in sync
+    assert "FOR UPDATE SKIP LOCKED" in sync
+    assert "version=(goods.version + " in sync
+    assert "pg_notify" in notify
+
+
+@pytest.mark.asyncio
+async def test_resharding_keeps_the_mirrored_stock(mock_session):
+    good = make_good(stock=10, stock_shards=2)
+    locked, popped = MagicMock(), MagicMock()
+    locked.scalar_one_or_none.return_value = good
+    popped.scalars.return_value.all.return_value = [6, 4]
+    mock_session.execute.side_effect = [locked, popped, MagicMock()]
+
+    await GoodsRepository(mock_session).enable_stock_shards(1, 3)
+
+    shards = mock_session.execute.await_args_list[2].args[1]
+    assert [shard["stock"] for shard in shards] == [4, 3, 3]
+    assert (good.stock, good.stock_shards) == (10, 3)
+
+
+def page_result(goods):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = goods
+    return result
+
+
+@pytest.mark.asyncio
+async def test_list_page_returns_cursor_when_more_rows(mock_session):
+    goods = [make_good(id=i, price=float(i)) for i in range(1, 4)]
+    mock_session.execute.return_value = page_result(goods)
+    repo = GoodsRepository(mock_session)
+
+    page, next_cursor = await repo.list_page(
+        GoodsListParams(sort=GoodsSort.PRICE, limit=2)
+    )
+
+    assert [good.id for good in page] == [1, 2]
+    assert decode_cursor(next_cursor) == {"s": "price", "k": ["2.0", 2]}
+    query = mock_session.execute.call_args.args[0]
+    assert "ORDER BY goods.price ASC, goods.id ASC" in compiled(query)
+    assert "OFFSET" not in compiled(query)
+
+
+@pytest.mark.asyncio
+async def test_list_page_loads_only_requested_fields(mock_session):
+    mock_session.execute.return_value = page_result([make_good()])
+    repo = GoodsRepository(mock_session)
+    fields = parse_fields("name", GoodsResponse)
+
+    await repo.list_page(GoodsListParams(sort=GoodsSort.PRICE), fields)
+
+    sql = compiled(mock_session.execute.call_args.args[0])
+    select_list = sql.split(" FROM ")[0]
+    assert "goods.name" in select_list
+    # The sort key is needed for the cursor even when not requested
+    assert "goods.price" in select_list
+    assert "goods.detail" not in select_list
+    assert "goods.img" not in select_list
+
+
+def test_sparse_fields_trim_response():
+    fields = parse_fields(" name, price ", GoodsResponse)
+    assert fields == {"id", "name", "price"}
+    assert parse_fields("", GoodsResponse) is None
+
+    good = make_good()
+    assert sparse_dump(GoodsResponse, fields, good) == {
+        "id": 1, "name": "Test Good", "price": 10.0
+    }
+
+    with pytest.raises(BadRequestException):
+        parse_fields("name,secret", GoodsResponse)
+
+
+@pytest.mark.asyncio
+async def test_list_page_seeks_past_cursor(mock_session):
+    mock_session.execute.return_value = page_result([make_good(id=3)])
+    repo = GoodsRepository(mock_session)
+    cursor = encode_cursor({"s": "-price", "k": ["2.00", 2]})
+
+    page, next_cursor = await repo.list_page(
+        GoodsListParams(sort=GoodsSort.PRICE_DESC, cursor=cursor, in_stock=True)
+    )
+
+    assert next_cursor is None
+    sql = compiled(mock_session.execute.call_args.args[0])
+    assert "(goods.price, goods.id) < (%(param_1)s, %(param_2)s)" in sql
+    assert "goods.stock > " in sql
+
+
+@pytest.mark.asyncio
+async def test_list_page_rejects_foreign_cursor(mock_session):
+    repo = GoodsRepository(mock_session)
+
+    with pytest.raises(BadRequestException):
+        await repo.list_page(
+            GoodsListParams(sort=GoodsSort.ID, cursor=encode_cursor({"s": "price"}))
+        )
+    with pytest.raises(BadRequestException):
+        await repo.list_page(GoodsListParams(cursor="not a cursor!"))
+    mock_session.execute.assert_not_called()
+
+
+def search_result(hits):
+    result = MagicMock()
+    result.all.return_value = hits
+    return result
+
+
+def test_prefix_tsquery_strips_operators():
+    assert prefix_tsquery("iPh") == "iph:*"
+    assert prefix_tsquery("mac & !book':*") == "mac:* & book:*"
+    assert prefix_tsquery("&|!") == ""
+
+
+@pytest.mark.asyncio
+async def test_search_short_query_uses_prefix_mode(mock_session):
+    mock_session.execute.return_value = search_result([])
+    repo = GoodsRepository(mock_session)
+
+    _, _, mode = await repo.search(GoodsSearchParams(q="ip"))
+
+    assert mode == GoodsSearchMode.PREFIX
+    sql = compiled(mock_session.execute.call_args.args[0])
+    assert "to_tsquery('simple'" in sql
+    assert "ts_headline" in sql
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_to_trigram(mock_session):
+    hit = MagicMock(id=7, score=0.5)
+    mock_session.execute.side_effect = [search_result([]), search_result([hit])]
+    repo = GoodsRepository(mock_session)
+
+    hits, next_cursor, mode = await repo.search(GoodsSearchParams(q="iphnoe"))
+
+    assert mode == GoodsSearchMode.TRIGRAM
+    assert hits == [hit]
+    assert next_cursor is None
+    assert "similarity(goods.name" in compiled(mock_session.execute.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_search_cursor_keeps_mode(mock_session):
+    hits = [MagicMock(id=9, score=0.8), MagicMock(id=4, score=0.8)]
+    mock_session.execute.return_value = search_result(hits)
+    repo = GoodsRepository(mock_session)
+
+    _, next_cursor, _ = await repo.search(GoodsSearchParams(q="iphone", limit=1))
+    assert decode_cursor(next_cursor) == {"m": "fts", "k": [0.8, 9]}
+
+    mock_session.execute.return_value = search_result([])
+    _, _, mode = await repo.search(
+        GoodsSearchParams(q="iphone", cursor=next_cursor, limit=1)
+    )
+    assert mode == GoodsSearchMode.FTS
+    assert "(ts_rank_cd(goods.search_vector" in compiled(
+        mock_session.execute.call_args.args[0]
+    )
+
+
+def changes_results(goods, tombstones):
+    changed = MagicMock()
+    changed.scalars.return_value.all.return_value = goods
+    deleted = MagicMock()
+    deleted.all.return_value = tombstones
+    return [changed, deleted]
+
+
+@pytest.mark.asyncio
+async def test_list_changes_merges_tombstones_in_order(mock_session):
+    mock_session.scalar.return_value = 200
+    mock_session.execute.side_effect = changes_results(
+        [make_good(id=1, change_xid=100), make_good(id=2, change_xid=150)],
+        [(120, 7)],
+    )
+    repo = GoodsRepository(mock_session)
+
+    changed, deleted, position, has_more = await repo.list_changes((90, 5), 2)
+
+    assert [good.id for good in changed] == [1]
+    assert deleted == [7]
+    assert position == (120, 7)
+    assert has_more
+    sql = compiled(mock_session.execute.await_args_list[0].args[0])
+    assert "goods.change_xid < " in sql
+
+
+@pytest.mark.asyncio
+async def test_list_changes_resumes_from_horizon(mock_session):
+    mock_session.scalar.return_value = 200
+    mock_session.execute.side_effect = changes_results([make_good(change_xid=100)], [])
+    repo = GoodsRepository(mock_session)
+
+    changed, _, position, has_more = await repo.list_changes((0, -1), 10)
+
+    assert len(changed) == 1
+    assert position == (200, -1)
+    assert not has_more
+
+
+@pytest.mark.asyncio
+async def test_delete_leaves_tombstone(mock_session):
+    mock_session.execute.return_value = MagicMock(rowcount=1)
+    repo = GoodsRepository(mock_session)
+
+    await repo.delete(7)
+
+    sql = compiled(mock_session.execute.await_args_list[1].args[0])
+    assert sql.startswith("INSERT INTO goods_tombstone")
+    assert "ON CONFLICT (goods_id) DO UPDATE" in sql
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_changes_token_round_trip(mock_session):
+    service = GoodsService(mock_session)
+    service.repository = AsyncMock()
+    service.repository.list_changes.return_value = ([], [3], (200, -1), False)
+
+    page = await service.list_changes(GoodsChangesParams())
+    service.repository.list_changes.assert_awaited_with((0, -1), 1000)
+
+    await service.list_changes(GoodsChangesParams(since=page.next_token))
+    service.repository.list_changes.assert_awaited_with((200, -1), 1000)
+
+    with pytest.raises(BadRequestException):
+        await service.list_changes(
+            GoodsChangesParams(since=encode_cursor({"x": "a", "i": 1}))
+        )
+
+
+@pytest.mark.asyncio
+async def test_event_hub_filters_and_drops_slow_consumers():
+    hub = GoodsEventHub(queue_size=2)
+    follower = hub.subscribe([1])
+    bystander = hub.subscribe([2])
+
+    hub._on_notify(None, 0, GOODS_CHANNEL, json.dumps([{"id": 1, "stock": 4}]))
+    assert follower.queue.get_nowait() == {"id": 1, "stock": 4}
+    assert bystander.queue.empty()
+
+    hub.publish([{"id": 1, "stock": n} for n in range(3)])
+    assert follower.dropped
+    assert follower.queue.get_nowait() is None
+    hub.publish([{"id": 1, "stock": 0}])
+    assert follower.queue.empty()
+    assert not bystander.dropped
+
+
+@pytest.mark.asyncio
+async def test_notify_batches_payloads(mock_session):
+    rows = [make_good(id=i) for i in range(1, NOTIFY_BATCH_SIZE + 2)]
+
+    await notify_goods_changed(mock_session, rows)
+
+    assert mock_session.execute.await_count == 2
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+from decimal import Decimal
+from types import SimpleNamespace
+
+from api.core.exceptions import BadRequestException
+from api.src.goods import catalog as catalog_module
+from api.src.goods.catalog import CatalogSnapshot
+from api.src.goods.schemas import GoodsListParams, GoodsSort
+from api.utils.pagination import decode_cursor
+
+FIELDS = frozenset({"id", "name", "price", "stock"})
+
+
+def row(id, price, stock=1, name=None, stock_shards=0):
+    return SimpleNamespace(
+        id=id,
+        name=name or f"good {id}",
+        price=Decimal(price),
+        stock=stock,
+        stock_shards=stock_shards,
+    )
+
+
+@pytest.fixture
+def catalog():
+    snapshot = CatalogSnapshot()
+    rows = [row(i, f"{(i * 7) % 5}.50", stock=i % 3) for i in range(1, 21)]
+    snapshot.load([rows[:8], rows[8:]], (100, -1))
+    return snapshot
+
+
+def pages(catalog, **params):
+    items, cursor = [], None
+    while True:
+        page = catalog.query(GoodsListParams(cursor=cursor, **params), FIELDS)
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_price_pages_match_full_sort(catalog):
+    items = pages(catalog, sort=GoodsSort.PRICE, limit=3)
+
+    expected = sorted(((i * 7) % 5 + 0.5, i) for i in range(1, 21))
+    assert [(item["price"], item["id"]) for item in items] == expected
+
+
+def test_descending_filters_and_cursor_format(catalog):
+    page = catalog.query(
+        GoodsListParams(
+            sort=GoodsSort.PRICE_DESC, limit=2, in_stock=True, max_price=3.5
+        ),
+        frozenset({"id", "price"}),
+    )
+
+    assert page["items"] == [{"id": 19, "price": 3.5}, {"id": 14, "price": 3.5}]
+    # Same cursor format as GoodsRepository.list_page, so the paths interoperate
+    assert decode_cursor(page["next_cursor"]) == {"s": "-price", "k": ["3.50", 14]}
+
+    rest = pages(catalog, sort=GoodsSort.ID_DESC, in_stock=True, min_price=1)
+    assert [item["id"] for item in rest] == [
+        i for i in range(20, 0, -1) if i % 3 and (i * 7) % 5 >= 1
+    ]
+
+
+def test_apply_changes_updates_inserts_and_deletes(catalog):
+    catalog.apply(
+        [row(3, "0.10", name="renamed"), row(25, "9.99", stock=4)], [1, 2], (150, 7)
+    )
+
+    items = pages(catalog, sort=GoodsSort.ID, limit=50)
+    assert [item["id"] for item in items] == list(range(3, 21)) + [25]
+    assert items[0] == {"id": 3, "name": "renamed", "price": 0.1, "stock": 1}
+    assert items[-1]["price"] == 9.99
+    assert catalog.position == (150, 7)
+    assert catalog.is_fresh(60)
+
+
+def test_freshness_waits_for_the_feed_to_reach_the_frontier(catalog):
+    catalog.refreshed_at = time.monotonic() - 100
+    checked = time.monotonic() - 30
+    catalog.checkpoint(200, checked)
+
+    # Held back behind an open transaction: no progress, no freshness
+    catalog.apply([], [], (150, 7))
+    assert not catalog.is_fresh(60)
+
+    catalog.apply([], [], (200, 1))
+    assert catalog.refreshed_at == checked
+    assert catalog.is_fresh(60)
+
+
+def test_unused_names_are_compacted(catalog, monkeypatch):
+    monkeypatch.setattr(catalog_module, "NAME_SLACK", 4)
+    for i in range(10):
+        catalog.apply([row(3, "0.10", name=f"name {i}")], [], (150 + i, 1))
+    catalog.apply([], [1, 2], (170, 1))
+
+    assert len(catalog.names) == len(catalog.ids)
+    items = pages(catalog, sort=GoodsSort.ID, limit=50)
+    assert items[0]["name"] == "name 9"
+    assert [item["name"] for item in items[1:]] == [
+        f"good {i}" for i in range(4, 21)
+    ]
+
+
+def test_foreign_cursor_is_rejected(catalog):
+    page = catalog.query(GoodsListParams(sort=GoodsSort.ID, limit=1), FIELDS)
+
+    with pytest.raises(BadRequestException):
+        catalog.query(
+            GoodsListParams(sort=GoodsSort.PRICE, cursor=page["next_cursor"]), FIELDS
+        )
@@ -0,0 +1,70 @@
+import gzip
+import json
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import pytest
+
+from api.src.goods import export
+from api.src.goods.schemas import FeedFormat, GoodsFilter
+
+GoodsRow = namedtuple("GoodsRow", export.EXPORT_COLUMNS)
+
+
+def make_row(goods_id, name="Test Good", detail=None):
+    return GoodsRow(goods_id, name, None, None, detail, Decimal("9.90"), 3)
+
+
+@pytest.fixture
+def streamed(monkeypatch):
+    batches = [[make_row(1), make_row(2, detail='says "hi",\nbye')], [make_row(3)]]
+    seen = {}
+
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    async def fake_stream_rows(self, filters, batch_size):
+        seen["filters"] = filters
+        for rows in batches:
+            yield rows
+
+    monkeypatch.setattr(export, "async_session", fake_session)
+    monkeypatch.setattr(export.GoodsRepository, "stream_rows", fake_stream_rows)
+    return seen
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+def test_encode_ndjson_one_object_per_line():
+    lines = export.encode_ndjson([make_row(1), make_row(2)]).decode().splitlines()
+
+    assert [json.loads(line)["id"] for line in lines] == [1, 2]
+    assert json.loads(lines[0])["price"] == 9.9
+
+
+@pytest.mark.asyncio
+async def test_export_csv_streams_batches_after_header(streamed):
+    filters = GoodsFilter(in_stock=True)
+
+    body = await collect(export.export_goods(filters, FeedFormat.CSV))
+
+    lines = body.decode().split("\r\n")
+    assert lines[0] == "id,name,title,img,detail,price,stock"
+    assert lines[1] == "1,Test Good,,,,9.90,3"
+    assert lines[-2] == "3,Test Good,,,,9.90,3"
+    assert streamed["filters"] is filters
+
+
+@pytest.mark.asyncio
+async def test_export_gzip_round_trips(streamed):
+    plain = await collect(export.export_goods(GoodsFilter(), FeedFormat.NDJSON))
+    compressed = await collect(
+        export.export_goods(GoodsFilter(), FeedFormat.NDJSON, gzip=True)
+    )
+
+    assert gzip.decompress(compressed) == plain
+    assert len(plain.splitlines()) == 3
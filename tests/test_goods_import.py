@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import AsyncMock
+from sqlalchemy.exc import DBAPIError
+
+from api.src.goods.importer import GoodsImporter, iter_records
+from api.src.goods.repository import GoodsRepository
+from api.src.goods.schemas import FeedFormat
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(chunks, fmt):
+    return [record async for record in iter_records(chunks, fmt)]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_records_across_chunk_boundaries():
+    records = await collect(
+        stream(b'{"name": "a", "pri', b'ce": 1}\n\nnot json\n[1]\n{"name": "b", "price": 2}'),
+        FeedFormat.NDJSON,
+    )
+
+    assert records[0] == (1, {"name": "a", "price": 1})
+    assert records[1][0] == 3 and records[1][1].startswith("Invalid JSON")
+    assert records[2] == (4, "Expected a JSON object")
+    assert records[3] == (5, {"name": "b", "price": 2})
+
+
+@pytest.mark.asyncio
+async def test_csv_records_with_header_and_quoted_newlines():
+    body = (
+        "﻿name,price,stock,detail\r\n"
+        'iPhone,999.00,10,"line one\nline two"\r\n'
+        "AirPods,249.00,,\r\n"
+        "broken,1\r\n"
+    ).encode()
+
+    records = await collect(stream(body), FeedFormat.CSV)
+
+    assert records == [
+        (2, {"name": "iPhone", "price": "999.00", "stock": "10", "detail": "line one\nline two"}),
+        (4, {"name": "AirPods", "price": "249.00"}),
+        (5, "Expected 4 columns, got 2"),
+    ]
+
+
+@pytest.fixture
+def mock_session():
+    return AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_importer_loads_in_chunks_and_reports_bad_rows(mock_session):
+    importer = GoodsImporter(mock_session, chunk_size=2)
+    importer.repository = AsyncMock(spec=GoodsRepository)
+    importer.repository.bulk_upsert.side_effect = [(1, 1), (1, 0)]
+    body = (
+        b'{"name": "a", "price": 1}\n'
+        b'{"name": "b", "price": -5}\n'
+        b'{"name": "c", "price": 2, "stock": 3}\n'
+        b'{"name": "d", "price": 4}\n'
+    )
+
+    report = await importer.run(stream(body), FeedFormat.NDJSON)
+
+    assert (report.total, report.inserted, report.updated, report.failed) == (4, 2, 1, 1)
+    assert report.errors[0].line == 2
+    assert "price" in report.errors[0].error
+    chunks = [call.args[0] for call in importer.repository.bulk_upsert.call_args_list]
+    assert [[line for line, _ in chunk] for chunk in chunks] == [[1, 3], [4]]
+    assert mock_session.commit.await_count == 2
+    assert importer.repository.invalidate_all.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_importer_keeps_going_after_failed_chunk(mock_session):
+    importer = GoodsImporter(mock_session, chunk_size=1)
+    importer.repository = AsyncMock(spec=GoodsRepository)
+    importer.repository.bulk_upsert.side_effect = [
+        DBAPIError("COPY", None, Exception("boom")),
+        (1, 0),
+    ]
+    body = b'{"name": "a", "price": 1}\n{"name": "b", "price": 2}\n'
+
+    report = await importer.run(stream(body), FeedFormat.NDJSON)
+
+    assert report.inserted == 1
+    assert report.failed == 1
+    assert report.errors[0].line == 1
+    mock_session.rollback.assert_awaited_once()
+    importer.repository.invalidate_all.assert_called_once()
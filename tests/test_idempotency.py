@@ -0,0 +1,157 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from api.core.exceptions import AlreadyExistsException, IdempotencyKeyReusedException
+from api.src.idempotency.repository import IdempotencyRepository, idempotency_cache
+from api.src.idempotency.schemas import StoredResponse
+from api.src.idempotency.service import IdempotencyService, request_fingerprint
+from api.src.orders.schemas import OrderCreate, OrderItemCreate
+from api.src.orders.service import OrderService
+
+STORED = StoredResponse(fingerprint="abc", status_code=201, body='{"id": 7}')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    idempotency_cache.clear()
+    yield
+    idempotency_cache.clear()
+
+
+@pytest.fixture
+def service():
+    service = IdempotencyService(AsyncMock())
+    service.repository = AsyncMock()
+    service.repository.get_cached = MagicMock(return_value=None)
+    return service
+
+
+def test_fingerprint_ignores_json_formatting():
+    first = OrderCreate.model_validate_json(
+        '{"delivery_addr_id": 1, "items": [{"goods_id": 2, "count": 3}]}'
+    )
+    second = OrderCreate.model_validate_json(
+        '{"items":[{"count":3,"goods_id":2}],"delivery_addr_id":1}'
+    )
+    other = OrderCreate(delivery_addr_id=1, items=[OrderItemCreate(goods_id=2, count=4)])
+
+    assert request_fingerprint("POST /orders", first) == request_fingerprint(
+        "POST /orders", second
+    )
+    assert request_fingerprint("POST /orders", first) != request_fingerprint(
+        "POST /orders", other
+    )
+
+
+@pytest.mark.asyncio
+async def test_begin_claims_a_new_key(service):
+    service.repository.claim.return_value = True
+
+    assert await service.begin(1, "k", "abc") is None
+    service.repository.get.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_begin_replays_a_completed_key(service):
+    service.repository.claim.return_value = False
+    service.repository.get.return_value = STORED
+
+    assert await service.begin(1, "k", "abc") is STORED
+
+
+@pytest.mark.asyncio
+async def test_begin_serves_cache_hits_without_the_database(service):
+    service.repository.get_cached.return_value = STORED
+
+    assert await service.begin(1, "k", "abc") is STORED
+    service.repository.claim.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_begin_rejects_a_reused_key(service):
+    service.repository.get_cached.return_value = STORED
+
+    with pytest.raises(IdempotencyKeyReusedException):
+        await service.begin(1, "k", "other")
+
+
+@pytest.mark.asyncio
+async def test_begin_reports_a_key_without_response(service):
+    service.repository.claim.return_value = False
+    service.repository.get.return_value = None
+
+    with pytest.raises(AlreadyExistsException):
+        await service.begin(1, "k", "abc")
+
+
+@pytest.mark.asyncio
+async def test_claim_only_takes_over_expired_keys():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    await IdempotencyRepository(session).claim(1, "k", "abc", timedelta(hours=1))
+
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (user_id, key) DO UPDATE" in sql
+    assert "WHERE idempotency_key.expires_at <= now()" in sql
+    assert "RETURNING idempotency_key.key" in sql
+
+
+@pytest.mark.asyncio
+async def test_get_caches_completed_responses():
+    session = AsyncMock()
+    result = MagicMock()
+    result.one_or_none.return_value = MagicMock(
+        fingerprint="abc", status_code=201, response_body='{"id": 7}'
+    )
+    session.execute.return_value = result
+    repository = IdempotencyRepository(session)
+
+    assert await repository.get(1, "k") == STORED
+    assert await repository.get(1, "k") == STORED
+    session.execute.assert_awaited_once()
+
+
+@pytest.fixture
+def order_service():
+    service = OrderService(AsyncMock())
+    service.idempotency = AsyncMock()
+    service._place_order = AsyncMock()
+    return service
+
+
+ORDER = OrderCreate(delivery_addr_id=1, items=[OrderItemCreate(goods_id=2, count=3)])
+
+
+@pytest.mark.asyncio
+async def test_create_order_once_replays_without_placing(order_service):
+    order_service.idempotency.begin.return_value = STORED
+
+    assert await order_service.create_order_once(1, ORDER, "k") == (STORED, True)
+    order_service._place_order.assert_not_awaited()
+    order_service.session.rollback.assert_awaited_once()
+    order_service.session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_order_once_stores_the_response_before_commit(order_service):
+    order_service.idempotency.begin.return_value = None
+    order = MagicMock(
+        id=7, user_id=1, delivery_addr_id=1, total_amount=9.0, status=0, items=[]
+    )
+    order.created_at = None
+    order_service._place_order.return_value = order
+    calls = []
+    order_service.idempotency.finish.side_effect = lambda *a: calls.append("finish")
+    order_service.session.commit.side_effect = lambda: calls.append("commit")
+
+    stored, replayed = await order_service.create_order_once(1, ORDER, "k")
+
+    assert not replayed
+    assert stored.status_code == 201
+    assert stored.fingerprint == request_fingerprint("POST /orders", ORDER)
+    assert '"id":7' in stored.body
+    order_service.idempotency.finish.assert_awaited_once_with(1, "k", stored)
+    assert calls == ["finish", "commit"]
@@ -0,0 +1,160 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+
+from api.src.goods.models import Goods
+from api.src.goods.repository import GoodsRepository
+from api.src.orders import batcher as batcher_module
+from api.src.orders import routes as order_routes
+from api.src.orders.batcher import OrderBatcher
+from api.src.orders.models import OrderInfo
+from api.src.orders.schemas import OrderCreate, OrderItemCreate
+from api.src.orders.service import OrderService
+
+
+def cart(goods_id=1, count=1):
+    return OrderCreate(
+        delivery_addr_id=1, items=[OrderItemCreate(goods_id=goods_id, count=count)]
+    )
+
+
+def good(goods_id, stock):
+    goods = MagicMock(spec=Goods)
+    goods.id = goods_id
+    goods.name = f"Good {goods_id}"
+    goods.price = 10.0
+    goods.stock = stock
+    goods.stock_shards = 0
+    return goods
+
+
+@pytest.fixture
+def order_service():
+    service = OrderService(AsyncMock())
+    service.goods_repo = AsyncMock(spec=GoodsRepository)
+    service.order_repo = AsyncMock()
+    service.reservations = AsyncMock()
+    service.outbox = MagicMock()
+    service.list_cache = AsyncMock()
+    return service
+
+
+@pytest.fixture
+def group_service(monkeypatch):
+    """The OrderService every group and fallback of the batcher gets."""
+    service = AsyncMock()
+    monkeypatch.setattr(batcher_module, "async_session", MagicMock())
+    monkeypatch.setattr(batcher_module, "OrderService", lambda session: service)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_group_shares_one_commit(order_service):
+    order_service.goods_repo.get_many.return_value = {1: good(1, 3)}
+    order_service.goods_repo.lock_stock.return_value = {1: 3}
+    placed = [OrderInfo(id=501), OrderInfo(id=502)]
+    order_service.order_repo.create_many.return_value = placed
+
+    outcomes = await order_service.create_order_group(
+        [(8, cart(count=2)), (7, cart(count=2)), (7, cart()), (9, cart(goods_id=99))]
+    )
+
+    rows, _ = order_service.order_repo.create_many.call_args.args
+    assert [row["user_id"] for row in rows] == [8, 7]
+    order_service.goods_repo.commit_stock.assert_awaited_once_with({1: 3})
+    # One counter upsert per user, in user order
+    counted = order_service.order_repo.count_created.await_args_list
+    assert [call.args for call in counted] == [(7, 1), (8, 1)]
+    order_service.session.commit.assert_awaited_once()
+    order_service.goods_repo.invalidate.assert_called_once_with({1})
+    order_service.list_cache.invalidate.assert_awaited_once_with({7, 8})
+
+    # The orders come straight from the INSERTs, nothing is read back
+    assert outcomes[0] is placed[0]
+    assert outcomes[2] is placed[1]
+    assert isinstance(outcomes[1], HTTPException)
+    assert outcomes[1].detail == "Insufficient stock for goods 'Good 1'"
+    assert outcomes[3].status_code == 400
+    assert outcomes[3].detail == "Goods with id 99 not found"
+
+
+@pytest.mark.asyncio
+async def test_rejected_group_is_rolled_back(order_service):
+    order_service.goods_repo.get_many.return_value = {1: good(1, 3)}
+    order_service.goods_repo.lock_stock.return_value = {1: 3}
+    order_service.order_repo.create_many.side_effect = SQLAlchemyError("boom")
+
+    with pytest.raises(SQLAlchemyError):
+        await order_service.create_order_group([(7, cart())])
+
+    order_service.session.rollback.assert_awaited_once()
+    order_service.session.commit.assert_not_awaited()
+    order_service.list_cache.invalidate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_orders_are_grouped(group_service):
+    first, second = MagicMock(spec=OrderInfo), MagicMock(spec=OrderInfo)
+    rejected = HTTPException(status_code=400, detail="Goods with id 99 not found")
+    group_service.create_order_group.return_value = [first, rejected, second]
+    batcher = OrderBatcher(window=0.01, max_size=10)
+
+    results = await asyncio.gather(
+        batcher.submit(1, cart()),
+        batcher.submit(2, cart(goods_id=99)),
+        batcher.submit(1, cart()),
+        return_exceptions=True,
+    )
+
+    assert results == [first, rejected, second]
+    group_service.create_order_group.assert_awaited_once_with(
+        [(1, cart()), (2, cart(goods_id=99)), (1, cart())]
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_group_does_not_wait_for_the_window(group_service):
+    group_service.create_order_group.side_effect = lambda orders: [
+        MagicMock(spec=OrderInfo) for _ in orders
+    ]
+    batcher = OrderBatcher(window=60, max_size=2)
+
+    await asyncio.wait_for(
+        asyncio.gather(batcher.submit(1, cart()), batcher.submit(2, cart())), 1
+    )
+
+    assert group_service.create_order_group.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_group_falls_back_to_single_orders(group_service):
+    group_service.create_order_group.side_effect = SQLAlchemyError("deadlock")
+    placed = MagicMock(spec=OrderInfo)
+    group_service.create_order.side_effect = [placed, SQLAlchemyError("bad cart")]
+    batcher = OrderBatcher(window=0.01, max_size=10)
+
+    results = await asyncio.gather(
+        batcher.submit(1, cart()), batcher.submit(2, cart()), return_exceptions=True
+    )
+
+    assert results[0] is placed
+    assert isinstance(results[1], SQLAlchemyError)
+    assert group_service.create_order.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_grouped_request_opens_no_session(monkeypatch):
+    monkeypatch.setattr(order_routes.settings, "ORDERS_GROUP_COMMIT", True)
+    sessions = MagicMock()
+    monkeypatch.setattr(order_routes, "async_session", sessions)
+    placed = MagicMock(spec=OrderInfo)
+    submit = AsyncMock(return_value=placed)
+    monkeypatch.setattr(order_routes.order_batcher, "submit", submit)
+
+    order = await order_routes.create_order(cart(), current_user=MagicMock(id=7))
+
+    assert order is placed
+    submit.assert_awaited_once_with(7, cart())
+    sessions.assert_not_called()
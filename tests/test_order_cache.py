@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from api.src.orders import cache as order_cache
+from api.src.orders.cache import LocalOrderListCache, create_order_list_cache
+from api.src.orders.schemas import OrderListParams, OrderPage
+from api.src.orders.service import OrderService
+
+
+@pytest.fixture
+def list_cache():
+    return LocalOrderListCache(maxsize=100, ttl=60)
+
+
+@pytest.fixture
+def order_service(list_cache):
+    service = OrderService(AsyncMock())
+    service.order_repo = AsyncMock()
+    service.order_repo.list_page_json.return_value = (['{"id":1}'], None)
+    service._place_order = AsyncMock()
+    service.list_cache = list_cache
+    return service
+
+
+@pytest.mark.asyncio
+async def test_generations_change_on_invalidation(list_cache):
+    first = await list_cache.generation(1)
+    assert await list_cache.generation(1) == first
+
+    await list_cache.invalidate([1])
+    assert await list_cache.generation(1) > first
+    assert await list_cache.generation(2) not in (first, await list_cache.generation(1))
+
+
+@pytest.mark.asyncio
+async def test_evicted_generation_is_never_reused():
+    list_cache = LocalOrderListCache(maxsize=1, ttl=60)
+    first = await list_cache.generation(1)
+    await list_cache.generation(2)  # evicts user 1's generation
+
+    assert await list_cache.generation(1) != first
+
+
+@pytest.mark.asyncio
+async def test_stats_report_hit_rate(list_cache):
+    assert list_cache.stats()["hit_rate"] == 0.0
+    await list_cache.set("a", "{}")
+    await list_cache.get("a")
+    await list_cache.get("b")
+    await list_cache.get("a")
+
+    stats = list_cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_repeat_reads_are_served_from_cache(order_service):
+    params = OrderListParams(limit=5)
+
+    first = await order_service.get_user_orders_body(1, params)
+    again = await order_service.get_user_orders_body(1, params)
+
+    assert first == again == '{"items":[{"id":1}],"next_cursor":null}'
+    order_service.order_repo.list_page_json.assert_awaited_once()
+
+    await order_service.get_user_orders_body(1, OrderListParams(limit=6))
+    await order_service.get_user_orders_body(2, params)
+    assert order_service.order_repo.list_page_json.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_new_order_invalidates_after_commit(order_service):
+    params = OrderListParams()
+    await order_service.get_user_orders_body(1, params)
+    list_cache = order_service.list_cache
+    list_cache.invalidate = AsyncMock(side_effect=list_cache.invalidate)
+    order_service.session.commit.side_effect = (
+        lambda: list_cache.invalidate.assert_not_awaited()
+    )
+
+    await order_service.create_order(1, MagicMock())
+
+    list_cache.invalidate.assert_awaited_once_with([1])
+
+
+@pytest.mark.asyncio
+async def test_new_order_is_listed_on_next_read(order_service):
+    params = OrderListParams()
+    await order_service.get_user_orders_body(1, params)
+
+    await order_service.create_order(1, MagicMock())
+    order_service.order_repo.list_page_json.return_value = (
+        ['{"id":2}', '{"id":1}'],
+        None,
+    )
+
+    body = await order_service.get_user_orders_body(1, params)
+    assert body.startswith('{"items":[{"id":2}')
+
+
+@pytest.mark.asyncio
+async def test_orm_path_is_cached_too(order_service, monkeypatch):
+    monkeypatch.setattr(
+        "api.src.orders.service.settings.ORDERS_JSON_READS", False
+    )
+    order_service.order_repo.list_page.return_value = ([], "next")
+
+    body = await order_service.get_user_orders_body(1, OrderListParams())
+
+    assert OrderPage.model_validate_json(body) == OrderPage(items=[], next_cursor="next")
+    assert await order_service.get_user_orders_body(1, OrderListParams()) == body
+    order_service.order_repo.list_page.assert_awaited_once()
+
+
+def test_backend_is_pluggable(monkeypatch):
+    monkeypatch.setattr(
+        order_cache.settings, "ORDERS_CACHE_BACKEND", "collections:OrderedDict"
+    )
+    assert type(create_order_list_cache()).__name__ == "OrderedDict"
+
+    monkeypatch.setattr(order_cache.settings, "ORDERS_CACHE_BACKEND", "")
+    assert isinstance(create_order_list_cache(), LocalOrderListCache)
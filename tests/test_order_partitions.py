@@ -0,0 +1,113 @@
+import pytest
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from api.src.orders import partitions
+from api.src.orders.repository import OrderPartitionRepository, add_months
+
+
+def statements(session):
+    return [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.await_args_list
+    ]
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert add_months(date(2026, 5, 1), 0) == date(2026, 5, 1)
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_of_a_month():
+    session = AsyncMock()
+
+    await OrderPartitionRepository(session).create(date(2026, 12, 1))
+
+    assert statements(session) == [
+        "CREATE TABLE IF NOT EXISTS order_info_p202612 PARTITION OF order_info"
+        " FOR VALUES FROM ('2026-12-01T00:00:00+00:00')"
+        " TO ('2027-01-01T00:00:00+00:00')",
+        "CREATE TABLE IF NOT EXISTS order_item_p202612 PARTITION OF order_item"
+        " FOR VALUES FROM ('2026-12-01T00:00:00+00:00')"
+        " TO ('2027-01-01T00:00:00+00:00')",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_detach_releases_items_before_orders():
+    session = AsyncMock()
+
+    await OrderPartitionRepository(session).detach(date(2024, 2, 1), drop=True)
+
+    detach_items, drop_fkey, delete, detach_orders, drop = statements(session)
+    assert detach_items == "ALTER TABLE order_item DETACH PARTITION order_item_p202402"
+    assert drop_fkey.startswith("ALTER TABLE order_item_p202402 DROP CONSTRAINT")
+    assert delete.startswith("DELETE FROM stock_reservation")
+    assert detach_orders == (
+        "ALTER TABLE order_info DETACH PARTITION order_info_p202402"
+    )
+    assert drop == "DROP TABLE order_item_p202402, order_info_p202402"
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repository = AsyncMock()
+    repository.lock.return_value = True
+    session = AsyncMock()
+
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    monkeypatch.setattr(partitions, "async_session", session_factory)
+    monkeypatch.setattr(
+        partitions, "OrderPartitionRepository", MagicMock(return_value=repository)
+    )
+    repository.session = session
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_maintain_creates_missing_months_and_detaches_old_ones(repository):
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    repository.list_months.return_value = [
+        add_months(this_month, -3),
+        add_months(this_month, -1),
+        this_month,
+    ]
+
+    created, detached = await partitions.maintain_partitions(ahead=2, retain=3)
+
+    assert created == [
+        add_months(this_month, -2),
+        add_months(this_month, 1),
+        add_months(this_month, 2),
+    ]
+    assert detached == [add_months(this_month, -3)]
+    repository.detach.assert_awaited_once_with(add_months(this_month, -3), False)
+    repository.session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_maintain_keeps_history_by_default(repository):
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    repository.list_months.return_value = [add_months(this_month, -40), this_month]
+
+    _, detached = await partitions.maintain_partitions(ahead=0, retain=0)
+
+    assert detached == []
+    repository.detach.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_maintain_skips_when_another_worker_runs(repository):
+    repository.lock.return_value = False
+
+    assert await partitions.maintain_partitions() == ([], [])
+    repository.create.assert_not_awaited()
+    repository.session.commit.assert_not_awaited()
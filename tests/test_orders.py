@@ -1,12 +1,32 @@
+import json
 import pytest
+from collections import namedtuple
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 from fastapi import HTTPException
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
-from api.core.exceptions import NotFoundException
+from api.core.exceptions import (
+    BadRequestException,
+    InsufficientStockException,
+    NotFoundException,
+)
+from api.src.orders.repository import OrderRepository
 from api.src.orders.service import OrderService
-from api.src.orders.schemas import OrderCreate, OrderItemCreate
-from api.src.orders.models import OrderInfo
+from api.src.orders.schemas import (
+    OrderCreate,
+    OrderInfoResponse,
+    OrderItemCreate,
+    OrderItemsMode,
+    OrderListParams,
+    OrderPage,
+)
+from api.src.orders.models import OrderInfo, OrderItem, OrderStatus
 from api.src.goods.models import Goods
+from api.src.goods.repository import GoodsRepository
 
 @pytest.fixture
 def mock_session():
@@ -15,8 +35,10 @@ def mock_session():
 @pytest.fixture
 def order_service(mock_session):
     service = OrderService(mock_session)
-    service.goods_repo = AsyncMock()
+    service.goods_repo = AsyncMock(spec=GoodsRepository)
     service.order_repo = AsyncMock()
+    service.reservations = AsyncMock()
+    service.outbox = MagicMock()
     return service
 
 @pytest.mark.asyncio
@@ -33,8 +55,9 @@ async def test_create_order_success(order_service):
     mock_good.name = "Test Good"
     mock_good.price = 10.0
     mock_good.stock = 100
+    mock_good.stock_shards = 0
     
-    order_service.goods_repo.get_by_id.return_value = mock_good
+    order_service.goods_repo.get_many.return_value = {1: mock_good}
     
     # Mock Order Return
     mock_created_order = MagicMock(spec=OrderInfo)
@@ -43,14 +66,25 @@ async def test_create_order_success(order_service):
     mock_created_order.delivery_addr_id = 101
     mock_created_order.total_amount = 20.0
     mock_created_order.status = 0
-    mock_created_order.items = []
+    mock_created_order.items = [MagicMock(spec=OrderItem, goods_id=1)]
     
     order_service.order_repo.create.return_value = mock_created_order
+    # Cached goods snapshots are dropped only once the stock change is committed
+    order_service.session.commit.side_effect = (
+        lambda: order_service.goods_repo.invalidate.assert_not_called()
+    )
 
     result = await order_service.create_order(user_id, order_data)
 
     assert result == mock_created_order
-    order_service.goods_repo.get_by_id.assert_called_with(1)
+    order_service.goods_repo.get_many.assert_called_once_with([1])
+    order_service.order_repo.count_created.assert_awaited_once_with(user_id)
+    order_service.outbox.publish.assert_called_once_with(
+        "order.created", {"order_id": 1, "user_id": user_id, "total_amount": 20.0}
+    )
+    order_service.session.commit.assert_awaited_once()
+    (invalidated,) = order_service.goods_repo.invalidate.call_args.args
+    assert list(invalidated) == [1]
     
     # Check if create was called with correct total amount
     args, _ = order_service.order_repo.create.call_args
@@ -72,8 +106,9 @@ async def test_create_order_insufficient_stock(order_service):
     mock_good.name = "Test Good"
     mock_good.price = 10.0
     mock_good.stock = 5
+    mock_good.stock_shards = 0
     
-    order_service.goods_repo.get_by_id.return_value = mock_good
+    order_service.goods_repo.get_many.return_value = {1: mock_good}
 
     with pytest.raises(HTTPException) as exc:
         await order_service.create_order(user_id, order_data)
@@ -84,12 +119,22 @@ async def test_create_order_insufficient_stock(order_service):
 @pytest.mark.asyncio
 async def test_get_user_orders(order_service):
     user_id = 1
-    mock_orders = [MagicMock(spec=OrderInfo)]
-    order_service.order_repo.list_by_user.return_value = mock_orders
+    params = OrderListParams()
+    order_service.order_repo.list_page.return_value = ([], "next")
+
+    result = await order_service.get_user_orders(user_id, params)
+    assert result == OrderPage(items=[], next_cursor="next")
+    order_service.order_repo.list_page.assert_called_with(user_id, params, None)
+
+@pytest.mark.asyncio
+async def test_get_user_orders_counts_items_instead_of_loading_them(order_service):
+    params = OrderListParams(items=OrderItemsMode.COUNT)
+    order_service.order_repo.list_page.return_value = ([], None)
 
-    result = await order_service.get_user_orders(user_id)
-    assert result == mock_orders
-    order_service.order_repo.list_by_user.assert_called_with(user_id)
+    await order_service.get_user_orders(1, params, frozenset({"id", "items"}))
+    order_service.order_repo.list_page.assert_called_with(
+        1, params, frozenset({"id", "item_count"})
+    )
 
 @pytest.mark.asyncio
 async def test_get_order_details_success(order_service):
@@ -103,7 +148,7 @@ async def test_get_order_details_success(order_service):
 
     result = await order_service.get_order_details(user_id, order_id)
     assert result == mock_order
-    order_service.order_repo.get_by_id.assert_called_with(order_id)
+    order_service.order_repo.get_by_id.assert_called_with(order_id, None)
 
 @pytest.mark.asyncio
 async def test_get_order_details_not_found(order_service):
@@ -138,10 +183,510 @@ async def test_create_order_goods_not_found(order_service):
         items=[OrderItemCreate(goods_id=999, count=1)]
     )
     
-    order_service.goods_repo.get_by_id.side_effect = NotFoundException("Goods not found")
+    order_service.goods_repo.get_many.return_value = {}
 
     with pytest.raises(HTTPException) as exc:
         await order_service.create_order(user_id, order_data)
     
     assert exc.value.status_code == 400
     assert "Goods with id 999 not found" in exc.value.detail
+
+@pytest.mark.asyncio
+async def test_create_order_merges_duplicate_lines(order_service):
+    user_id = 1
+    order_data = OrderCreate(
+        delivery_addr_id=101,
+        items=[
+            OrderItemCreate(goods_id=1, count=2),
+            OrderItemCreate(goods_id=2, count=1),
+            OrderItemCreate(goods_id=1, count=3),
+        ]
+    )
+
+    good_1 = MagicMock(spec=Goods)
+    good_1.id = 1
+    good_1.name = "Good 1"
+    good_1.price = 10.0
+    good_1.stock = 5
+    good_1.stock_shards = 0
+    good_2 = MagicMock(spec=Goods)
+    good_2.id = 2
+    good_2.name = "Good 2"
+    good_2.price = 4.0
+    good_2.stock = 1
+    good_2.stock_shards = 4
+
+    order_service.goods_repo.get_many.return_value = {1: good_1, 2: good_2}
+
+    await order_service.create_order(user_id, order_data)
+
+    # One lookup for the whole cart
+    order_service.goods_repo.get_many.assert_called_once_with([1, 2])
+
+    args, _ = order_service.order_repo.create.call_args
+    created_order_arg = args[0]
+    order_service.reservations.reserve.assert_called_once_with(
+        created_order_arg, {1: 5, 2: 1}, frozenset({2})
+    )
+    assert [(i.goods_id, i.count) for i in created_order_arg.items] == [(1, 5), (2, 1)]
+    assert created_order_arg.total_amount == 54.0
+
+@pytest.mark.asyncio
+async def test_create_order_stock_taken_concurrently(order_service, mock_session):
+    user_id = 1
+    order_data = OrderCreate(
+        delivery_addr_id=101,
+        items=[OrderItemCreate(goods_id=1, count=2)]
+    )
+
+    mock_good = MagicMock(spec=Goods)
+    mock_good.id = 1
+    mock_good.name = "Test Good"
+    mock_good.price = 10.0
+    mock_good.stock = 2
+    mock_good.stock_shards = 0
+
+    order_service.goods_repo.get_many.return_value = {1: mock_good}
+    # Another order took the stock between the read and the atomic decrement
+    order_service.reservations.reserve.side_effect = InsufficientStockException(1)
+    # Rollback expires loaded objects; a lazy load would fail under asyncio
+    mock_session.rollback.side_effect = lambda: delattr(mock_good, "name")
+
+    with pytest.raises(HTTPException) as exc:
+        await order_service.create_order(user_id, order_data)
+
+    assert exc.value.status_code == 400
+    assert "Insufficient stock for goods 'Test Good'" in exc.value.detail
+    mock_session.rollback.assert_awaited_once()
+    order_service.order_repo.create.assert_not_called()
+
+def batch_good(goods_id, stock, stock_shards=0):
+    good = MagicMock(spec=Goods)
+    good.id = goods_id
+    good.name = f"Good {goods_id}"
+    good.price = 10.0
+    good.stock = stock
+    good.stock_shards = stock_shards
+    return good
+
+@pytest.mark.asyncio
+async def test_create_orders_reports_each_order(order_service, mock_session):
+    order_service.goods_repo.get_many.return_value = {1: batch_good(1, 3)}
+    order_service.goods_repo.lock_stock.return_value = {1: 3}
+    order_service.order_repo.create_many.return_value = [OrderInfo(id=501)]
+    orders = [
+        OrderCreate(delivery_addr_id=1, items=[OrderItemCreate(goods_id=1, count=2)]),
+        OrderCreate(delivery_addr_id=1, items=[]),
+        OrderCreate(delivery_addr_id=1, items=[OrderItemCreate(goods_id=99, count=1)]),
+        # Fits the stock read up front, but the first order already took it
+        OrderCreate(delivery_addr_id=1, items=[OrderItemCreate(goods_id=1, count=2)]),
+    ]
+
+    report = await order_service.create_orders(7, orders)
+
+    # One goods lookup for the whole batch
+    order_service.goods_repo.get_many.assert_called_once_with([1, 99, 1])
+    order_service.goods_repo.commit_stock.assert_awaited_once_with({1: 2})
+    rows, items = order_service.order_repo.create_many.call_args.args
+    assert [(row["user_id"], row["total_amount"]) for row in rows] == [(7, 20.0)]
+    assert [[item["count"] for item in lines] for lines in items] == [[2]]
+    order_service.reservations.hold_many.assert_awaited_once_with([(501, {1: 2})])
+    order_service.order_repo.count_created.assert_awaited_once_with(7, 1)
+    order_service.outbox.publish_many.assert_called_once_with(
+        "order.created", [{"order_id": 501, "user_id": 7, "total_amount": 20.0}]
+    )
+    mock_session.commit.assert_awaited_once()
+    order_service.goods_repo.invalidate.assert_called_once_with({1})
+
+    assert (report.created, report.failed) == (1, 3)
+    assert [(r.order_id, r.error) for r in report.results] == [
+        (501, None),
+        (None, "Order must contain at least one item"),
+        (None, "Goods with id 99 not found"),
+        (None, "Insufficient stock for goods 'Good 1'"),
+    ]
+
+@pytest.mark.asyncio
+async def test_create_orders_commits_in_chunks(order_service, mock_session):
+    order_service.goods_repo.get_many.return_value = {1: batch_good(1, 100)}
+    order_service.goods_repo.lock_stock.return_value = {1: 100}
+    order_service.order_repo.create_many.side_effect = [
+        [OrderInfo(id=1), OrderInfo(id=2)],
+        SQLAlchemyError("boom"),
+    ]
+    orders = [
+        OrderCreate(delivery_addr_id=1, items=[OrderItemCreate(goods_id=1, count=1)])
+        for _ in range(3)
+    ]
+
+    report = await order_service.create_orders(7, orders, chunk_size=2)
+
+    assert order_service.order_repo.create_many.await_count == 2
+    mock_session.commit.assert_awaited_once()
+    mock_session.rollback.assert_awaited_once()
+    assert [r.order_id for r in report.results] == [1, 2, None]
+    assert report.results[2].error == "Chunk rejected by the database"
+
+@pytest.mark.asyncio
+async def test_create_orders_recovers_after_rejected_chunk(order_service, mock_session):
+    good = batch_good(1, 100)
+    order_service.goods_repo.get_many.return_value = {1: good}
+    # Another request bought most of the stock after the goods were read
+    order_service.goods_repo.lock_stock.return_value = {1: 3}
+    order_service.order_repo.create_many.side_effect = [
+        SQLAlchemyError("boom"),
+        [OrderInfo(id=3)],
+    ]
+
+    def expire():
+        # Rollback expires loaded goods; a lazy load would fail under asyncio
+        for name in ("name", "price", "stock", "stock_shards"):
+            delattr(good, name)
+
+    mock_session.rollback.side_effect = expire
+    orders = [
+        OrderCreate(delivery_addr_id=1, items=[OrderItemCreate(goods_id=1, count=c)])
+        for c in (1, 1, 1, 3)
+    ]
+
+    report = await order_service.create_orders(7, orders, chunk_size=2)
+
+    assert [(r.order_id, r.error) for r in report.results] == [
+        (None, "Chunk rejected by the database"),
+        (None, "Chunk rejected by the database"),
+        (3, None),
+        (None, "Insufficient stock for goods 'Good 1'"),
+    ]
+
+@pytest.mark.asyncio
+async def test_pay_order_success(order_service):
+    user_id = 1
+    order_id = 100
+    mock_order = MagicMock(spec=OrderInfo)
+    mock_order.user_id = user_id
+    mock_order.id = order_id
+    mock_order.status = OrderStatus.PENDING
+    mock_order.total_amount = 42.5
+
+    order_service.order_repo.get_for_update.return_value = mock_order
+    order_service.reservations.confirm.return_value = True
+
+    await order_service.pay_order(user_id, order_id)
+
+    order_service.reservations.confirm.assert_called_once_with(order_id)
+    order_service.order_repo.count_paid.assert_awaited_once_with(user_id, 42.5)
+    order_service.outbox.publish.assert_called_once_with(
+        "order.paid", {"order_id": order_id, "user_id": user_id, "total_amount": 42.5}
+    )
+    order_service.order_repo.set_status.assert_called_once_with(
+        mock_order, OrderStatus.PAID
+    )
+
+@pytest.mark.asyncio
+async def test_pay_order_reservation_expired(order_service, mock_session):
+    user_id = 1
+    order_id = 100
+    mock_order = MagicMock(spec=OrderInfo)
+    mock_order.user_id = user_id
+    mock_order.id = order_id
+    mock_order.status = OrderStatus.PENDING
+
+    order_service.order_repo.get_for_update.return_value = mock_order
+    order_service.reservations.confirm.return_value = False
+
+    with pytest.raises(BadRequestException) as exc:
+        await order_service.pay_order(user_id, order_id)
+
+    assert "expired" in exc.value.detail
+    mock_session.rollback.assert_awaited_once()
+    order_service.order_repo.set_status.assert_not_called()
+
+
+def test_sparse_order_fields_skip_items():
+    def sql(fields):
+        query = select(OrderInfo).options(*OrderRepository._load_options(fields))
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    sparse = OrderRepository._load_options(frozenset({"id", "status"}))
+    assert len(sparse) == 1  # no selectinload of items
+    assert "total_amount" not in sql(frozenset({"id", "status"}))
+    assert "order_info.user_id" in sql(frozenset({"id", "status"}))
+    assert len(OrderRepository._load_options(frozenset({"id", "items"}))) == 2
+
+
+@pytest.mark.asyncio
+async def test_order_history_keyset_page():
+    session = AsyncMock()
+    created = datetime(2026, 10, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    orders = [MagicMock(spec=OrderInfo, id=i, create_time=created) for i in (9, 8, 7)]
+    session.execute.return_value = MagicMock()
+    session.execute.return_value.scalars.return_value.all.return_value = orders
+    repo = OrderRepository(session)
+
+    page, cursor = await repo.list_page(
+        1, OrderListParams(status=OrderStatus.PAID, limit=2), frozenset({"id"})
+    )
+    assert page == orders[:2]
+    assert repo._decode_position(cursor) == (created, 8)
+
+    await repo.list_page(1, OrderListParams(cursor=cursor, limit=2))
+    sql = str(
+        session.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "(order_info.create_time, order_info.id) < (" in sql
+    assert "ORDER BY order_info.create_time DESC, order_info.id DESC" in sql
+
+    with pytest.raises(BadRequestException):
+        await repo.list_page(1, OrderListParams(cursor="bogus"))
+
+
+@pytest.mark.asyncio
+async def test_create_many_builds_orders_from_returning():
+    session = AsyncMock()
+    created = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+    order_keys, item_keys = MagicMock(), MagicMock()
+    order_keys.all.return_value = [(501, created), (502, created)]
+    item_keys.scalars.return_value.all.return_value = [9001, 9002, 9003]
+    session.execute.side_effect = [order_keys, item_keys]
+    line = {"goods_id": 1, "goods_name": "Good 1", "goods_price": 10, "count": 1}
+
+    orders = await OrderRepository(session).create_many(
+        [{"user_id": 7, "total_amount": 10}, {"user_id": 8, "total_amount": 20}],
+        [[line], [line, {**line, "goods_id": 2}]],
+    )
+
+    # Two INSERTs and nothing read back
+    assert session.execute.await_count == 2
+    rows = session.execute.await_args.args[1]
+    assert [(row["order_id"], row["order_create_time"]) for row in rows] == [
+        (501, created), (502, created), (502, created)
+    ]
+    assert [(order.id, order.user_id, order.create_time) for order in orders] == [
+        (501, 7, created), (502, 8, created)
+    ]
+    assert [[(item.id, item.goods_id) for item in order.items] for order in orders] == [
+        [(9001, 1)], [(9002, 1), (9003, 2)]
+    ]
+    session.add.assert_not_called()
+
+
+def test_item_count_is_counted_in_sql():
+    options = OrderRepository._load_options(frozenset({"id", "item_count"}))
+    query = select(OrderInfo).options(*options)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "count(*)" in sql
+    assert "order_item.goods_name" not in sql
+    assert "order_item.order_create_time = order_info.create_time" in sql
+
+
+JsonRow = namedtuple("JsonRow", "body create_time id")
+
+
+@pytest.mark.asyncio
+async def test_json_history_page_is_built_in_sql():
+    session = AsyncMock()
+    created = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+    session.execute.return_value = MagicMock()
+    session.execute.return_value.all.return_value = [
+        JsonRow(f'{{"id":{i}}}', created, i) for i in (9, 8, 7)
+    ]
+    repo = OrderRepository(session)
+
+    orders, cursor = await repo.list_page_json(1, OrderListParams(limit=2))
+
+    assert orders == ['{"id":9}', '{"id":8}']
+    assert repo._decode_position(cursor) == (created, 8)
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT CAST(json_build_object('id', order_info.id, ")
+    assert "json_agg(json_build_object('id', order_item.id, " in sql
+    assert "ORDER BY order_item.id)" in sql
+    assert "'item_count'" not in sql
+    assert "ORDER BY order_info.create_time DESC, order_info.id DESC" in sql
+
+
+def test_json_object_follows_the_response_model():
+    sql = str(
+        select(OrderRepository._json_object(None)).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    keys = [
+        name for name in OrderInfoResponse.model_fields if f"'{name}', " in sql
+    ]
+    assert keys == list(OrderInfoResponse.model_fields)
+    assert "CAST(order_info.total_amount AS FLOAT)" in sql
+
+    sparse = str(
+        select(OrderRepository._json_object(frozenset({"id", "item_count"}))).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "'item_count', (SELECT count(*)" in sparse
+    assert "'items'" not in sparse and "'status'" not in sparse
+
+
+@pytest.mark.asyncio
+async def test_json_order_page_body(order_service):
+    order_service.order_repo.list_page_json.return_value = (
+        ['{"id":2,"item_count":1}', '{"id":1,"item_count":3}'],
+        "next",
+    )
+
+    body = await order_service.get_user_orders_json(
+        1, OrderListParams(items=OrderItemsMode.COUNT), frozenset({"id"})
+    )
+
+    assert json.loads(body) == {
+        "items": [{"id": 2, "item_count": 1}, {"id": 1, "item_count": 3}],
+        "next_cursor": "next",
+    }
+    fields = order_service.order_repo.list_page_json.await_args.args[2]
+    assert fields == frozenset({"id", "item_count"})
+
+
+@pytest.mark.asyncio
+async def test_json_order_lookup_is_scoped_to_the_user():
+    session = AsyncMock()
+    missing = MagicMock()
+    missing.scalar_one_or_none.return_value = None
+    session.execute.return_value = missing
+
+    with pytest.raises(NotFoundException):
+        await OrderRepository(session).get_json(5, user_id=3)
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "order_info.user_id = %(user_id_1)s" in sql
+
+
+@pytest.mark.asyncio
+async def test_lookup_by_id_searches_recent_partitions_first():
+    session = AsyncMock()
+    order = MagicMock(spec=OrderInfo)
+    missing, found = MagicMock(), MagicMock()
+    missing.scalar_one_or_none.return_value = None
+    found.scalar_one_or_none.return_value = order
+    session.execute.side_effect = [missing, found]
+
+    assert await OrderRepository(session).get_for_update(5) is order
+
+    recent, full = (
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.await_args_list
+    )
+    assert "order_info.create_time >= now() - " in recent
+    assert "create_time" not in full.split("WHERE")[1]
+    assert full.endswith("FOR UPDATE")
+
+    session.execute.side_effect = [missing, missing]
+    with pytest.raises(NotFoundException):
+        await OrderRepository(session).get_by_id(5)
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_prunes_older_partitions():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    created_from = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    await OrderRepository(session).cancel_pending([1, 2], created_from)
+
+    query = session.execute.await_args.args[0]
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "order_info.create_time >= %(create_time_1)s" in sql
+
+
+@pytest.mark.asyncio
+async def test_summary_of_user_without_orders(order_service):
+    order_service.order_repo.get_stats.return_value = None
+
+    summary = await order_service.get_summary(1)
+
+    assert (summary.order_count, summary.total_spent) == (0, 0)
+    assert summary.last_order_at is None
+
+
+@pytest.mark.asyncio
+async def test_order_counters_are_upserted():
+    session = AsyncMock()
+    repo = OrderRepository(session)
+
+    await repo.count_created(1, 3)
+    await repo.count_paid(1, 19.99)
+
+    created, paid = (
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.await_args_list
+    )
+    assert "ON CONFLICT (user_id) DO UPDATE" in created
+    assert "order_count = (user_order_stats.order_count + excluded.order_count)" in created
+    assert "paid_count = (user_order_stats.paid_count + " in paid
+    assert "order_count" not in paid.split("DO UPDATE")[1]
+
+
+class SyncSessionAdapter:
+    """Just enough of AsyncSession over a sync Session to run create()."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add(self, instance):
+        self.session.add(instance)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def commit(self):
+        self.session.commit()
+
+
+@pytest.mark.asyncio
+async def test_create_order_is_not_read_back():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        # Same columns as the PostgreSQL tables, without the partitioning;
+        # INTEGER keys autoincrement
+        connection.exec_driver_sql(
+            "CREATE TABLE order_info (id INTEGER PRIMARY KEY, user_id INTEGER,"
+            " delivery_addr_id INTEGER, total_amount NUMERIC, status INTEGER,"
+            " create_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP, order_type INTEGER)"
+        )
+        connection.exec_driver_sql(
+            "CREATE TABLE order_item (id INTEGER PRIMARY KEY, order_id INTEGER,"
+            " order_create_time TIMESTAMP, goods_id INTEGER, goods_name TEXT, goods_price NUMERIC,"
+            " count INTEGER, item_amount NUMERIC)"
+        )
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    with Session(engine, expire_on_commit=False) as session:
+        order = OrderInfo(
+            user_id=1,
+            delivery_addr_id=2,
+            total_amount=30,
+            status=OrderStatus.PENDING,
+            order_type=0,
+            items=[
+                OrderItem(
+                    goods_id=1,
+                    goods_name="g",
+                    goods_price=10,
+                    count=3,
+                    item_amount=30,
+                )
+            ],
+        )
+        created = await OrderRepository(SyncSessionAdapter(session)).create(order)
+        response = OrderInfoResponse.model_validate(created)
+
+    # The two INSERTs return what the database generated; nothing is read back
+    assert len(statements) == 2
+    assert all(statement.startswith("INSERT") for statement in statements)
+    assert statements[0].endswith("RETURNING id, create_time")
+    assert response.create_time is not None
+    assert [item.id for item in response.items] == [1]
+    # Items are routed to their order's partition
+    assert created.items[0].order_create_time == created.create_time
@@ -0,0 +1,122 @@
+import pytest
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, call
+
+from sqlalchemy.dialects import postgresql
+
+from api.src.outbox import worker as outbox_worker
+from api.src.outbox.handlers import OutboxHandlers
+from api.src.outbox.repository import OutboxRepository
+from api.src.outbox.worker import OutboxWorker, retry_delay
+
+
+def event(id, topic, attempts=1):
+    return SimpleNamespace(id=id, topic=topic, payload={}, attempts=attempts)
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repository = AsyncMock()
+    monkeypatch.setattr(
+        outbox_worker, "OutboxRepository", MagicMock(return_value=repository)
+    )
+    return repository
+
+
+@pytest.fixture
+def session():
+    return AsyncMock()
+
+
+@pytest.fixture
+def worker(session):
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    return OutboxWorker(OutboxHandlers(), session_factory)
+
+
+@pytest.mark.asyncio
+async def test_run_once_settles_each_event(worker, repository, session, monkeypatch):
+    monkeypatch.setattr(outbox_worker.settings, "OUTBOX_MAX_ATTEMPTS", 3)
+    delivered = []
+
+    @worker.handlers.register("order.created")
+    async def deliver(event):
+        delivered.append(event.id)
+
+    @worker.handlers.register("order.paid")
+    async def fail(event):
+        raise RuntimeError("ERP is down")
+
+    repository.claim.return_value = [
+        event(1, "order.created"),
+        event(2, "order.paid", attempts=1),
+        event(3, "order.paid", attempts=3),
+        event(4, "unhandled", attempts=1),
+    ]
+
+    assert await worker.run_once() == 4
+
+    assert delivered == [1]
+    repository.complete.assert_awaited_once_with([1])
+    assert repository.retry.await_args_list == [
+        call(2, timedelta(seconds=5), "RuntimeError('ERP is down')"),
+        call(4, timedelta(seconds=5), "No handler for outbox topic unhandled"),
+    ]
+    repository.bury.assert_awaited_once_with(3, "RuntimeError('ERP is down')")
+    # One commit for the claim, one for the outcome
+    assert session.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_once_with_nothing_ready(worker, repository, session):
+    repository.claim.return_value = []
+
+    assert await worker.run_once() == 0
+
+    repository.complete.assert_not_called()
+    session.commit.assert_awaited_once()
+
+
+def test_no_workers_without_handlers(monkeypatch):
+    monkeypatch.setattr(outbox_worker, "load_handler_modules", MagicMock())
+    monkeypatch.setattr(outbox_worker, "outbox_handlers", OutboxHandlers())
+
+    assert outbox_worker.create_outbox_workers(2) == []
+
+    outbox_worker.outbox_handlers.register("order.created")(AsyncMock())
+    assert len(outbox_worker.create_outbox_workers(2)) == 2
+
+
+def test_retry_delay_backs_off_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(outbox_worker.settings, "OUTBOX_RETRY_MAX_DELAY", 60)
+
+    assert [retry_delay(n).total_seconds() for n in (1, 2, 3, 4, 5)] == [
+        5, 10, 20, 40, 60
+    ]
+
+
+def test_one_handler_per_topic():
+    handlers = OutboxHandlers()
+    handlers.register("order.created")(AsyncMock())
+
+    with pytest.raises(ValueError):
+        handlers.register("order.created")(AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_locked_events():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+
+    await OutboxRepository(session).claim(50, timedelta(minutes=5))
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE outbox_event SET attempts=(outbox_event.attempts + ")
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    # Literal, so it matches the partial index predicate
+    assert "outbox_event.status = 0" in sql
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock
+
+from api.src.recommendations import cooccurrence
+from api.src.recommendations.cooccurrence import (
+    ID_BITS,
+    CooccurrenceCounter,
+    order_pairs,
+)
+from api.src.recommendations.service import RecommendationService
+
+
+def unpack(pairs):
+    mask = (1 << ID_BITS) - 1
+    return sorted((int(key >> ID_BITS), int(key & mask)) for key in pairs)
+
+
+def test_order_pairs_dedupes_and_skips_large_orders():
+    orders = np.array([1, 1, 1, 2, 3, 3, 3, 3], np.int64)
+    goods = np.array([10, 11, 10, 10, 10, 11, 12, 13], np.int64)
+
+    pairs = order_pairs(orders, goods, max_items=3)
+
+    # Order 1 has goods 10 twice, order 2 a single goods, order 3 is too big
+    assert unpack(pairs) == [(10, 11), (11, 10)]
+
+
+def test_counter_ranks_neighbours():
+    counter = CooccurrenceCounter()
+    counter.add(order_pairs(np.array([1, 1, 2, 2]), np.array([10, 11, 10, 11]), 5))
+    counter.add(order_pairs(np.array([3, 3, 3]), np.array([10, 12, 11]), 5))
+
+    goods, rank, related, score = counter.top_k(1)
+
+    assert goods.tolist() == [10, 11, 12]
+    assert rank.tolist() == [0, 0, 0]
+    assert related.tolist() == [11, 10, 10]
+    assert score.tolist() == [3, 3, 1]
+
+
+def test_counter_merges_buffered_chunks(monkeypatch):
+    monkeypatch.setattr(cooccurrence, "MIN_MERGE", 4)
+    rng = np.random.default_rng(7)
+    chunks = [rng.integers(1, 40, 30) for _ in range(25)]
+    counter = CooccurrenceCounter()
+    for chunk in chunks:
+        counter.add(chunk)
+
+    keys, counts = np.unique(np.concatenate(chunks), return_counts=True)
+    assert counter.keys.tolist() == keys.tolist()
+    assert counter.counts.tolist() == counts.tolist()
+    assert len(counter) == len(keys)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_counts_orders_split_across_batches():
+    service = RecommendationService(AsyncMock())
+    service.repository = AsyncMock()
+
+    async def stream(batch_size):
+        yield [(1, 10), (1, 11), (2, 10)]
+        yield [(2, 11), (3, 10), (3, 12)]
+
+    service.repository.stream_order_items = stream
+
+    report = await service.rebuild(batch_size=3, top_k=5, max_items=10)
+
+    assert report.orders == 3
+    records = service.repository.replace_related.await_args.args[0]
+    assert (10, 0, 11, 2) in records
+    assert (11, 0, 10, 2) in records
+    assert (10, 1, 12, 1) in records
@@ -0,0 +1,123 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+
+from api.core.exceptions import InsufficientStockException
+from api.src.goods.repository import GoodsRepository
+from api.src.reservations.repository import LOCK_NOT_AVAILABLE, ReservationRepository
+from api.src.reservations.service import ReservationService
+
+
+@pytest.fixture
+def mock_session():
+    return AsyncMock()
+
+
+@pytest.fixture
+def reservation_service(mock_session):
+    service = ReservationService(mock_session)
+    service.repository = AsyncMock()
+    service.goods_repo = AsyncMock(spec=GoodsRepository)
+    service.order_repo = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_reserve_takes_stock_then_holds(reservation_service):
+    order = object()
+
+    await reservation_service.reserve(order, {1: 2, 3: 1}, frozenset({3}))
+
+    reservation_service.goods_repo.commit_stock.assert_called_once_with(
+        {1: 2, 3: 1}, frozenset({3})
+    )
+    args, _ = reservation_service.repository.hold.call_args
+    assert args[0] is order
+    assert args[1] == {1: 2, 3: 1}
+
+
+@pytest.mark.asyncio
+async def test_reserve_insufficient_stock_holds_nothing(reservation_service):
+    reservation_service.goods_repo.commit_stock.side_effect = (
+        InsufficientStockException(1)
+    )
+
+    with pytest.raises(InsufficientStockException):
+        await reservation_service.reserve(object(), {1: 2})
+
+    reservation_service.repository.hold.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_release_expired_restores_stock_and_cancels(
+    reservation_service, mock_session
+):
+    reservation_service.repository.release_expired.return_value = [
+        (10, 1, 2, datetime(2026, 3, 1, 12, tzinfo=timezone.utc)),
+        (10, 2, 1, datetime(2026, 3, 1, 12, tzinfo=timezone.utc)),
+        (11, 1, 3, datetime(2026, 2, 28, 23, tzinfo=timezone.utc)),
+    ]
+    reservation_service.order_repo.cancel_pending.return_value = [(10, 7), (11, 7)]
+    reservation_service.list_cache = AsyncMock()
+
+    released = await reservation_service.release_expired(100)
+
+    assert released == 3
+    reservation_service.repository.release_expired.assert_called_once_with(100)
+    reservation_service.goods_repo.restore_stock.assert_called_once_with({1: 5, 2: 1})
+    reservation_service.order_repo.cancel_pending.assert_called_once_with(
+        [10, 11], datetime(2026, 2, 28, 23, tzinfo=timezone.utc)
+    )
+    mock_session.commit.assert_awaited_once()
+    reservation_service.goods_repo.invalidate.assert_called_once_with({1: 5, 2: 1})
+    reservation_service.list_cache.invalidate.assert_awaited_once_with({7})
+
+
+@pytest.mark.asyncio
+async def test_release_expired_nothing_to_do(reservation_service, mock_session):
+    reservation_service.repository.release_expired.return_value = []
+
+    assert await reservation_service.release_expired(100) == 0
+
+    reservation_service.goods_repo.restore_stock.assert_not_called()
+    mock_session.commit.assert_not_awaited()
+
+
+def lock_not_available():
+    error = Exception("could not obtain lock on row")
+    error.sqlstate = LOCK_NOT_AVAILABLE
+    return DBAPIError("SELECT", None, error)
+
+
+@pytest.mark.asyncio
+async def test_confirm_locks_held_rows_without_waiting(mock_session):
+    mock_session.begin_nested = MagicMock()
+    confirmed = MagicMock()
+    confirmed.scalars.return_value.all.return_value = [1, 2]
+    mock_session.execute.side_effect = [MagicMock(), confirmed]
+
+    assert await ReservationRepository(mock_session).confirm(10) == 2
+
+    lock = mock_session.execute.await_args_list[0].args[0]
+    assert "FOR UPDATE NOWAIT" in str(lock.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_confirm_gives_up_on_rows_being_released(mock_session):
+    # The sweeper holds the rows and waits for the order the payment holds
+    mock_session.begin_nested = MagicMock()
+    mock_session.execute.side_effect = lock_not_available()
+
+    assert await ReservationRepository(mock_session).confirm(10) == 0
+    mock_session.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_confirm_raises_other_errors(mock_session):
+    mock_session.begin_nested = MagicMock()
+    mock_session.execute.side_effect = DBAPIError("SELECT", None, Exception("boom"))
+
+    with pytest.raises(DBAPIError):
+        await ReservationRepository(mock_session).confirm(10)